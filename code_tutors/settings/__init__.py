@@ -0,0 +1,24 @@
+"""
+Settings for code_tutors, in the profile named by the DJANGO_ENV environment variable.
+
+- dev (the default): DEBUG on, for runserver and the management commands.
+- test (the default under `manage.py test`): fast hashing and an in-memory database.
+- prod: DEBUG off, persistent connections, a shared cache and hashed static files.
+
+Every profile extends code_tutors.settings.base.
+"""
+
+import os
+import sys
+from django.core.exceptions import ImproperlyConfigured
+
+DJANGO_ENV = os.environ.get('DJANGO_ENV') or ('test' if sys.argv[1:2] == ['test'] else 'dev')
+
+if DJANGO_ENV == 'dev':
+    from .dev import *  # noqa: F401,F403
+elif DJANGO_ENV == 'test':
+    from .test import *  # noqa: F401,F403
+elif DJANGO_ENV == 'prod':
+    from .prod import *  # noqa: F401,F403
+else:
+    raise ImproperlyConfigured(f"DJANGO_ENV must be dev, test or prod, not {DJANGO_ENV!r}.")
@@ -1,5 +1,5 @@
 """
-Django settings for code_tutors project.
+Django settings shared by every code_tutors profile (see code_tutors.settings).
 
 Generated by 'django-admin startproject' using Django 4.2.6.
 
@@ -10,21 +10,22 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 from django.contrib.messages import constants as messages
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
-BASE_DIR = Path(__file__).resolve().parent.parent
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
 
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/4.2/howto/deployment/checklist/
 
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = 'django-insecure-&$dln5wpgorppuw&(gintxm573v2ks+zq4o$(4*lapguixf^+2'
+SECRET_KEY = os.environ.get('DJANGO_SECRET_KEY', 'django-insecure-&$dln5wpgorppuw&(gintxm573v2ks+zq4o$(4*lapguixf^+2')
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = False
 
 ALLOWED_HOSTS = ['codetutorsiguana.pythonanywhere.com', 'localhost']
 
@@ -49,6 +50,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'tutorials.instrumentation.ViewInstrumentationMiddleware',
 ]
 
 ROOT_URLCONF = 'code_tutors.urls'
@@ -144,3 +146,48 @@ LOGIN_REDIRECT_URL = '/dashboard/'
 MESSAGE_TAGS = {
     messages.ERROR: 'danger',
 }
+
+# Fraction of requests whose query count, DB time and render time are logged (0 turns it off)
+VIEW_INSTRUMENTATION_SAMPLE_RATE = float(os.environ.get('VIEW_INSTRUMENTATION_SAMPLE_RATE', 0))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'tutorials': {
+            'handlers': ['console'],
+            'level': 'INFO',
+        },
+    },
+}
+
+# Seconds a cached list or detail page is kept (0 turns page caching off)
+VIEW_CACHE_TIMEOUT = int(os.environ.get('VIEW_CACHE_TIMEOUT', 300))
+
+# A per-process memory cache; profiles may share the default cache between
+# processes. Cached table rows are keyed on their updated_at, so they never go
+# stale and always stay in process memory, saving a round trip per row.
+CACHE_OPTIONS = {'MAX_ENTRIES': 10000}
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'default',
+        'OPTIONS': CACHE_OPTIONS,
+    },
+    'fragments': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'fragments',
+        'OPTIONS': {'MAX_ENTRIES': 20000},
+    },
+}
+
+# Compile every template when the WSGI application starts (see tutorials.warmup)
+WARM_TEMPLATES = False
+
+# Reports the suite's wall-clock time; `manage.py test --slowest N` lists the slowest test classes
+TEST_RUNNER = 'tutorials.tests.runner.TimedTestRunner'
@@ -0,0 +1,16 @@
+"""Development settings: DEBUG on, with an optional file cache shared by local processes."""
+
+import os
+from .base import *  # noqa: F401,F403
+from .base import CACHE_OPTIONS, CACHES
+
+DEBUG = True
+
+# Set CACHE_DIR to share cached pages and their invalidation between local
+# processes, e.g. runserver and a shell running seed
+if os.environ.get('CACHE_DIR'):
+    CACHES['default'] = {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ['CACHE_DIR'],
+        'OPTIONS': CACHE_OPTIONS,
+    }
@@ -0,0 +1,67 @@
+"""
+Production settings: DEBUG off, persistent connections, a shared cache and compiled templates.
+
+DJANGO_SECRET_KEY must be set. REDIS_URL selects a Redis cache (with the
+redis package installed); otherwise the cache is kept in files under
+CACHE_DIR, shared by the server's worker processes.
+"""
+
+import os
+from django.core.exceptions import ImproperlyConfigured
+from .base import *  # noqa: F401,F403
+from .base import ALLOWED_HOSTS, BASE_DIR, CACHE_OPTIONS, CACHES, DATABASES, SECRET_KEY, TEMPLATES
+
+DEBUG = False
+
+if SECRET_KEY.startswith('django-insecure-'):
+    raise ImproperlyConfigured("Set DJANGO_SECRET_KEY in production.")
+
+ALLOWED_HOSTS = os.environ['DJANGO_ALLOWED_HOSTS'].split(',') if os.environ.get('DJANGO_ALLOWED_HOSTS') else ALLOWED_HOSTS
+
+# Keep each worker's connection open between requests rather than opening
+# one per request, checking it is still usable before reusing it
+DATABASES['default']['CONN_MAX_AGE'] = int(os.environ.get('CONN_MAX_AGE', 600))
+DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+
+# Cached pages are invalidated through generation counters in the default
+# cache, so it must be shared by every worker (see tutorials.caching)
+if os.environ.get('REDIS_URL'):
+    CACHES['default'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ['REDIS_URL'],
+    }
+else:
+    CACHES['default'] = {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('CACHE_DIR', BASE_DIR / 'cache'),
+        'OPTIONS': CACHE_OPTIONS,
+    }
+
+# Sessions are read from the cache, falling back to the database
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+# Static files get content-hashed names (after collectstatic), so browsers
+# can cache them indefinitely
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.ManifestStaticFilesStorage',
+    },
+}
+
+# Each template is read and compiled once per process and then served from
+# memory. The loaders must be listed explicitly, so APP_DIRS is replaced by
+# the app directories loader.
+TEMPLATES[0]['APP_DIRS'] = False
+TEMPLATES[0]['OPTIONS']['loaders'] = [
+    ('django.template.loaders.cached.Loader', [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ]),
+]
+
+# Compile every template when the WSGI application starts, rather than on
+# the first request to use it
+WARM_TEMPLATES = True
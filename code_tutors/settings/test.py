@@ -0,0 +1,20 @@
+"""Test settings: cheap password hashing, an in-memory database and no page caching."""
+
+from .base import *  # noqa: F401,F403
+
+# MD5 is unsafe for real passwords but makes every create_user and login in
+# the suite cheap. The user fixtures store MD5 hashes too.
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+]
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    }
+}
+
+# Tests roll the database back under a cache that outlives them, so the
+# tests of page caching opt in with override_settings
+VIEW_CACHE_TIMEOUT = 0
@@ -35,6 +35,7 @@ urlpatterns = [
     #Tutor add-ons
     path('tutors/',views.tutors_list, name='tutors_list'),
     path('tutors/<int:tutor_id>/',views.show_tutor, name='show_tutor'),
+    path('tutors/report/', views.tutor_report, name='tutor_report'),
     path('tutors/<int:tutor_id>/edit/', views.update_tutor, name='update_tutor'),
     path('tutors/<int:tutor_id>/delete/', views.delete_tutor, name='delete_tutor'),
 
@@ -54,6 +55,7 @@ urlpatterns = [
     #Users add-ons
     path('users/', views.users_list, name='users_list'),
     path('users/create/', views.create_user, name='create_user'),
+    path('users/import/', views.user_import, name='import_users'),
     path('users/<int:user_id>/edit/', views.edit_user, name='edit_users_type'),
 
     #Booking add-ons
@@ -62,12 +64,15 @@ urlpatterns = [
     path('bookings/delete/<int:pk>/', views.booking_delete, name='booking_delete'),
     path('bookings/create/', views.booking_create, name='booking_create'),  
     path('bookings/<int:booking_id>/sessions/', views.booking_show, name='session_list'),
+    path('invoices/<str:term>/', views.term_invoice, name='term_invoice'),
+    path('exports/<slug:kind>.<slug:fmt>', views.export, name='export'),
     
     #Session add-ons
     path('sessions/<int:pk>/', views.session_show, name='session_show'),
     path('sessions/update/<int:pk>/', views.session_update, name='session_update'),
     path('sessions/delete/<int:pk>/', views.session_delete, name='session_delete'),
     path('bookings/<int:booking_id>/sessions/create/', views.session_create, name='session_create'),
+    path('bookings/<int:booking_id>/sessions/generate/', views.session_generate, name='session_generate'),
 ]
 
 
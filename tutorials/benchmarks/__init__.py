@@ -0,0 +1,5 @@
+"""Load-testing benchmarks for the tutorials views.
+
+Run them with `python manage.py benchmark`; see endpoints.py for the pages
+requested and runner.py for how they are timed.
+"""
@@ -0,0 +1,77 @@
+"""The pages the benchmark requests, and how to build each request."""
+
+from collections import namedtuple
+from datetime import date, timedelta
+from django.urls import reverse
+from tutorials.models import Booking, Session, Student, StudentRequest, Tutor
+
+# data is None for a GET, or a function of the request number returning POST data
+Endpoint = namedtuple('Endpoint', ['name', 'kind', 'method', 'url', 'data'])
+
+
+def find_fixtures():
+    """Pick existing rows for the detail and create endpoints to request."""
+
+    booking = Booking.objects.filter(sessions__isnull=False).first() or Booking.objects.first()
+    return {
+        'booking': booking,
+        'session_id': Session.objects.values_list('id', flat=True).first(),
+        'student_id': Student.objects.values_list('id', flat=True).first(),
+        'tutor_id': Tutor.objects.values_list('id', flat=True).first(),
+        'request_id': StudentRequest.objects.values_list('id', flat=True).first(),
+    }
+
+
+def default_endpoints(fixtures):
+    """Return the list, detail and create endpoints the fixtures allow."""
+
+    endpoints = [
+        Endpoint('users_list', 'list', 'get', reverse('users_list'), None),
+        Endpoint('students_list', 'list', 'get', reverse('students_list'), None),
+        Endpoint('tutors_list', 'list', 'get', reverse('tutors_list'), None),
+        Endpoint('booking_list', 'list', 'get', reverse('booking_list'), None),
+        Endpoint('student_requests', 'list', 'get', reverse('student_requests'), None),
+        Endpoint('term_invoice', 'detail', 'get', reverse('term_invoice', kwargs={'term': Booking.TERM1}), None),
+        Endpoint('create_user', 'create', 'post', reverse('create_user'), _user_data),
+    ]
+    if fixtures['student_id']:
+        endpoints.append(Endpoint('show_student', 'detail', 'get', reverse('show_student', args=[fixtures['student_id']]), None))
+    if fixtures['tutor_id']:
+        endpoints.append(Endpoint('show_tutor', 'detail', 'get', reverse('show_tutor', args=[fixtures['tutor_id']]), None))
+    if fixtures['request_id']:
+        endpoints.append(Endpoint('show_request', 'detail', 'get', reverse('show_request', args=[fixtures['request_id']]), None))
+    if fixtures['session_id']:
+        endpoints.append(Endpoint('session_show', 'detail', 'get', reverse('session_show', args=[fixtures['session_id']]), None))
+    booking = fixtures['booking']
+    if booking:
+        endpoints.append(Endpoint('session_list', 'detail', 'get', reverse('session_list', args=[booking.id]), None))
+        endpoints.append(Endpoint(
+            'session_create', 'create', 'post', reverse('session_create', args=[booking.id]), _session_data(booking),
+        ))
+    return endpoints
+
+
+def _user_data(number):
+    return {
+        'username': f'@benchmark{number}',
+        'first_name': 'Bench',
+        'last_name': f'Mark{number}',
+        'email': f'benchmark{number}@example.org',
+        'user_type': 'student',
+    }
+
+
+def _session_data(booking):
+    # A day of its own per request, well after any seeded session, never clashes
+    first_day = date.today() + timedelta(days=3650)
+
+    def data(number):
+        return {
+            'booking': booking.id,
+            'session_date': (first_day + timedelta(days=number)).isoformat(),
+            'session_time': '10:00',
+            'duration': '01:00:00',
+            'venue': Session.VENUE_BUSH_HOUSE,
+            'payment_status': Session.PAYMENT_PENDING,
+        }
+    return data
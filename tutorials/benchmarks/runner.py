@@ -0,0 +1,99 @@
+"""Drive endpoints through the test client and summarise throughput and latency.
+
+Each worker thread has its own client and database connection, so requests
+really run concurrently against the database. Queries are counted with the
+same execute wrapper the view instrumentation uses.
+"""
+
+import itertools
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from django.db import connection
+from django.test import Client
+from tutorials.instrumentation import RequestStats
+
+
+def percentile(sorted_values, fraction):
+    """Return the nearest-rank percentile of an already sorted list."""
+
+    if not sorted_values:
+        return None
+    rank = max(math.ceil(fraction * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def summarise(endpoint, results, elapsed):
+    """Reduce (status, seconds, queries) results for one endpoint to a report entry."""
+
+    latencies = sorted(seconds * 1000 for status, seconds, queries in results)
+    query_counts = [queries for status, seconds, queries in results]
+    return {
+        'kind': endpoint.kind,
+        'method': endpoint.method.upper(),
+        'url': endpoint.url,
+        'requests': len(results),
+        'errors': sum(1 for status, seconds, queries in results if status >= 400),
+        'requests_per_second': round(len(results) / elapsed, 2) if elapsed else None,
+        'latency_ms': {
+            'mean': round(sum(latencies) / len(latencies), 2) if latencies else None,
+            **{f'p{int(fraction * 100)}': _round(percentile(latencies, fraction)) for fraction in (0.5, 0.9, 0.95, 0.99)},
+            'max': _round(latencies[-1] if latencies else None),
+        },
+        'queries': {
+            'mean': round(sum(query_counts) / len(query_counts), 2) if query_counts else None,
+            'max': max(query_counts, default=None),
+        },
+    }
+
+
+def _round(value):
+    return None if value is None else round(value, 2)
+
+
+class EndpointRunner:
+    """Send requests to endpoints as a logged-in user from a pool of threads."""
+
+    def __init__(self, user, concurrency=1):
+        self.user = user
+        self.concurrency = concurrency
+        self.local = threading.local()
+        self.numbers = itertools.count()
+
+    def client(self):
+        """Return this thread's client, logging it in on first use."""
+
+        client = getattr(self.local, 'client', None)
+        if client is None:
+            client = self.local.client = Client(raise_request_exception=False)
+            client.force_login(self.user)
+        return client
+
+    def request(self, endpoint):
+        """Send one request and return its (status, seconds, queries)."""
+
+        client = self.client()
+        data = endpoint.data(next(self.numbers)) if endpoint.data else None
+        stats = RequestStats()
+        with connection.execute_wrapper(stats.record_query):
+            start = perf_counter()
+            response = getattr(client, endpoint.method)(endpoint.url, data)
+            seconds = perf_counter() - start
+        return response.status_code, seconds, stats.queries
+
+    def run(self, endpoints, requests):
+        """Time requests requests to each endpoint in turn and return their report entries."""
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            return {endpoint.name: self._run_endpoint(pool, endpoint, requests) for endpoint in endpoints}
+
+    def _run_endpoint(self, pool, endpoint, requests):
+        # One untimed request fills template, URL and subject caches
+        self.request(endpoint)
+        start = perf_counter()
+        if self.concurrency > 1:
+            results = list(pool.map(lambda _: self.request(endpoint), range(requests)))
+        else:
+            results = [self.request(endpoint) for _ in range(requests)]
+        return summarise(endpoint, results, perf_counter() - start)
@@ -0,0 +1,114 @@
+"""Session pricing, computed in SQL for whole querysets.
+
+A session costs the tutor's hourly rate x session length in hours x the
+number of weeks in the booking's term x the lesson type multiplier, rounded
+half-up to the cent. session_amount() applies the same rule to Python values, so
+single sessions and annotated querysets always agree.
+"""
+
+from datetime import timedelta
+from decimal import Decimal, ROUND_HALF_UP
+from django.db.models import Case, Count, DecimalField, ExpressionWrapper, F, Func, Q, Sum, Value, When
+from django.db.models.functions import Coalesce
+
+TERM_WEEKS = {
+    'Term1': Decimal(14),
+    'Term2': Decimal(11),
+    'Term3': Decimal(11),
+}
+LESSON_TYPE_MULTIPLIERS = {
+    'Weekly': Decimal(1),
+    'Bi-Weekly': Decimal(2),
+    'Fortnight': Decimal('0.5'),
+}
+CENT = Decimal('0.01')
+AMOUNT_FIELD = DecimalField(max_digits=14, decimal_places=2)
+
+
+def session_amount(rate, duration, term, lesson_type):
+    """Return the price of one session from Python values."""
+
+    hours = Decimal(duration // timedelta(microseconds=1)) / Decimal(3600 * 1000000) if duration else Decimal(1)
+    weeks = TERM_WEEKS.get(term, Decimal(0))
+    multiplier = LESSON_TYPE_MULTIPLIERS.get(lesson_type, Decimal(1))
+    return (Decimal(str(rate)) * hours * weeks * multiplier).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+class DurationSeconds(Func):
+    """The length of a DurationField in seconds, as a number SQL can multiply."""
+
+    # Most backends store durations as integer microseconds
+    template = '(%(expressions)s / 1000000.0)'
+    output_field = DecimalField()
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return self.as_sql(compiler, connection, template='EXTRACT(EPOCH FROM %(expressions)s)', **extra_context)
+
+
+class Cents(Func):
+    """Round a money expression to the cent in SQL and return it as a 2dp Decimal.
+
+    SQLite computes decimals as floats and Django only quantizes plain
+    columns, so computed amounts are quantized again on the way out.
+    """
+
+    function = 'ROUND'
+    template = '%(function)s(%(expressions)s, 2)'
+    output_field = AMOUNT_FIELD
+
+    def get_db_converters(self, connection):
+        return super().get_db_converters(connection) + [self._quantize]
+
+    @staticmethod
+    def _quantize(value, expression, connection):
+        if value is None:
+            return value
+        return Decimal(value).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def _lookup(field, table, default):
+    """Map each key of table to its value with a CASE over field."""
+
+    return Case(
+        *[When(**{field: key}, then=Value(value)) for key, value in table.items()],
+        default=Value(default),
+        output_field=DecimalField(),
+    )
+
+
+def amount_expression(rate='booking__tutor__rate', duration='duration',
+                      term='booking__term', lesson_type='booking__lesson_type'):
+    """Build the SQL expression pricing a session, given the paths to its inputs.
+
+    The defaults suit Session querysets; pass other paths to price sessions
+    reached through a relation, e.g. from Booking with duration='sessions__duration'.
+    """
+
+    return Cents(ExpressionWrapper(
+        F(rate) * DurationSeconds(duration) / Value(Decimal(3600))
+        * _lookup(term, TERM_WEEKS, Decimal(0))
+        * _lookup(lesson_type, LESSON_TYPE_MULTIPLIERS, Decimal(1)),
+        output_field=DecimalField(),
+    ))
+
+
+def with_amounts(sessions):
+    """Annotate a Session queryset with each session's price as `amount`."""
+
+    return sessions.annotate(amount=amount_expression())
+
+
+def with_totals(bookings):
+    """Annotate a Booking queryset with session_count, total_amount, paid_amount and outstanding_amount."""
+
+    amount = amount_expression(
+        rate='tutor__rate', duration='sessions__duration', term='term', lesson_type='lesson_type'
+    )
+    paid = Q(sessions__payment_status='Successful')
+    return bookings.annotate(
+        session_count=Count('sessions'),
+        total_amount=Cents(Coalesce(Sum(amount), Value(Decimal(0)))),
+        paid_amount=Cents(Coalesce(Sum(amount, filter=paid), Value(Decimal(0)))),
+    ).annotate(
+        outstanding_amount=Cents(F('total_amount') - F('paid_amount')),
+    )
@@ -0,0 +1,121 @@
+"""Response caching for the read-only list and detail views.
+
+A cached page is keyed on the view, its path and its normalised query
+string, plus a generation counter for each model the page shows. Saving or
+deleting any row of a model bumps that model's counter (see
+tutorials.signals), so every page that showed the model misses from then on
+and stale entries simply expire. Bulk writes that skip signals, such as
+seed, call invalidate_views() themselves.
+
+Pages are shared between users, so cached views must not render anything
+user-specific beyond being logged in. Responses carrying messages or a CSRF
+token are never stored, as those belong to one user.
+
+Counters live in the default cache, so invalidation reaches every process
+when that cache is shared (Redis in production); a per-process memory cache
+is only exact with a single process, as under runserver.
+"""
+
+import hashlib
+import time
+from functools import wraps
+from urllib.parse import urlencode
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from .models import Booking, Session, Student, StudentRequest, Subject, Tutor, TutorTermSummary, User
+
+CACHE_PREFIX = 'tutorials:view'
+
+# The models whose changes invalidate cached pages
+CACHED_MODELS = [User, Student, Tutor, Subject, Booking, Session, StudentRequest, TutorTermSummary]
+
+
+def _generation_key(model):
+    return f'{CACHE_PREFIX}:generation:{model._meta.label_lower}'
+
+
+def _new_generation():
+    # Counters start from the clock, so a counter lost to eviction never
+    # comes back with a value older pages were cached under
+    return time.time_ns()
+
+
+def _generations(models):
+    keys = [_generation_key(model) for model in models]
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            cache.add(key, _new_generation(), timeout=None)
+            generations[key] = cache.get(key)
+    return [generations[key] for key in keys]
+
+
+def _bump(models):
+    for model in models:
+        key = _generation_key(model)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _new_generation(), timeout=None)
+
+
+def model_generation(model):
+    """Return model's generation counter, which changes whenever any process changes the model."""
+
+    return _generations([model])[0]
+
+
+def invalidate_views(*models):
+    """Invalidate every cached page showing any of models (all models if none are given)."""
+
+    models = models or CACHED_MODELS
+    _bump(models)
+    # Bump again once the change is committed, as a page cached in between
+    # read the old rows under the new generation
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: _bump(models))
+
+
+def normalised_query(request):
+    """Return the query string with parameters sorted and empty values dropped."""
+
+    params = sorted((key, value) for key, values in request.GET.lists() for value in values if value != '')
+    return urlencode(params)
+
+
+def cache_key(request, view_name, models):
+    """Return the cache key for a request to view_name showing models."""
+
+    generations = '.'.join(str(generation) for generation in _generations(models))
+    url = f'{request.path}?{normalised_query(request)}'
+    digest = hashlib.md5(url.encode()).hexdigest()
+    return f'{CACHE_PREFIX}:{view_name}:{generations}:{digest}'
+
+
+def cached_view(*models):
+    """Decorate a read-only view to cache its GET responses until any of models changes."""
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            timeout = settings.VIEW_CACHE_TIMEOUT
+            # Pending messages are rendered into the page and belong to this user
+            if request.method != 'GET' or timeout <= 0 or get_messages(request):
+                return view(request, *args, **kwargs)
+
+            key = cache_key(request, view.__name__, models)
+            cached = cache.get(key)
+            if cached is not None:
+                content, content_type = cached
+                return HttpResponse(content, content_type=content_type)
+
+            response = view(request, *args, **kwargs)
+            # A page holding a CSRF token is tied to this user's cookie
+            if response.status_code == 200 and not response.streaming and not request.META.get('CSRF_COOKIE_NEEDS_UPDATE'):
+                cache.set(key, (response.content, response['Content-Type']), timeout)
+            return response
+        return wrapper
+    return decorator
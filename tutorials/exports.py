@@ -0,0 +1,97 @@
+"""Streaming exports of every booking and session, priced by the database.
+
+Rows are read as tuples with values_list() in chunks through iterator(), so
+no model instances are built and memory stays flat however many rows there
+are. Amounts come from the same SQL expressions as the invoice pages (see
+tutorials.billing). Both the export views and `manage.py export` write the
+lines export_lines() yields.
+"""
+
+import csv
+import json
+from django.core.serializers.json import DjangoJSONEncoder
+from .billing import with_amounts, with_totals
+from .models import Booking, Session
+
+# Rows fetched from the database at a time
+CHUNK_SIZE = 2000
+
+# (column, field path) pairs for each export
+BOOKING_COLUMNS = [
+    ('id', 'id'),
+    ('student', 'student__name'),
+    ('tutor', 'tutor__name'),
+    ('term', 'term'),
+    ('lesson_type', 'lesson_type'),
+    ('sessions', 'session_count'),
+    ('total_amount', 'total_amount'),
+    ('paid_amount', 'paid_amount'),
+    ('outstanding_amount', 'outstanding_amount'),
+]
+SESSION_COLUMNS = [
+    ('id', 'id'),
+    ('booking', 'booking_id'),
+    ('student', 'booking__student__name'),
+    ('tutor', 'booking__tutor__name'),
+    ('date', 'session_date'),
+    ('time', 'session_time'),
+    ('duration', 'duration'),
+    ('venue', 'venue'),
+    ('payment_status', 'payment_status'),
+    ('term', 'booking__term'),
+    ('lesson_type', 'booking__lesson_type'),
+    ('rate', 'booking__tutor__rate'),
+    ('amount', 'amount'),
+]
+
+EXPORTS = {
+    'bookings': (lambda: with_totals(Booking.objects.order_by('id')), BOOKING_COLUMNS),
+    'sessions': (lambda: with_amounts(Session.objects.order_by('id')), SESSION_COLUMNS),
+}
+FORMATS = {
+    'csv': 'text/csv',
+    'json': 'application/json',
+}
+
+
+def export_rows(kind, chunk_size=CHUNK_SIZE):
+    """Return the column names and an iterator over the row tuples of an export."""
+
+    queryset, columns = EXPORTS[kind]
+    rows = queryset().values_list(*[path for _, path in columns]).iterator(chunk_size=chunk_size)
+    return [name for name, _ in columns], rows
+
+
+class _Echo:
+    """File-like object handing back what csv.writer writes to it, so rows can be yielded."""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(header, rows):
+    """Yield the header and rows as CSV lines."""
+
+    writer = csv.writer(_Echo())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def json_lines(header, rows):
+    """Yield the rows as a JSON array of objects, one object per line."""
+
+    yield '['
+    separator = '\n'
+    for row in rows:
+        yield separator + json.dumps(dict(zip(header, row)), cls=DjangoJSONEncoder)
+        separator = ',\n'
+    yield '\n]\n'
+
+
+def export_lines(kind, fmt, chunk_size=CHUNK_SIZE):
+    """Yield the lines of the kind ('bookings' or 'sessions') export in fmt ('csv' or 'json')."""
+
+    header, rows = export_rows(kind, chunk_size)
+    lines = csv_lines if fmt == 'csv' else json_lines
+    return lines(header, rows)
@@ -1,8 +1,10 @@
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
+from decimal import Decimal
 from django import forms
 from django.contrib.auth import authenticate
 from django.core.validators import RegexValidator
 from .models import Student, StudentRequest, Tutor, Subject, User, Booking, Session
+from .subjects import get_subject_choices, get_subject_id
 from django.core.exceptions import ValidationError
 
 
@@ -152,6 +154,36 @@ class CreateUserForm(forms.ModelForm):
                 Tutor.objects.create(username=user)
         return user
 
+class UserImportRowForm(forms.ModelForm):
+    """Form validating one row of a user import (see tutorials.imports)."""
+
+    password = forms.CharField(required=False)
+    rate = forms.DecimalField(max_digits=6, decimal_places=2, min_value=Decimal('0.01'), required=False)
+    # Subject names separated by semicolons
+    subjects = forms.CharField(required=False)
+
+    class Meta:
+        model = User
+        fields = ['username', 'first_name', 'last_name', 'email', 'user_type']
+
+    def validate_unique(self):
+        """Skip the per-row uniqueness queries; imports check each batch with one query per field."""
+
+    def clean_subjects(self):
+        names = [name.strip() for name in self.cleaned_data['subjects'].split(';') if name.strip()]
+        subject_ids = {name: subject_id for subject_id, name in get_subject_choices()}
+        unknown = [name for name in names if name not in subject_ids]
+        if unknown:
+            raise ValidationError(f"Unknown subject(s): {', '.join(unknown)}.")
+        return [subject_ids[name] for name in names]
+
+
+class UserImportForm(forms.Form):
+    """Form uploading a CSV file of users to import."""
+
+    file = forms.FileField(label="CSV file")
+
+
 class TutorForm(forms.ModelForm):
     """Form for creating and updating tutors."""
 
@@ -168,12 +200,13 @@ class TutorForm(forms.ModelForm):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        try:
-            default_subject = Subject.objects.get(name = "Python")
-            if not self.instance.pk: 
-                self.fields['subjects'].initial = [default_subject.id]
-        except Subject.DoesNotExist:
-            pass
+        # Render the checkboxes from the cached catalogue; the queryset still validates input
+        subject_choices = get_subject_choices()
+        self.fields['subjects'].choices = subject_choices
+        if not self.instance.pk:
+            self.fields['subjects'].initial = [
+                subject_id for subject_id, name in subject_choices if name == "Python"
+            ]
 
     def clean(self):
         cleaned_data = super().clean()
@@ -208,9 +241,8 @@ class TutorForm(forms.ModelForm):
             tutor.save()  
             tutor.subjects.set(self.cleaned_data['subjects'])
 
-            if not tutor.subjects.exists():
-                python_subject, created = Subject.objects.get_or_create(name="Python")
-                tutor.subjects.add(python_subject)
+            if not self.cleaned_data['subjects']:
+                tutor.subjects.add(get_subject_id("Python"))
         return tutor
 
 class StudentForm(forms.ModelForm):
@@ -394,6 +426,23 @@ class SessionForm(forms.ModelForm):
         return session_date
 
 
+class ScheduleForm(forms.Form):
+    """Form generating every session of a booking for its term."""
+
+    start_date = forms.DateField(label="First session date", widget=forms.DateInput(attrs={'type': 'date'}))
+    session_time = forms.TimeField(widget=forms.TimeInput(attrs={'type': 'time'}))
+    duration = forms.DurationField(initial='01:00:00', help_text='Format: [hours]:[minutes]:[seconds]')
+    venue = forms.ChoiceField(choices=Session.VENUE_CHOICES)
+
+    def clean_duration(self):
+        duration = self.cleaned_data.get('duration')
+
+        if duration is not None and not timedelta(0) < duration < timedelta(days=1):
+            raise forms.ValidationError("The session duration must be more than zero and less than a day.")
+
+        return duration
+
+
 class UpdateSessionForm(forms.ModelForm):
     """Form to update sessions"""
     class Meta:
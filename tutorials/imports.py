@@ -0,0 +1,215 @@
+"""Bulk import of users, with their Student or Tutor profiles, from CSV.
+
+Rows are read as a stream and handled in batches. Each row is validated by
+UserImportRowForm except for uniqueness, which is checked for the whole batch
+with one query per field rather than one per row. Hashing passwords is
+deliberately slow, so the import_users command hashes them in a process
+pool; the upload view hashes them in its own process. Each batch is written
+with bulk_create in one transaction. A rejected row is reported with its line
+number and the rest of its batch is still imported. Bytes that are not UTF-8
+end the import at their line, reported like a rejected row, so the report
+still lists the batches already written.
+
+bulk_create skips the signals that create profiles, count students on the
+dashboard and invalidate cached pages, so profiles are created and counted
+here and cached pages invalidated at the end.
+"""
+
+import csv
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Lower
+from .caching import invalidate_views
+from .metrics import count_created
+from .forms import UserImportRowForm
+from .models import Student, Tutor, User
+from .subjects import get_subject_id
+
+BATCH_SIZE = 500
+REQUIRED_COLUMNS = ['username', 'email', 'first_name', 'last_name', 'user_type']
+# password (blank for an unusable one), and rate and subjects for tutors
+OPTIONAL_COLUMNS = ['password', 'rate', 'subjects']
+NOT_UTF8 = "Not UTF-8 encoded; this line and the rest of the file were not imported."
+
+
+class ImportReport:
+    """What an import created, and the rows it rejected."""
+
+    def __init__(self):
+        self.rows = 0
+        self.users = 0
+        self.students = 0
+        self.tutors = 0
+        # (line number, message) pairs
+        self.errors = []
+
+    def add_error(self, line, message):
+        self.errors.append((line, message))
+
+
+def import_users(lines, batch_size=BATCH_SIZE, workers=1):
+    """Import users from CSV lines, header first, and return an ImportReport.
+
+    workers is the number of processes hashing passwords. With one, or when
+    this is itself a daemonic worker process, which cannot start children,
+    passwords are hashed in this process.
+    """
+
+    report = ImportReport()
+    reader = csv.DictReader(lines)
+    try:
+        fieldnames = reader.fieldnames or []
+    except UnicodeDecodeError:
+        report.add_error(1, NOT_UTF8)
+        return report
+    missing = [column for column in REQUIRED_COLUMNS if column not in fieldnames]
+    if missing:
+        report.add_error(1, f"Missing column(s): {', '.join(missing)}.")
+        return report
+
+    in_process = workers <= 1 or multiprocessing.current_process().daemon
+    pool = None if in_process else ProcessPoolExecutor(workers)
+    rows = _read_rows(reader, report)
+    try:
+        while batch := list(islice(rows, batch_size)):
+            report.rows += len(batch)
+            accepted = _check_batch(batch, report)
+            if accepted:
+                _write_batch(accepted, report, _hash_passwords(accepted, pool, workers))
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        if report.users:
+            invalidate_views(User, Student, Tutor)
+    # A batch reports its invalid rows before its duplicates
+    report.errors.sort()
+    return report
+
+
+def _read_rows(reader, report):
+    """Yield the (line, row) pairs of reader, up to any line that is not UTF-8."""
+
+    try:
+        for row in reader:
+            yield reader.line_num, row
+    except UnicodeDecodeError:
+        report.add_error(reader.line_num + 1, NOT_UTF8)
+
+
+def _check_batch(batch, report):
+    """Validate a batch of (line, row) pairs, returning the (line, cleaned data) pairs to import."""
+
+    valid = []
+    for line, row in batch:
+        form = UserImportRowForm({
+            column: (row.get(column) or '').strip() for column in REQUIRED_COLUMNS + OPTIONAL_COLUMNS
+        })
+        if form.is_valid():
+            valid.append((line, form.cleaned_data))
+        else:
+            report.add_error(line, ' '.join(
+                f"{field}: {message}" for field, messages in form.errors.items() for message in messages
+            ))
+
+    # Profiles store emails in lower case and must be unique too, so emails
+    # are compared case-insensitively against users (via user_email_lower_idx)
+    # and both kinds of profile
+    usernames = {data['username'] for _, data in valid}
+    emails = {data['email'].lower() for _, data in valid}
+    taken_usernames = set(User.objects.filter(username__in=usernames).values_list('username', flat=True))
+    taken_emails = set(
+        User.objects.annotate(lower_email=Lower('email')).filter(lower_email__in=emails).values_list('lower_email', flat=True)
+    )
+    taken_emails.update(Student.objects.filter(email__in=emails).values_list('email', flat=True))
+    taken_emails.update(Tutor.objects.filter(email__in=emails).values_list('email', flat=True))
+
+    accepted = []
+    for line, data in valid:
+        username, email = data['username'], data['email'].lower()
+        errors = []
+        if username in taken_usernames:
+            errors.append("username: A user with this username already exists.")
+        if email in taken_emails:
+            errors.append("email: A user with this email already exists.")
+        if errors:
+            report.add_error(line, ' '.join(errors))
+            continue
+        # Later rows repeating this username or email are rejected above
+        taken_usernames.add(username)
+        taken_emails.add(email)
+        accepted.append((line, data))
+    return accepted
+
+
+def _hash_passwords(accepted, pool, workers):
+    """Return the hash of each accepted row's password, unusable where it is blank."""
+
+    passwords = [data['password'] or None for _, data in accepted]
+    if pool is None:
+        return [make_password(password) for password in passwords]
+    return list(pool.map(make_password, passwords, chunksize=max(1, len(passwords) // (4 * workers))))
+
+
+def _write_batch(accepted, report, hashes):
+    """Write the users of a checked batch, with their password hashes, and their profiles."""
+
+    rows = [
+        (line, data, User(
+            username=data['username'],
+            email=data['email'],
+            first_name=data['first_name'],
+            last_name=data['last_name'],
+            user_type=data['user_type'],
+            password=password,
+        ))
+        for (line, data), password in zip(accepted, hashes)
+    ]
+
+    try:
+        with transaction.atomic():
+            counts = _create(rows)
+    except IntegrityError:
+        # Another writer took a username or email after the batch was
+        # checked, so find the rows it affects one at a time
+        counts = [0, 0, 0]
+        for line, data, user in rows:
+            user.pk = None
+            try:
+                with transaction.atomic():
+                    created = _create([(line, data, user)])
+            except IntegrityError:
+                report.add_error(line, "username or email: Taken by a user created during the import.")
+            else:
+                counts = [total + count for total, count in zip(counts, created)]
+    report.users += counts[0]
+    report.students += counts[1]
+    report.tutors += counts[2]
+
+
+def _create(rows):
+    """Insert the users of (line, data, user) rows and their profiles, returning (users, students, tutors) counts."""
+
+    users = User.objects.bulk_create([user for _, _, user in rows])
+    students = Student.objects.bulk_create([
+        Student(username=user, name=user.full_name, email=user.email.lower())
+        for user in users if user.user_type == 'student'
+    ])
+    count_created(students)
+
+    tutor_rows = [(data, user) for _, data, user in rows if user.user_type == 'tutor']
+    tutors = Tutor.objects.bulk_create([
+        Tutor(username=user, name=user.full_name, email=user.email.lower(),
+              **({'rate': data['rate']} if data['rate'] is not None else {}))
+        for data, user in tutor_rows
+    ])
+    # Tutors without subjects teach Python, as Tutor.save() would assign
+    python_id = get_subject_id("Python") if tutors else None
+    Tutor.subjects.through.objects.bulk_create([
+        Tutor.subjects.through(tutor_id=tutor.id, subject_id=subject_id)
+        for tutor, (data, _) in zip(tutors, tutor_rows)
+        for subject_id in (data['subjects'] or [python_id])
+    ])
+    return len(users), len(students), len(tutors)
@@ -0,0 +1,105 @@
+"""Sampled per-view timing: query count, database time and render time.
+
+Set VIEW_INSTRUMENTATION_SAMPLE_RATE to the fraction of requests to measure.
+At 0 the middleware removes itself from the stack when Django starts, so an
+unsampled deployment pays nothing for it.
+"""
+
+import logging
+import random
+from contextlib import ExitStack
+from time import perf_counter
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django import shortcuts
+
+logger = logging.getLogger(__name__)
+
+
+class RequestStats:
+    """Counters collected while one sampled request is handled."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.render_time = 0.0
+
+    def record_query(self, execute, sql, params, many, context):
+        """Database execute wrapper timing every query the request runs."""
+
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += perf_counter() - start
+            self.queries += 1
+
+
+class ViewInstrumentationMiddleware:
+    """Log query count, database time and render time for a sample of requests."""
+
+    def __init__(self, get_response):
+        self.sample_rate = getattr(settings, 'VIEW_INSTRUMENTATION_SAMPLE_RATE', 0)
+        if not self.sample_rate:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        stats = RequestStats()
+        request.instrumentation = stats
+        start = perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(stats.record_query))
+            response = self.get_response(request)
+        total_time = perf_counter() - start
+
+        match = request.resolver_match
+        fields = {
+            'view': match.view_name if match else None,
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'queries': stats.queries,
+            'db_ms': round(stats.db_time * 1000, 2),
+            'render_ms': round(stats.render_time * 1000, 2),
+            'total_ms': round(total_time * 1000, 2),
+        }
+        logger.info(
+            ' '.join(f'{key}={value}' for key, value in fields.items()),
+            extra={'instrumentation': fields},
+        )
+        return response
+
+    def process_template_response(self, request, response):
+        """Time the deferred rendering of class-based views' TemplateResponses."""
+
+        stats = getattr(request, 'instrumentation', None)
+        if stats is not None:
+            start = perf_counter()
+
+            def rendered(response):
+                stats.render_time += perf_counter() - start
+
+            response.add_post_render_callback(rendered)
+        return response
+
+
+def render(request, template_name, context=None, *args, **kwargs):
+    """Drop-in for django.shortcuts.render that times rendering on sampled requests.
+
+    Queries run lazily by the template count towards both render and DB time.
+    """
+
+    stats = getattr(request, 'instrumentation', None)
+    if stats is None:
+        return shortcuts.render(request, template_name, context, *args, **kwargs)
+    start = perf_counter()
+    try:
+        return shortcuts.render(request, template_name, context, *args, **kwargs)
+    finally:
+        stats.render_time += perf_counter() - start
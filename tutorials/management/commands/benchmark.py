@@ -0,0 +1,102 @@
+import json
+import os
+import subprocess
+import tempfile
+from io import StringIO
+import django
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+from tutorials.benchmarks.endpoints import default_endpoints, find_fixtures
+from tutorials.benchmarks.runner import EndpointRunner
+from tutorials.models import User
+
+
+class Command(BaseCommand):
+    """Build automation command to load-test the main views against a seeded database.
+
+    The benchmark runs in a throwaway database, seeded with the seed command,
+    so the development data is left untouched.
+    """
+
+    help = 'Seed a throwaway database, request each view concurrently and report throughput, latency and queries as JSON.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=300, help='Random users to seed.')
+        parser.add_argument('--bookings', type=int, default=200, help='Bookings to seed.')
+        parser.add_argument('--sessions', type=int, default=4000, help='Sessions to seed.')
+        parser.add_argument('--requests', type=int, default=50, help='Timed requests per endpoint.')
+        parser.add_argument('--concurrency', type=int, default=4, help='Requests in flight at once.')
+        parser.add_argument('--endpoints', nargs='+', default=None, help='Only benchmark these endpoints, by name.')
+        parser.add_argument('--output', default=None, help='Write the JSON report to this file instead of stdout.')
+
+    def handle(self, *args, **options):
+        """Seed, benchmark every endpoint and write the report."""
+        if options['requests'] < 1 or options['concurrency'] < 1:
+            raise CommandError("--requests and --concurrency must be at least 1.")
+
+        with tempfile.TemporaryDirectory() as directory:
+            if connection.vendor == 'sqlite':
+                # A file, unlike the default in-memory test database, takes concurrent connections
+                connection.settings_dict['TEST']['NAME'] = os.path.join(directory, 'benchmark.sqlite3')
+            old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+            try:
+                results = self.benchmark(options)
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        report = {
+            'commit': self.current_commit(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'dataset': {key: options[key] for key in ('users', 'bookings', 'sessions')},
+            'requests_per_endpoint': options['requests'],
+            'concurrency': options['concurrency'],
+            'endpoints': results,
+        }
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                file.write(output + '\n')
+            for name, result in results.items():
+                self.stdout.write(
+                    f"{name}: {result['requests_per_second']} req/s, "
+                    f"p95 {result['latency_ms']['p95']}ms, {result['queries']['max']} queries, {result['errors']} errors"
+                )
+            self.stdout.write(self.style.SUCCESS(f"Benchmark report written to {options['output']}."))
+        else:
+            self.stdout.write(output)
+
+    def benchmark(self, options):
+        """Seed the current database and time each endpoint."""
+        call_command(
+            'seed', stdout=StringIO(),
+            users=options['users'], bookings=options['bookings'], sessions=options['sessions'],
+        )
+        endpoints = default_endpoints(find_fixtures())
+        if options['endpoints']:
+            unknown = set(options['endpoints']) - {endpoint.name for endpoint in endpoints}
+            if unknown:
+                raise CommandError(f"Unknown endpoints: {', '.join(sorted(unknown))}")
+            endpoints = [endpoint for endpoint in endpoints if endpoint.name in options['endpoints']]
+
+        runner = EndpointRunner(User.objects.get(username='@johndoe'), options['concurrency'])
+        # Measure production-like settings: no query log, no debug error pages.
+        # Page caching stays off, or every timed GET after the warm-up would be
+        # served from the cache rather than by the view.
+        with override_settings(
+            DEBUG=False, ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'], VIEW_CACHE_TIMEOUT=0,
+        ):
+            return runner.run(endpoints, options['requests'])
+
+    def current_commit(self):
+        """Return the git commit being benchmarked, if the code is in a git checkout."""
+        try:
+            result = subprocess.run(
+                ['git', 'rev-parse', 'HEAD'], cwd=settings.BASE_DIR, capture_output=True, text=True, check=True,
+            )
+        except (OSError, subprocess.CalledProcessError):
+            return None
+        return result.stdout.strip()
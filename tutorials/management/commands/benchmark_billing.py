@@ -0,0 +1,39 @@
+from time import perf_counter
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from tutorials.billing import with_amounts
+from tutorials.models import Session
+
+
+class Command(BaseCommand):
+    """Build automation command to compare per-session and SQL session pricing."""
+
+    help = 'Time pricing every session one at a time against pricing them in one query.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=None, help='Only price the first N sessions.')
+
+    def handle(self, *args, **options):
+        """Price the same sessions both ways and report time and query counts."""
+        limit = options['limit']
+        sessions = Session.objects.order_by('id')
+
+        with CaptureQueriesContext(connection) as loop_queries:
+            start = perf_counter()
+            loop_amounts = [session.calculate_total_amount() for session in sessions[:limit]]
+            loop_time = perf_counter() - start
+
+        with CaptureQueriesContext(connection) as sql_queries:
+            start = perf_counter()
+            sql_amounts = list(with_amounts(sessions)[:limit].values_list('amount', flat=True))
+            sql_time = perf_counter() - start
+
+        self.stdout.write(f"Sessions priced: {len(sql_amounts)}")
+        self.stdout.write(f"Per-session loop: {loop_time:.3f}s, {len(loop_queries)} queries")
+        self.stdout.write(f"Annotated query: {sql_time:.3f}s, {len(sql_queries)} queries")
+        if loop_amounts == sql_amounts:
+            self.stdout.write(self.style.SUCCESS("Both methods agree on every amount."))
+        else:
+            mismatches = sum(1 for a, b in zip(loop_amounts, sql_amounts) if a != b)
+            self.stdout.write(self.style.ERROR(f"{mismatches} amount(s) differ between the methods."))
@@ -0,0 +1,172 @@
+import re
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.contrib.sessions.backends.base import SessionBase
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import RequestFactory, override_settings
+from django.urls import resolve, reverse
+from tutorials.models import Booking, Session, Student, Subject, Tutor, User
+
+# Each filter and sort the list views offer, one access path per request
+LIST_VIEW_REQUESTS = [
+    ('users_list', {}),
+    ('users_list', {'user_type': 'student'}),
+    ('users_list', {'order_by': 'asc'}),
+    ('users_list', {'order_by': 'desc'}),
+    ('users_list', {'search': 'smith'}),
+    ('students_list', {}),
+    ('students_list', {'allocated': 'true'}),
+    ('students_list', {'allocated': 'false'}),
+    ('students_list', {'payment': 'Pending'}),
+    ('students_list', {'order': 'asc'}),
+    ('students_list', {'order': 'desc'}),
+    ('students_list', {'search': 'smith'}),
+    ('tutors_list', {}),
+    ('tutors_list', {'subject': 'SUBJECT'}),
+    ('tutors_list', {'order': 'asc'}),
+    ('tutors_list', {'order': 'desc'}),
+    ('tutors_list', {'search': 'smith'}),
+    ('student_requests', {}),
+    ('student_requests', {'status': 'pending'}),
+    ('student_requests', {'priority': 'high'}),
+    ('student_requests', {'request_type': 'custom_request'}),
+    ('student_requests', {'order_by': 'asc'}),
+    ('student_requests', {'order_by': 'desc'}),
+    ('student_requests', {'search': 'smith'}),
+    ('booking_list', {}),
+    ('booking_list', {'term': Booking.TERM1}),
+    ('booking_list', {'lesson_type': Booking.TYPE_WEEKLY}),
+    ('booking_list', {'order': 'student_asc'}),
+    ('booking_list', {'order': 'student_desc'}),
+    ('booking_list', {'order': 'tutor_asc'}),
+    ('booking_list', {'order': 'tutor_desc'}),
+    ('booking_list', {'student_search': 'smith'}),
+    ('session_list', {}),
+    ('session_list', {'venue': Session.VENUE_BUSH_HOUSE}),
+    ('session_list', {'payment': Session.PAYMENT_PENDING}),
+    ('session_list', {'order': 'closest'}),
+    ('session_list', {'order': 'furthest'}),
+    ('tutor_report', {}),
+    ('tutor_report', {'term': Booking.TERM2}),
+    ('tutor_report', {'order': 'hours'}),
+    ('tutor_report', {'order': 'revenue'}),
+    ('tutor_report', {'order': 'pending'}),
+    ('tutor_report', {'outstanding': 'true', 'order': 'pending'}),
+]
+
+
+def indexed_columns(cursor, table):
+    """Return the columns that lead an index on table, including the primary key."""
+
+    columns = {'id', 'rowid'}
+    cursor.execute(f'PRAGMA index_list("{table}")')
+    for index in [row[1] for row in cursor.fetchall()]:
+        cursor.execute(f'PRAGMA index_info("{index}")')
+        info = cursor.fetchall()
+        if info and info[0][2]:
+            columns.add(info[0][2])
+    return columns
+
+
+def plan_problems(cursor, sql, plan):
+    """Return the steps of a query plan that read a whole table or sort every row.
+
+    A SCAN is a problem when the WHERE clause filters that table on a column no
+    index leads with. Unfiltered tables are walked in order and keyset pages
+    stop after one page; and with current statistics the planner may prefer to
+    scan an indexed column that most rows match. A sort is a problem unless the
+    rows come from a search index match, as only the matches are sorted.
+    """
+
+    where = sql.partition(' WHERE ')[2]
+    aliases = {alias: table for table, alias in re.findall(r'"(\w+)" (U\d+|T\d+)\b', sql)}
+    problems = []
+    for row in plan:
+        detail = row[-1]
+        if detail.startswith('USE TEMP B-TREE FOR ORDER BY') and ' MATCH ' not in sql:
+            problems.append(detail)
+        elif detail.startswith('SCAN ') and ' USING ' not in detail and 'VIRTUAL TABLE' not in detail:
+            name = detail.split()[1]
+            reference = f'{name}."' if name in aliases else f'"{name}"."'
+            filtered = set(re.findall(re.escape(reference) + r'(\w+)"', where))
+            if filtered - indexed_columns(cursor, aliases.get(name, name)):
+                problems.append(detail)
+    return problems
+
+
+class Command(BaseCommand):
+    """Build automation command to check that the list views' queries are served by indexes."""
+
+    help = "Run EXPLAIN QUERY PLAN on every list-view query and fail if any scans a full table."
+
+    def handle(self, *args, **options):
+        """Request each list view, explain the queries it ran and report the full scans."""
+        if connection.vendor != 'sqlite':
+            raise CommandError("check_query_plans reads SQLite query plans; run it against a SQLite database.")
+
+        # Rows the detail filters need are created if missing, and the planner's
+        # statistics refreshed so it plans for this data; both are rolled back.
+        # Cached pages would hide the queries, so every view renders afresh.
+        with transaction.atomic(), override_settings(VIEW_CACHE_TIMEOUT=0):
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+            failures, checked = self.check_plans(options['verbosity'])
+            transaction.set_rollback(True)
+
+        if failures:
+            raise CommandError(f"{failures} of {checked} list-view queries scan a full table or sort every row.")
+        self.stdout.write(self.style.SUCCESS(f"All {checked} list-view queries use an index."))
+
+    def check_plans(self, verbosity):
+        """Explain every query the list views run and return (failures, queries checked)."""
+        factory = RequestFactory()
+        booking = Booking.objects.first() or self.create_booking()
+        subject_id = Subject.objects.values_list('pk', flat=True).first() or Subject.objects.create(name="Python").pk
+        failures = 0
+        checked = 0
+
+        for url_name, params in LIST_VIEW_REQUESTS:
+            kwargs = {'booking_id': booking.pk} if url_name == 'session_list' else {}
+            params = {key: subject_id if value == 'SUBJECT' else value for key, value in params.items()}
+            url = reverse(url_name, kwargs=kwargs)
+            request = factory.get(url, params)
+            request.user = booking.student.username
+            request.session = SessionBase()
+            request._messages = FallbackStorage(request)
+
+            queries = []
+
+            def record(execute, sql, sql_params, many, context):
+                # Skip schema introspection, e.g. the search index check
+                if sql.lstrip().upper().startswith('SELECT') and 'sqlite_master' not in sql:
+                    queries.append((sql, sql_params))
+                return execute(sql, sql_params, many, context)
+
+            with connection.execute_wrapper(record):
+                resolve(url).func(request, **kwargs)
+
+            for sql, sql_params in queries:
+                with connection.cursor() as cursor:
+                    cursor.execute(f'EXPLAIN QUERY PLAN {sql}', sql_params)
+                    plan = cursor.fetchall()
+                    problems = plan_problems(cursor, sql, plan)
+                checked += 1
+                if problems:
+                    failures += 1
+                    self.stdout.write(self.style.ERROR(f"{url_name} {params}: {'; '.join(problems)}"))
+                if problems or verbosity > 1:
+                    self.stdout.write(f"  {sql}")
+                    for row in plan:
+                        self.stdout.write(f"    {row[-1]}")
+        return failures, checked
+
+    def create_booking(self):
+        """Create the smallest set of rows that lets every list view run its queries."""
+        student_user = User.objects.create_user(username='@planstudent', email='planstudent@example.org', user_type='not specified')
+        tutor_user = User.objects.create_user(username='@plantutor', email='plantutor@example.org', user_type='not specified')
+        booking = Booking.objects.create(
+            student=Student.objects.create(username=student_user, name="Plan Student", email=student_user.email),
+            tutor=Tutor.objects.create(username=tutor_user, name="Plan Tutor", email=tutor_user.email),
+        )
+        Session.objects.bulk_create([Session(booking=booking)])
+        return booking
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from tutorials.exports import CHUNK_SIZE, EXPORTS, FORMATS, export_lines
+
+
+class Command(BaseCommand):
+    """Build automation command to export every booking or session with its amounts."""
+
+    help = 'Stream all bookings or sessions, priced by the database, as CSV or JSON.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(EXPORTS), help='What to export.')
+        parser.add_argument('--format', choices=sorted(FORMATS), default='csv', help='Output format (default csv).')
+        parser.add_argument('--output', default=None, help='File to write to (default standard output).')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='Rows fetched from the database at a time.')
+
+    def handle(self, *args, **options):
+        """Write the export line by line, so memory stays flat however many rows there are."""
+        lines = export_lines(options['kind'], options['format'], options['chunk_size'])
+        if options['output'] is None:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+
+        with open(options['output'], 'w', newline='', encoding='utf-8') as output:
+            output.writelines(lines)
+        self.stderr.write(self.style.SUCCESS(f"Exported {options['kind']} to {options['output']}."))
@@ -0,0 +1,32 @@
+from datetime import date
+from django.core.management.base import BaseCommand, CommandError
+from tutorials.scheduling import find_conflicts
+
+
+class Command(BaseCommand):
+    """Build automation command to report tutors and students with overlapping sessions."""
+
+    help = 'Report sessions where a tutor or student is booked twice at the same time.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', help='First session date to check (YYYY-MM-DD).')
+        parser.add_argument('--end', help='Last session date to check (YYYY-MM-DD).')
+
+    def handle(self, *args, **options):
+        """Print one line per conflict, then a summary."""
+        try:
+            start_date = date.fromisoformat(options['start']) if options['start'] else None
+            end_date = date.fromisoformat(options['end']) if options['end'] else None
+        except ValueError as e:
+            raise CommandError(f"Invalid date: {e}")
+
+        conflicts = find_conflicts(start_date, end_date)
+        for conflict in conflicts:
+            self.stdout.write(
+                f"{conflict.kind} {conflict.person_id}: session {conflict.session_id} "
+                f"overlaps session {conflict.other_session_id}"
+            )
+        if conflicts:
+            self.stdout.write(self.style.WARNING(f"Found {len(conflicts)} conflict(s)."))
+        else:
+            self.stdout.write(self.style.SUCCESS("No conflicts found."))
@@ -0,0 +1,33 @@
+import codecs
+import os
+import sys
+from django.core.management.base import BaseCommand
+from tutorials.imports import BATCH_SIZE, import_users
+
+
+class Command(BaseCommand):
+    """Build automation command to import users, with their student or tutor profiles, from CSV."""
+
+    help = 'Import users from a CSV file with username, email, first_name, last_name and user_type columns.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV file to import, or - for standard input.')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='Rows checked and written together.')
+        parser.add_argument('--workers', type=int, default=None, help='Processes hashing passwords (default one per CPU).')
+
+    def handle(self, *args, **options):
+        """Import the file and report every rejected row."""
+        workers = options['workers'] or os.cpu_count() or 1
+        # Decoded a line at a time, so an undecodable line is reported as rejected
+        if options['path'] == '-':
+            report = import_users(codecs.iterdecode(sys.stdin.buffer, 'utf-8-sig'), options['batch_size'], workers)
+        else:
+            with open(options['path'], 'rb') as file:
+                report = import_users(codecs.iterdecode(file, 'utf-8-sig'), options['batch_size'], workers)
+
+        for line, message in report.errors:
+            self.stdout.write(self.style.ERROR(f"Line {line}: {message}"))
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {report.users} of {report.rows} users "
+            f"({report.students} students, {report.tutors} tutors); {len(report.errors)} rows rejected."
+        ))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from tutorials.profiles import reconcile_profiles
+
+
+class Command(BaseCommand):
+    """Build automation command to create any missing Student/Tutor profiles."""
+
+    help = 'Create Student and Tutor profiles for users whose user_type has none.'
+
+    def handle(self, *args, **options):
+        """Reconcile profiles in a single transaction."""
+        with transaction.atomic():
+            students_created, tutors_created = reconcile_profiles()
+        self.stdout.write(f"Created {students_created} Student profile(s).")
+        self.stdout.write(f"Created {tutors_created} Tutor profile(s).")
+        self.stdout.write(self.style.SUCCESS("Profile reconciliation complete."))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from tutorials.reports import refresh_summaries
+
+
+class Command(BaseCommand):
+    """Build automation command to rebuild the tutor workload and revenue summaries from the bookings and sessions."""
+
+    help = 'Rebuild the per-tutor, per-term summaries the tutor report reads.'
+
+    def handle(self, *args, **options):
+        """Rebuild every summary in a single transaction."""
+        written = refresh_summaries()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} tutor term summaries."))
@@ -1,7 +1,15 @@
-from datetime import datetime, time, timedelta
+from datetime import date, time, timedelta
+from itertools import islice
+from django.contrib.auth.hashers import make_password
 from django.core.management.base import BaseCommand
-from tutorials.models import User, Student, Tutor, Booking, Session, StudentRequest, Subject
+from django.db import transaction
+from tutorials.caching import invalidate_views
+from tutorials.metrics import refresh_counters
+from tutorials.reports import refresh_summaries
+from tutorials.models import User, Student, Tutor, Booking, Session, StudentRequest
+from tutorials.subjects import get_subject_id
 import random
+import re
 from faker import Faker
 
 # Predefined user data for fixtures
@@ -11,296 +19,302 @@ user_fixtures = [
     {'username': '@charlie', 'email': 'charlie.johnson@example.org', 'first_name': 'Charlie', 'last_name': 'Johnson', 'user_type': 'Student'},
 ]
 
+# Example descriptions for each kind of student request
+request_descriptions = {
+    'profile_update': [
+        "The user has requested an update to their profile information.",
+        "The student has raised a request to modify their contact details.",
+    ],
+    'password_reset': [
+        "The student has requested a reset of their account password.",
+        "The user has reported issues accessing their account due to a forgotten password.",
+    ],
+    'course_enrollment': [
+        "The student has submitted a request to enroll in a new course.",
+        "A request has been raised for enrollment in advanced programming classes.",
+    ],
+    'tutor_assignment': [
+        "The student has requested a new tutor assignment.",
+        "A request has been made to change the assigned tutor.",
+    ],
+    'session_schedule': [
+        "The student is facing issues with scheduling their sessions.",
+        "A request has been made to reschedule the upcoming tutoring session.",
+    ],
+    'payment_issue': [
+        "The user has reported a problem with the payment process.",
+        "A request has been raised to resolve pending payment issues.",
+    ],
+    'technical_support': [
+        "The student has reported a technical issue with the learning platform.",
+        "A request has been submitted for assistance with platform access.",
+    ],
+    'feedback_complaint': [
+        "The user has provided feedback about their recent session.",
+        "A complaint has been raised regarding the tutor's availability.",
+    ],
+    'custom_request': [
+        "The student has submitted a unique request not covered by standard categories.",
+        "A custom request has been made for additional learning resources.",
+    ],
+}
+
+
+def batches(iterable, size):
+    """Yield lists of up to size items from iterable without materialising it."""
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
 class Command(BaseCommand):
-    """Command to seed the database with test data."""
+    """Build automation command to seed the database with sample data.
+
+    Rows are generated in memory and written with bulk_create, one transaction
+    per batch, so large data sets for load tests seed in minutes. Usernames and
+    emails are deduplicated against sets loaded once up front, and sessions are
+    laid out on a slot grid so no tutor or student is double-booked.
+    """
 
     USER_COUNT = 300
     BOOKING_COUNT = 200
     SESSION_COUNT = 4000
     STUDENT_REQUEST_COUNT = 50
+    BATCH_SIZE = 5000
     DEFAULT_PASSWORD = 'Password123'
+    # Sessions last an hour and start at 9, 11, 13 or 15 o'clock
+    SESSION_HOURS = [9, 11, 13, 15]
+    SESSION_DURATION = timedelta(hours=1)
     help = 'Seeds the database with sample data.'
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
         self.faker = Faker('en_GB')
-        #Tala says add the functions in handle here
-        
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=self.USER_COUNT, help='Number of random users to create.')
+        parser.add_argument('--bookings', type=int, default=self.BOOKING_COUNT, help='Number of bookings to create.')
+        parser.add_argument('--sessions', type=int, default=self.SESSION_COUNT, help='Number of sessions to spread over the new bookings.')
+        parser.add_argument('--requests', type=int, default=self.STUDENT_REQUEST_COUNT, help='Number of student requests to create.')
+        parser.add_argument('--batch-size', type=int, default=self.BATCH_SIZE, help='Rows written per insert and transaction.')
+        parser.add_argument('--random-seed', type=int, default=None, help='Seed the generators for a reproducible data set.')
 
     def handle(self, *args, **options):
         """Main entry point for the seeding process."""
-        self.create_users()
-        self.debug_student_and_tutor_counts()  # Debugging step
-        self.generate_random_bookings()
-        self.generate_random_sessions()
-        self.generate_random_student_requests()
-
-    def create_users(self):
-        """Creates users from fixtures and generates additional random users."""
-        self.create_admin_user()
-        self.generate_user_fixtures()
-        self.generate_random_users()    #ERROR
-    
-
-    def create_admin_user(self):
-        """Ensures John Doe is the only admin."""
-        admin_data = next((user for user in user_fixtures if user['user_type'] == 'Admin'), None)
-        if admin_data:
-            self.try_create_user(admin_data)
-
-    def generate_user_fixtures(self):
-        """Creates predefined users from fixtures, excluding the admin."""
-        for data in user_fixtures:
-            if data['user_type'] != 'Admin':  # Skip admin as it's handled separately
-                self.try_create_user(data)
-
-    def generate_random_users(self):
-        """Generates random users until USER_COUNT is met."""
-        user_count = User.objects.exclude(user_type='admin').count()
-        while user_count < self.USER_COUNT:
-            first_name = self.faker.first_name()
-            last_name = self.faker.last_name()
-            email = self.create_email(first_name, last_name)
-            username = self.create_username(first_name, last_name)
-            user_type = self.generate_random_user_type()
-
-            user_data = {
-                'username': username,
-                'email': email,
-                'first_name': first_name,
-                'last_name': last_name,
-                'user_type': user_type,
-            }
-            self.try_create_user(user_data)
-            user_count = User.objects.exclude(user_type='admin').count()
-
-        print("Users seeding complete.")
-
-    def try_create_user(self, data):
-        """Attempts to create a user and logs errors."""
+        self.batch_size = options['batch_size']
+        if options['random_seed'] is not None:
+            random.seed(options['random_seed'])
+            self.faker.seed_instance(options['random_seed'])
+
         try:
-            user, created = User.objects.get_or_create(
-                username=data['username'],
-                defaults={
-                    'email': data['email'],
-                    'password': self.DEFAULT_PASSWORD,
-                    'first_name': data['first_name'],
-                    'last_name': data['last_name'],
-                    'user_type': data['user_type'].lower(),
-                }
+            self.create_users(options['users'])
+            bookings = self.generate_random_bookings(options['bookings'])
+            self.generate_random_sessions(bookings, options['sessions'])
+            self.generate_random_student_requests(options['requests'])
+        finally:
+            # bulk_create skips the signals that count and summarise rows and invalidate cached pages
+            refresh_counters()
+            refresh_summaries()
+            invalidate_views()
+        self.stdout.write(self.style.SUCCESS("Database seeding complete."))
+
+    def bulk_insert(self, model, objects):
+        """Write objects in batches, each in its own transaction, and return those created."""
+        created = []
+        for batch in batches(objects, self.batch_size):
+            with transaction.atomic():
+                created.extend(model.objects.bulk_create(batch))
+        return created
+
+    def create_users(self, count):
+        """Creates the fixture users and count random users, with their profiles."""
+        self.usernames = set(User.objects.values_list('username', flat=True))
+        self.emails = set(User.objects.values_list('email', flat=True))
+        # Hashing is deliberately slow, and every seeded user shares the password
+        self.password = make_password(self.DEFAULT_PASSWORD)
+
+        users = [self.build_user(data) for data in user_fixtures if data['username'] not in self.usernames]
+        for user in users:
+            self.usernames.add(user.username)
+            self.emails.add(user.email)
+        users.extend(self.generate_random_user() for _ in range(count))
+        users = self.bulk_insert(User, users)
+
+        # bulk_create skips the signals that normally create profiles
+        students = self.bulk_insert(Student, (
+            Student(
+                username=user, name=user.full_name, email=user.email,
+                allocated=random.choice([True, False]),
+                payment=random.choice([Student.PENDING, Student.SUCCESSFUL]),
             )
-            if created:
-                if data['user_type'].lower() == 'student':
-                    student, created = Student.objects.get_or_create(
-                        username=user,
-                        defaults={
-                            'name': f"{data['first_name']} {data['last_name']}",
-                            'email': data['email'],
-                            'allocated': random.choice([True, False]),
-                            'payment': random.choice(['Successful', 'Pending']),
-                            }
-                        )
-                    if not created:
-                        # Update existing student with random payment if already created
-                        student.payment = random.choice(['Successful', 'Pending'])
-                        student.allocated = random.choice([True, False])
-                        student.save()
-
-                elif data['user_type'].lower() == 'tutor':
-                    tutor, created = Tutor.objects.get_or_create(
-                        username=user,
-                        defaults={
-                            'name': f"{data['first_name']} {data['last_name']}",
-                            'email': data['email'],
-                            'rate': random.choice([10.0, 20.0, 30.0, 40.0, 50.0]),
-                        }
-                    )
-                    # Assign dynamic rate and subjects even if tutor already exists
-                    if not created:
-                        tutor.rate = random.choice([10.0, 20.0, 30.0, 40.0, 50.0])
-                        tutor.save()
-
-                elif data['user_type'].lower() == 'admin':
-                    user.is_staff = True
-                    user.is_superuser = True
-                    user.set_password(self.DEFAULT_PASSWORD)
-                    user.save()
-        except Exception as e:
-            print(f"Error creating user {data['username']}: {e}")
-
-    def debug_student_and_tutor_counts(self):
-        """Logs counts of students and tutors."""
-        student_count = Student.objects.count()
-        tutor_count = Tutor.objects.count()
-        print(f"Students in DB: {student_count}")
-        print(f"Tutors in DB: {tutor_count}")
-
-    def generate_random_bookings(self):
-        """Generates random bookings."""
-        terms = ['Term 1', 'Term 2', 'Term 3']
-        lesson_types = ['Fortnight', 'Weekly', 'Bi-Weekly']
-        students = Student.objects.all()
-        tutors = Tutor.objects.all()
-
-        if not students.exists() or not tutors.exists():
-            print("No students or tutors available to create bookings.")
+            for user in users if user.user_type == 'student'
+        ))
+        tutors = self.bulk_insert(Tutor, (
+            Tutor(username=user, name=user.full_name, email=user.email, rate=random.choice([10, 20, 30, 40, 50]))
+            for user in users if user.user_type == 'tutor'
+        ))
+        python_id = get_subject_id("Python")
+        self.bulk_insert(Tutor.subjects.through, (
+            Tutor.subjects.through(tutor_id=tutor.id, subject_id=python_id) for tutor in tutors
+        ))
+        self.stdout.write(f"Created {len(users)} users, {len(students)} students and {len(tutors)} tutors.")
+
+    def build_user(self, data):
+        """Returns an unsaved user for a fixture, making the admin a superuser."""
+        user_type = data['user_type'].lower()
+        return User(
+            username=data['username'],
+            email=data['email'],
+            first_name=data['first_name'],
+            last_name=data['last_name'],
+            user_type=user_type,
+            password=self.password,
+            is_staff=user_type == 'admin',
+            is_superuser=user_type == 'admin',
+        )
+
+    def generate_random_user(self):
+        """Returns an unsaved random user with a unique username and email."""
+        first_name = self.faker.first_name()
+        last_name = self.faker.last_name()
+        return self.build_user({
+            'username': self.create_username(first_name, last_name),
+            'email': self.create_email(first_name, last_name),
+            'first_name': first_name,
+            'last_name': last_name,
+            'user_type': self.generate_random_user_type(),
+        })
+
+    def generate_random_bookings(self, count):
+        """Creates up to count bookings and returns (id, student_id, tutor_id) for each."""
+        student_ids = list(Student.objects.values_list('id', flat=True))
+        tutor_ids = list(Tutor.objects.values_list('id', flat=True))
+        if not count:
+            return []
+        if not student_ids or not tutor_ids:
+            self.stdout.write("No students or tutors available to create bookings.")
+            return []
+
+        terms = [term for term, label in Booking.TERM_CHOICES]
+        lesson_types = [lesson_type for lesson_type, label in Booking.LESSON_TYPE_CHOICES]
+        taken = set(Booking.objects.values_list('term', 'lesson_type', 'student_id', 'tutor_id'))
+        bookings = []
+        # Give up eventually if most combinations are already booked
+        for _ in range(count * 10):
+            key = (random.choice(terms), random.choice(lesson_types), random.choice(student_ids), random.choice(tutor_ids))
+            if key in taken:
+                continue
+            taken.add(key)
+            term, lesson_type, student_id, tutor_id = key
+            bookings.append(Booking(term=term, lesson_type=lesson_type, student_id=student_id, tutor_id=tutor_id))
+            if len(bookings) == count:
+                break
+
+        bookings = self.bulk_insert(Booking, bookings)
+        self.stdout.write(f"Created {len(bookings)} bookings.")
+        return [(booking.id, booking.student_id, booking.tutor_id) for booking in bookings]
+
+    def generate_random_sessions(self, bookings, count):
+        """Spreads count sessions evenly over the given bookings."""
+        if not count:
+            return
+        if not bookings:
+            self.stdout.write("No bookings available to create sessions.")
             return
 
-        for _ in range(self.BOOKING_COUNT):
-            student = random.choice(students)
-            tutor = random.choice(tutors)
-            term = random.choice(terms)
-            lesson_type = random.choice(lesson_types)
-
-            try:
-                Booking.objects.get_or_create(
-                    term=term,
-                    lesson_type=lesson_type,
-                    student=student,
-                    tutor=tutor
+        created = 0
+        for batch in batches(self.plan_sessions(bookings, count), self.batch_size):
+            with transaction.atomic():
+                Session.objects.bulk_create(batch)
+            created += len(batch)
+            self.stdout.write(f"Created {created}/{count} sessions.")
+
+    def plan_sessions(self, bookings, count):
+        """Yields unsaved sessions, each in a slot its tutor and student both have free.
+
+        Busy slots are kept per run in memory as integers, so sessions created
+        earlier or by other means are not taken into account.
+        """
+        today = date.today()
+        slots_per_day = len(self.SESSION_HOURS)
+        tutor_busy = set()
+        student_busy = set()
+        per_booking, extra = divmod(count, len(bookings))
+
+        for index, (booking_id, student_id, tutor_id) in enumerate(bookings):
+            # Start on a random day within the next 30 days
+            slot = random.randint(0, 30) * slots_per_day
+            for _ in range(per_booking + (index < extra)):
+                # Pack (person, slot) into one int to keep a million sessions cheap
+                while tutor_id << 32 | slot in tutor_busy or student_id << 32 | slot in student_busy:
+                    slot += 1
+                tutor_busy.add(tutor_id << 32 | slot)
+                student_busy.add(student_id << 32 | slot)
+                day, hour = divmod(slot, slots_per_day)
+                yield Session(
+                    booking_id=booking_id,
+                    session_date=today + timedelta(days=day),
+                    session_time=time(self.SESSION_HOURS[hour]),
+                    duration=self.SESSION_DURATION,
+                    venue=random.choice([Session.VENUE_BUSH_HOUSE, Session.VENUE_WATERLOO]),
+                    payment_status=random.choice([Session.PAYMENT_PENDING, Session.PAYMENT_SUCCESSFUL]),
                 )
-            except Exception as e:
-                print(f"Error creating booking: {e}")
+                slot += 1
 
-        print("Bookings seeding complete.")
-
-    def generate_random_sessions(self):
-        """Generates exactly 20 non-overlapping sessions per booking."""
-        bookings = Booking.objects.all()
-        venues = ['Bush House', 'Waterloo Campus']
-
-        if not bookings.exists():
-            print("No bookings available to create sessions.")
+    def generate_random_student_requests(self, count):
+        """Creates count random student requests."""
+        students = list(Student.objects.values_list('name', 'username_id'))
+        if not count:
             return
-
-        for booking in bookings:
-            # Start the sessions on a random date within the next 90 days
-            session_start_date = self.faker.date_between(start_date="today", end_date="+30d")
-            session_start_time = datetime.combine(session_start_date, time(hour=9))  # Start at 9:00 AM
-
-            for i in range(20):  # Create 20 sessions
-                # Calculate the session's start time and date
-                current_session_time = session_start_time + timedelta(days=i // 4, hours=(i % 4) * 2)  # 4 sessions per day, 2 hours apart
-                session_date = current_session_time.date()
-                session_time = current_session_time.time()
-
-                # Session attributes
-                duration = timedelta(hours=1)
-                venue = random.choice(venues)
-                payment_status = random.choice(['Pending', 'Successful'])
-
-                try:
-                    # Create the session
-                    Session.objects.create(
-                        booking=booking,
-                        session_date=session_date,
-                        session_time=session_time,
-                        duration=duration,
-                        venue=venue,
-                        payment_status=payment_status,
-                    )
-                except Exception as e:
-                    print(f"Error creating session for booking {booking.id}: {e}")
-
-        print("Sessions seeding complete.")
-
-
-
-
-
-    def generate_random_student_requests(self):
-        """Generates random student requests."""
-        students = Student.objects.all()
-
-        if not students.exists():
-            print("No students available to create student requests.")
+        if not students:
+            self.stdout.write("No students available to create student requests.")
             return
 
-        for _ in range(self.STUDENT_REQUEST_COUNT):
-            student = random.choice(students)
-            request_data = {
-                'Profile Update': [
-                    "The user has requested an update to their profile information.",
-                    "The student has raised a request to modify their contact details.",
-                ],
-                'Password Reset': [
-                    "The student has requested a reset of their account password.",
-                    "The user has reported issues accessing their account due to a forgotten password.",
-                ],
-                'Course Enrollment': [
-                    "The student has submitted a request to enroll in a new course.",
-                    "A request has been raised for enrollment in advanced programming classes.",
-                ],
-                'Tutor Assignment': [
-                    "The student has requested a new tutor assignment.",
-                    "A request has been made to change the assigned tutor.",
-                ],
-                'Session Scheduling': [
-                    "The student is facing issues with scheduling their sessions.",
-                    "A request has been made to reschedule the upcoming tutoring session.",
-                ],
-                'Payment Issue': [
-                    "The user has reported a problem with the payment process.",
-                    "A request has been raised to resolve pending payment issues.",
-                ],
-                'Technical Support': [
-                    "The student has reported a technical issue with the learning platform.",
-                    "A request has been submitted for assistance with platform access.",
-                ],
-                'Feedback/Complaint': [
-                    "The user has provided feedback about their recent session.",
-                    "A complaint has been raised regarding the tutor's availability.",
-                ],
-                'Custom Request': [
-                    "The student has submitted a unique request not covered by standard categories.",
-                    "A custom request has been made for additional learning resources.",
-                ],
-            }
-            request_type = random.choice(list(request_data.keys()))
-            description = random.choice(request_data[request_type])
-            status = random.choice(['Pending', 'In Progress', 'Resolved'])
-            priority = random.choice(['Low', 'Medium', 'High'])
-            created_at = self.faker.date_between(start_date='-30d', end_date='today')
-
-            try:
-                StudentRequest.objects.create(
-                    name=student.name,
-                    username=student.username,
-                    request_type=request_type,
-                    description=description,
-                    status=status,
-                    priority=priority,
-                    created_at=created_at
-                )
-            except Exception as e:
-                print(f"Error creating student request: {e}")
+        statuses = ['pending', 'in_progress', 'resolved']
+        priorities = [priority for priority, label in StudentRequest.PRIORITY_CHOICES]
+
+        def build_request():
+            name, user_id = random.choice(students)
+            request_type = random.choice(list(request_descriptions))
+            return StudentRequest(
+                name=name,
+                username_id=user_id,
+                request_type=request_type,
+                description=random.choice(request_descriptions[request_type]),
+                status=random.choice(statuses),
+                priority=random.choice(priorities),
+            )
 
-        print("Student requests seeding complete.")
+        requests = self.bulk_insert(StudentRequest, (build_request() for _ in range(count)))
+        self.stdout.write(f"Created {len(requests)} student requests.")
 
     def create_username(self, first_name, last_name):
         """Generates a unique username."""
-        base_username = f"@{first_name.strip().lower()}{last_name.strip().lower()}"
+        # Usernames only allow word characters, so drop hyphens and apostrophes
+        base_username = "@" + re.sub(r'\W', '', f"{first_name}{last_name}".lower())[:24]
         counter = 1
         username = base_username
 
-        while User.objects.filter(username=username).exists():
+        while username in self.usernames:
             username = f"{base_username}{counter}"
             counter += 1
 
+        self.usernames.add(username)
         return username
 
     def create_email(self, first_name, last_name):
         """Generates a unique email."""
-        base_email = f"{first_name.strip().lower()}.{last_name.strip().lower()}@example.org"
+        local_part = re.sub(r'[^\w.]', '', f"{first_name}.{last_name}".lower())
         counter = 1
-        email = base_email
+        email = f"{local_part}@example.org"
 
-        while User.objects.filter(email=email).exists():
-            email = f"{first_name.strip().lower()}.{last_name.strip().lower()}{counter}@example.org"
+        while email in self.emails:
+            email = f"{local_part}{counter}@example.org"
             counter += 1
 
+        self.emails.add(email)
         return email
 
     def generate_random_user_type(self):
         """Randomly selects a user type."""
-        return random.choices(['Student', 'Tutor'], weights=[70, 30])[0]
\ No newline at end of file
+        return random.choices(['Student', 'Tutor'], weights=[70, 30])[0]
@@ -1,45 +1,76 @@
-from django.core.management.base import BaseCommand
-from tutorials.models import User, Student, Tutor, Booking, Session, StudentRequest, Subject
+from time import perf_counter
+from django.contrib.admin.models import LogEntry
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from tutorials.caching import invalidate_views
+from tutorials.metrics import refresh_counters
+from tutorials.reports import refresh_summaries
+from tutorials.models import User, Student, Tutor, TutorTermSummary, Booking, Session, StudentRequest
 
 
 class Command(BaseCommand):
-    """Build automation command to unseed the database."""
+    """Build automation command to unseed the database.
+
+    Rows are removed with one bulk DELETE per table, children before parents,
+    inside a single transaction. This skips Django's cascade collector and
+    delete signals, so every table that points at a deleted one must be listed
+    in deletion_plan(). The subject catalogue is reference data seeded by a
+    migration, not sample data, so it is kept.
+    """
 
     help = 'Unseed the database by deleting all sample data.'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many rows would be deleted.')
+
+    def deletion_plan(self):
+        """Return (label, queryset) pairs in the order they are safe to delete."""
+        non_staff = User.objects.filter(is_staff=False)
+        return [
+            ('Session', Session.objects.all()),
+            ('Booking', Booking.objects.all()),
+            ('StudentRequest', StudentRequest.objects.all()),
+            ('Tutor term summary', TutorTermSummary.objects.all()),
+            ('Tutor subject', Tutor.subjects.through.objects.all()),
+            ('Tutor', Tutor.objects.all()),
+            ('Student', Student.objects.all()),
+            ('User group', User.groups.through.objects.filter(user__in=non_staff)),
+            ('User permission', User.user_permissions.through.objects.filter(user__in=non_staff)),
+            ('Admin log', LogEntry.objects.filter(user__in=non_staff)),
+            ('non-staff User', non_staff),
+        ]
+
     def handle(self, *args, **options):
         """Unseed the database."""
-        self.stdout.write("Starting database unseeding...")
+        if options['dry_run']:
+            self.report_counts()
+            return
 
+        self.stdout.write("Starting database unseeding...")
+        start = perf_counter()
         try:
-            # Delete data from dependent models first to avoid integrity errors
-            Session.objects.all().delete()
-            self.stdout.write("Deleted all Session data.")
-
-            Booking.objects.all().delete()
-            self.stdout.write("Deleted all Booking data.")
-
-            StudentRequest.objects.all().delete()
-            self.stdout.write("Deleted all StudentRequest data.")
-
-            Tutor.objects.all().delete()
-            self.stdout.write("Deleted all Tutor data.")
-
-            Student.objects.all().delete()
-            self.stdout.write("Deleted all Student data.")
-
-            Subject.objects.all().delete()
-            self.stdout.write("Deleted all Subject data.")
-
-            # Delete non-staff users
-            User.objects.filter(is_staff=False).delete()
-            self.stdout.write("Deleted all non-staff User data.")
-
-            self.stdout.write(self.style.SUCCESS("Database unseeding complete."))
+            with transaction.atomic():
+                total = 0
+                for label, queryset in self.deletion_plan():
+                    step_start = perf_counter()
+                    deleted = queryset._raw_delete(queryset.db)
+                    total += deleted
+                    self.stdout.write(f"Deleted {deleted} {label} rows in {perf_counter() - step_start:.2f}s.")
         except Exception as e:
-            self.stderr.write(self.style.ERROR(f"Unseeding failed: {e}"))
-
-        
+            raise CommandError(f"Unseeding failed, nothing was deleted: {e}")
+        finally:
+            # The raw deletes bypass the signals that keep these caches fresh
+            refresh_counters()
+            refresh_summaries()
+            invalidate_views()
 
-        
+        self.stdout.write(self.style.SUCCESS(f"Database unseeding complete: {total} rows in {perf_counter() - start:.2f}s."))
 
+    def report_counts(self):
+        """Print the rows each step would delete without deleting anything."""
+        total = 0
+        for label, queryset in self.deletion_plan():
+            count = queryset.count()
+            total += count
+            self.stdout.write(f"Would delete {count} {label} rows.")
+        self.stdout.write(self.style.SUCCESS(f"Dry run: {total} rows would be deleted."))
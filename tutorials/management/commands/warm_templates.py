@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.template import TemplateSyntaxError
+from tutorials.warmup import warm_templates
+
+
+class Command(BaseCommand):
+    """Build automation command to compile every template and report its render time."""
+
+    help = 'Compile and render every template under tutorials/templates/, failing on a syntax error.'
+
+    def handle(self, *args, **options):
+        """Warm each template and print its compile and render times."""
+        try:
+            timings = warm_templates()
+        except TemplateSyntaxError as error:
+            raise CommandError(f"Template syntax error: {error}")
+
+        for name, compile_time, render_time, error in timings:
+            if error:
+                self.stdout.write(f"{name}: compiled in {compile_time * 1000:.1f}ms, not rendered ({error})")
+            else:
+                self.stdout.write(f"{name}: compiled in {compile_time * 1000:.1f}ms, rendered in {render_time * 1000:.1f}ms")
+        total = sum(compile_time + (render_time or 0) for _, compile_time, render_time, _ in timings)
+        self.stdout.write(self.style.SUCCESS(f"Warmed {len(timings)} templates in {total * 1000:.1f}ms."))
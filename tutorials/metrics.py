@@ -0,0 +1,139 @@
+"""Dashboard counters, kept up to date as rows change rather than counted on each load.
+
+Each metric counts the rows of one model by the values of a few of its
+fields, such as the students not yet allocated. The counts live in the
+DashboardCounter table, so the dashboard reads them all in one query.
+tutorials.signals adjusts them whenever a counted row is created, deleted or
+changes the fields it is counted by; models remember those fields' loaded
+values (see CountedFieldsMixin), so a save costs no extra query to compare
+against, and a save changing no count writes nothing.
+
+Sessions are counted per week of their date, so this week's count is read
+from the counter of the current week.
+
+Bulk writes skip signals, so they call count_created() for the rows they
+insert. refresh_counters() recomputes every counter from the tables; it runs
+after every migrate and from `manage.py refresh_dashboard`, which can be
+scheduled to correct any drift from raw SQL or queryset.update().
+"""
+
+from collections import Counter, namedtuple
+from datetime import date, timedelta
+from django.db import transaction
+from django.db.models import Case, Count, F, IntegerField, Value, When
+from .models import DashboardCounter, Session, Student, StudentRequest
+
+# counter(*values) returns the counter a row with those field values counts
+# towards, or None
+Metric = namedtuple('Metric', ['model', 'fields', 'counter'])
+
+WEEK_PREFIX = 'sessions_week:'
+
+
+def week_counter(day):
+    """Return the name of the counter of sessions in the week (from Monday) of day."""
+
+    return f'{WEEK_PREFIX}{day - timedelta(days=day.weekday())}'
+
+
+METRICS = [
+    Metric(Student, ['allocated'], lambda allocated: None if allocated else 'unallocated_students'),
+    Metric(Student, ['payment'], lambda payment: 'pending_payments' if payment == Student.PENDING else None),
+    Metric(StudentRequest, ['status'], lambda status: None if status == 'resolved' else 'open_requests'),
+    Metric(Session, ['session_date'], week_counter),
+]
+
+
+def counters(model, values):
+    """Return the counters a row of model with values (a field name to value dict) counts towards."""
+
+    names = []
+    for metric in METRICS:
+        if metric.model is model:
+            name = metric.counter(*[values[field] for field in metric.fields])
+            if name is not None:
+                names.append(name)
+    return names
+
+
+def current_values(instance):
+    """Return the counted field values of an instance as it is now."""
+
+    return {field: getattr(instance, field) for field in type(instance).COUNTED_FIELDS}
+
+
+def stored_values(instance, using=None):
+    """Return the counted field values of instance's row in the database, None if it has none.
+
+    Instances read from the database remember them; others are looked up.
+    """
+
+    fields = type(instance).COUNTED_FIELDS
+    if all(field in instance._counted_values for field in fields):
+        return instance._counted_values
+    if instance.pk is None:
+        return None
+    return type(instance)._default_manager.using(using).filter(pk=instance.pk).values(*fields).first()
+
+
+def adjust(changes, using=None):
+    """Add each counter's change, given as a counter name to delta mapping.
+
+    Missing counters are created at zero first, then every counter is
+    changed in one UPDATE, so concurrent adjustments never lose a change.
+    """
+
+    changes = {name: delta for name, delta in changes.items() if delta}
+    if not changes:
+        return
+    stored = DashboardCounter.objects.using(using)
+    stored.bulk_create([DashboardCounter(name=name) for name in changes], ignore_conflicts=True)
+    stored.filter(name__in=changes).update(value=F('value') + Case(
+        *[When(name=name, then=Value(delta)) for name, delta in changes.items()],
+        output_field=IntegerField(),
+    ))
+
+
+def count_created(instances, using=None):
+    """Count rows inserted without signals, such as by bulk_create."""
+
+    changes = Counter()
+    for instance in instances:
+        changes.update(counters(type(instance), current_values(instance)))
+    adjust(changes, using)
+
+
+def compute_counters(using=None):
+    """Count every metric from the tables, one grouped query per metric."""
+
+    totals = Counter()
+    for metric in METRICS:
+        groups = metric.model._default_manager.using(using).order_by().values_list(*metric.fields).annotate(rows=Count('pk'))
+        for *values, rows in groups:
+            name = metric.counter(*values)
+            if name is not None:
+                totals[name] += rows
+    return totals
+
+
+def refresh_counters(using=None):
+    """Replace every counter with a fresh count from the tables, returning the counts."""
+
+    with transaction.atomic(using=using):
+        totals = compute_counters(using)
+        DashboardCounter.objects.using(using).all().delete()
+        DashboardCounter.objects.using(using).bulk_create([
+            DashboardCounter(name=name, value=value) for name, value in totals.items()
+        ])
+    return totals
+
+
+def dashboard_counts(today=None):
+    """Return the dashboard's counts, this week's sessions as 'sessions_this_week', in one query."""
+
+    this_week = week_counter(today or date.today())
+    names = ['unallocated_students', 'pending_payments', 'open_requests']
+    stored = dict(DashboardCounter.objects.filter(name__in=names + [this_week]).values_list('name', 'value'))
+    counts = {name: stored.get(name, 0) for name in names}
+    counts['sessions_this_week'] = stored.get(this_week, 0)
+    return counts
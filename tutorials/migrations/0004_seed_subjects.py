@@ -0,0 +1,24 @@
+from django.db import migrations
+
+SUBJECTS = [
+    'Python', 'Java', 'Javascript', 'React',
+    'Ruby', 'Go', 'HTML/CSS', 'C', 'Scala',
+]
+
+
+def seed_subjects(apps, schema_editor):
+    """Create the subject catalogue tutors can choose from."""
+    Subject = apps.get_model('tutorials', 'Subject')
+    for name in SUBJECTS:
+        Subject.objects.get_or_create(name=name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutorials', '0003_alter_tutor_subjects'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_subjects, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.16 on 2026-10-18 02:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutorials', '0004_seed_subjects'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='session',
+            index=models.Index(fields=['session_date', 'session_time'], name='session_date_time_idx'),
+        ),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 4.2.16 on 2026-10-18 03:28
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutorials', '0005_session_date_time_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='session',
+            name='booking',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='sessions', to='tutorials.booking'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['lesson_type', 'term', 'student', 'tutor'], name='booking_lesson_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(condition=models.Q(('allocated', True)), fields=['id'], name='student_allocated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(condition=models.Q(('allocated', False)), fields=['id'], name='student_unallocated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['payment'], name='student_payment_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['name'], name='student_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentrequest',
+            index=models.Index(fields=['status'], name='request_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentrequest',
+            index=models.Index(fields=['priority'], name='request_priority_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentrequest',
+            index=models.Index(fields=['request_type'], name='request_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentrequest',
+            index=models.Index(fields=['name'], name='request_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tutor',
+            index=models.Index(fields=['name'], name='tutor_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['last_name', 'first_name'], name='user_last_first_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['first_name', 'last_name'], name='user_first_last_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['user_type', 'last_name', 'first_name'], name='user_type_last_first_idx'),
+        ),
+        # The auto-created tutor/subject table has no Meta; walking it by subject
+        # in tutor order lets tutors_list filter by subject without sorting
+        migrations.RunSQL(
+            'CREATE INDEX "tutor_subjects_subject_tutor_idx" ON "tutorials_tutor_subjects" ("subject_id", "tutor_id")',
+            reverse_sql='DROP INDEX "tutor_subjects_subject_tutor_idx"',
+        ),
+    ]
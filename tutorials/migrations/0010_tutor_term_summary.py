@@ -0,0 +1,37 @@
+# Generated by Django 4.2.16 on 2026-10-18 04:29
+
+from decimal import Decimal
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutorials', '0009_dashboard_counter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TutorTermSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(choices=[('Term1', 'Term 1'), ('Term2', 'Term 2'), ('Term3', 'Term 3')], max_length=10)),
+                ('tutor_name', models.CharField(max_length=255)),
+                ('booking_count', models.PositiveIntegerField(default=0)),
+                ('session_count', models.PositiveIntegerField(default=0)),
+                ('booked_minutes', models.PositiveIntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('paid', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('pending', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('tutor', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='term_summaries', to='tutorials.tutor')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['term', 'tutor_name'], name='summary_term_name_idx'), models.Index(fields=['term', 'booked_minutes'], name='summary_term_minutes_idx'), models.Index(fields=['term', 'revenue'], name='summary_term_revenue_idx'), models.Index(fields=['term', 'pending'], name='summary_term_pending_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='tutortermsummary',
+            constraint=models.UniqueConstraint(fields=('tutor', 'term'), name='unique_tutor_term_summary'),
+        ),
+    ]
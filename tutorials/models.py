@@ -1,10 +1,33 @@
 from decimal import Decimal
 from django.core.validators import RegexValidator, MinValueValidator, MaxValueValidator
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Lower
 from django.forms import ValidationError
+from django.utils import timezone
 from libgravatar import Gravatar
-from datetime import datetime, timedelta, date, time
+from datetime import timedelta, date, time
+
+
+class CountedFieldsMixin:
+    """Remember the database values of COUNTED_FIELDS.
+
+    tutorials.metrics counts rows by these fields, and tutorials.reports
+    summarises them by these fields, so either can tell what a save changed
+    without reading the row again.
+    """
+
+    COUNTED_FIELDS = ()
+    # The COUNTED_FIELDS values last read from or written to the database, empty if unknown
+    _counted_values = {}
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._counted_values = {
+            name: value for name, value in zip(field_names, values) if name in cls.COUNTED_FIELDS
+        }
+        return instance
 
 
 class User(AbstractUser):
@@ -28,11 +51,21 @@ class User(AbstractUser):
     last_name = models.CharField(max_length=50, blank=False)
     email = models.EmailField(unique=True, blank=False, null=False)
     user_type = models.CharField(max_length=15, choices=USER_TYPES, default='student')
+    # Keys the cached list rows; stamped on save by tutorials.signals
+    updated_at = models.DateTimeField(default=timezone.now, editable=False)
 
     class Meta:
         """Model options."""
 
         ordering = ['last_name', 'first_name']
+        # One index per users_list ordering, plus the user_type filter in the default order
+        indexes = [
+            models.Index(fields=['last_name', 'first_name'], name='user_last_first_idx'),
+            models.Index(fields=['first_name', 'last_name'], name='user_first_last_idx'),
+            models.Index(fields=['user_type', 'last_name', 'first_name'], name='user_type_last_first_idx'),
+            # Case-insensitive email lookups, as the bulk import makes
+            models.Index(Lower('email'), name='user_email_lower_idx'),
+        ]
     @property
     def full_name(self):
         """Return a string containing the user's full name."""
@@ -59,34 +92,41 @@ class User(AbstractUser):
         
         return self.gravatar(size=60)
     
-    def save(self, *args, **kwargs):
-        is_new = self.pk is None  # Check if the User is being created
+    # The user_type last read from or written to the database, None if unsaved
+    _original_user_type = None
 
-        if self.username == "@johndoe":
-            self.user_type = 'admin'
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if 'user_type' in field_names:
+            instance._original_user_type = values[field_names.index('user_type')]
+        return instance
 
-        super().save(*args, **kwargs)  # Call the parent save method
-        
-        # Ensure a Student instance is created if the user_type is 'student'
-        if self.user_type == 'student' and not Student.objects.filter(username=self).exists():
-            Student.objects.create(username=self, name=self.full_name, email=self.email)
-        
-        # Ensure a Tutor instance is created if the user_type is 'tutor'
-        if self.user_type == 'tutor' and not Tutor.objects.filter(username=self).exists():
-            Tutor.objects.create(username=self, name=self.full_name, email=self.email)
+    def needs_profile_sync(self, update_fields=None):
+        """Return True if saving may change which Student/Tutor profile this user needs."""
+
+        if update_fields is not None and 'user_type' not in update_fields:
+            return False
+        return self.user_type != self._original_user_type
 
-        # If switching user_type from 'tutor' to 'student', delete related Tutor
-        if not is_new and self.user_type == 'student':
-            Tutor.objects.filter(username=self).delete()
+    def save(self, *args, **kwargs):
+        if self.username == "@johndoe":
+            self.user_type = 'admin'
 
-        # If switching user_type from 'student' to 'tutor', delete related Student
-        if not is_new and self.user_type == 'tutor':
-            Student.objects.filter(username=self).delete()
+        # Student/Tutor profiles are kept in sync by tutorials.signals, so
+        # saves that may change the profile write the user and profile together
+        if self.needs_profile_sync(kwargs.get('update_fields')):
+            with transaction.atomic(using=kwargs.get('using')):
+                super().save(*args, **kwargs)
+        else:
+            super().save(*args, **kwargs)
 
 
-class Student(models.Model):
+class Student(CountedFieldsMixin, models.Model):
     """Model used for student"""
     
+    COUNTED_FIELDS = ('allocated', 'payment')
+
     PENDING = 'Pending'
     SUCCESSFUL = 'Successful'
 
@@ -104,6 +144,18 @@ class Student(models.Model):
         choices=PAYMENT_CHOICES,
         default=PENDING,
     )
+    # Keys the cached list rows; stamped on save by tutorials.signals
+    updated_at = models.DateTimeField(default=timezone.now, editable=False)
+
+    class Meta:
+        # The students_list filters and name ordering. Django filters booleans
+        # with a bare column predicate, which only a matching partial index serves.
+        indexes = [
+            models.Index(fields=['id'], condition=models.Q(allocated=True), name='student_allocated_idx'),
+            models.Index(fields=['id'], condition=models.Q(allocated=False), name='student_unallocated_idx'),
+            models.Index(fields=['payment'], name='student_payment_idx'),
+            models.Index(fields=['name'], name='student_name_idx'),
+        ]
 
     def save(self, *args, **kwargs):
         # Normalize email to lowercase
@@ -121,8 +173,11 @@ class Student(models.Model):
         return f"{self.name} ({self.username.username}) is {allocation_status} and has payment status {self.payment}."
 
 
-class StudentRequest(models.Model):
+class StudentRequest(CountedFieldsMixin, models.Model):
     """Model used for student requests"""
+
+    COUNTED_FIELDS = ('status',)
+
     # Types of requests
     REQUEST_TYPE_CHOICES = [
         ('profile_update', 'Profile Update'),
@@ -157,6 +212,15 @@ class StudentRequest(models.Model):
     # Automatically adds the current timestamp when the record is created
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        # The student_requests filters and name ordering
+        indexes = [
+            models.Index(fields=['status'], name='request_status_idx'),
+            models.Index(fields=['priority'], name='request_priority_idx'),
+            models.Index(fields=['request_type'], name='request_type_idx'),
+            models.Index(fields=['name'], name='request_name_idx'),
+        ]
+
     def __str__(self):
         return f"{self.username.username} - {self.get_request_type_display()}"
 
@@ -180,8 +244,10 @@ class Subject(models.Model):
     def __str__(self):
         return self.name
 
-class Tutor(models.Model):
+class Tutor(CountedFieldsMixin, models.Model):
     """Model used for tutor"""
+    COUNTED_FIELDS = ('name', 'rate')
+
     SUBJECT_CHOICES = [
         ('Python', 'Python'),
         ('Java', 'Java'),
@@ -198,16 +264,26 @@ class Tutor(models.Model):
     email = models.EmailField(unique=True)
     subjects = models.ManyToManyField(Subject, related_name='tutors') 
     rate = models.DecimalField(max_digits=6, decimal_places=2, default=10.00, validators=[MinValueValidator(Decimal('0.01'))],)  
-    
+    # Keys the cached list rows; stamped on save, and when the tutor's
+    # subjects change, by tutorials.signals
+    updated_at = models.DateTimeField(default=timezone.now, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['name'], name='tutor_name_idx'),
+        ]
 
     def save(self, *args, **kwargs):
+        from .subjects import get_subject_id
+
+        adding = self._state.adding
         # Normalize email to lowercase
         if self.email:
             self.email = self.email.lower()
         super().save(*args, **kwargs)
-        if not self.subjects.exists():
-            python_subject, created = Subject.objects.get_or_create(name="Python")
-            self.subjects.add(python_subject)
+        # A new tutor has no subjects yet, so only existing tutors need checking
+        if adding or not self.subjects.exists():
+            self.subjects.add(get_subject_id("Python"))
 
     def __str__(self):
         return f"{self.name} ({self.username.username})"
@@ -219,8 +295,10 @@ class Tutor(models.Model):
 
 
 
-class Booking(models.Model):
+class Booking(CountedFieldsMixin, models.Model):
     """Model to represent a booking between a student and a tutor."""
+    COUNTED_FIELDS = ('tutor_id', 'term')
+
     TERM1 = 'Term1'
     TERM2 = 'Term2'
     TERM3 = 'Term3'
@@ -249,6 +327,10 @@ class Booking(models.Model):
     class Meta:
         ordering = ['term', 'lesson_type', 'student', 'tutor']
         unique_together = ['term', 'lesson_type', 'student', 'tutor']
+        # The unique index serves the term filter; this one the lesson_type filter, in the same order
+        indexes = [
+            models.Index(fields=['lesson_type', 'term', 'student', 'tutor'], name='booking_lesson_type_idx'),
+        ]
 
     def clean(self):        
         if not self.student_id or not self.tutor_id:
@@ -267,9 +349,11 @@ class Booking(models.Model):
         return f'{self.term} | {self.lesson_type} | Student: {self.student.name} | Tutor: {self.tutor.name}'
     
 
-class Session(models.Model):
+class Session(CountedFieldsMixin, models.Model):
     """Model to represent individual sessions within a booking."""
     
+    COUNTED_FIELDS = ('session_date', 'booking_id')
+
     PAYMENT_PENDING = 'Pending'
     PAYMENT_SUCCESSFUL = 'Successful'
 
@@ -286,7 +370,9 @@ class Session(models.Model):
         (VENUE_WATERLOO, 'Waterloo Campus'),
     ]
 
-    booking = models.ForeignKey(Booking, related_name='sessions', on_delete=models.CASCADE)
+    # The unique (booking, session_date, session_time) index already leads with
+    # booking and also returns a booking's sessions in date order
+    booking = models.ForeignKey(Booking, related_name='sessions', on_delete=models.CASCADE, db_index=False)
     session_date = models.DateField(default=date(2025, 1, 1))  # Use date object
     session_time = models.TimeField(default=time(0, 0))  # Use time object
     duration = models.DurationField(help_text='Format: [hours]:[minutes]', default=timedelta(hours=1))
@@ -300,6 +386,9 @@ class Session(models.Model):
                 name='unique_booking_session_datetime'
             )
         ]
+        indexes = [
+            models.Index(fields=['session_date', 'session_time'], name='session_date_time_idx'),
+        ]
 
     def __str__(self):
         """return a readable string representation of the session"""
@@ -307,59 +396,83 @@ class Session(models.Model):
 
 
     def clean(self):
+        from .scheduling import validate_session_schedule
+
         super().clean()
         if not self.booking:
             raise ValidationError("A valid booking is required to create a session.")
         if self.session_date < date.today():
             raise ValidationError("Session date cannot be in the past.")
 
-        start_datetime = datetime.combine(self.session_date, self.session_time)
-        end_datetime = start_datetime + self.duration
-        overlapping_sessions = Session.objects.filter(
-            booking=self.booking,
-            session_date=self.session_date,
-        ).exclude(pk=self.pk)
-
-        for session in overlapping_sessions:
-            session_start = datetime.combine(session.session_date, session.session_time)
-            session_end = session_start + session.duration
-            if max(start_datetime, session_start) < min(end_datetime, session_end):
-                raise ValidationError("This session overlaps with another session for the same booking.")
+        # Checks the booking, and every other booking of the same tutor and student
+        validate_session_schedule(self)
 
         if self.duration.total_seconds() <= 0:
             raise ValidationError({"duration": "Session duration must be greater than zero."})
   
     def save(self, *args, **kwargs):
-        self.full_clean()
-        if not self.booking:
-            return super().save(*args, **kwargs)
-
-        super().save(*args, **kwargs)
+        from .scheduling import lock_schedules
+
+        with transaction.atomic():
+            # Lock the tutor and student so concurrent saves check overlaps one at a time
+            if self.booking_id:
+                lock_schedules(self.booking)
+            self.full_clean()
+            super().save(*args, **kwargs)
     
 
     def calculate_total_amount(self):
-        tutor_instance = self.booking.tutor
-        tutor_rate=tutor_instance.rate
+        """Return this session's price; use billing.with_amounts() for querysets."""
+        from .billing import session_amount
 
-        term_weeks = {
-            'Term1': Decimal(14),
-            'Term2': Decimal(11),
-            'Term3': Decimal(11),
-        }
-        lesson_type_multiplier = {
-            'Weekly': Decimal(1),
-            'Bi-Weekly': Decimal(2),
-            'Fortnight': Decimal(0.5),
-        }
-        # Get the term, lesson type, and duration in hours (in Decimal)
-        term = self.booking.term
-        lesson_type = self.booking.lesson_type
-        duration_hours = Decimal(self.duration.total_seconds() / 3600) if self.duration else Decimal(1)
-        weeks = term_weeks.get(term, 0)
-        multiplier = lesson_type_multiplier.get(lesson_type, Decimal(1))
-
-        return tutor_rate * duration_hours * weeks * multiplier
+        booking = self.booking
+        return session_amount(booking.tutor.rate, self.duration, booking.term, booking.lesson_type)
     
     @property
     def total_amount(self):
-        return self.calculate_total_amount()
\ No newline at end of file
+        return self.calculate_total_amount()
+
+
+class DashboardCounter(models.Model):
+    """A running count shown on the dashboard, kept up to date by tutorials.metrics."""
+
+    name = models.CharField(max_length=50, primary_key=True)
+    value = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name}: {self.value}"
+
+
+class TutorTermSummary(models.Model):
+    """One tutor's booked sessions and their value for one term, kept up to date by tutorials.reports."""
+
+    # The unique (tutor, term) index already leads with tutor
+    tutor = models.ForeignKey(Tutor, related_name='term_summaries', on_delete=models.CASCADE, db_index=False)
+    term = models.CharField(max_length=10, choices=Booking.TERM_CHOICES)
+    # Copied from the tutor, so the report reads this table alone
+    tutor_name = models.CharField(max_length=255)
+    booking_count = models.PositiveIntegerField(default=0)
+    session_count = models.PositiveIntegerField(default=0)
+    booked_minutes = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+    paid = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+    pending = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['tutor', 'term'], name='unique_tutor_term_summary'),
+        ]
+        # The report shows one term at a time, in one of these orders
+        indexes = [
+            models.Index(fields=['term', 'tutor_name'], name='summary_term_name_idx'),
+            models.Index(fields=['term', 'booked_minutes'], name='summary_term_minutes_idx'),
+            models.Index(fields=['term', 'revenue'], name='summary_term_revenue_idx'),
+            models.Index(fields=['term', 'pending'], name='summary_term_pending_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.tutor_name} | {self.term}: {self.session_count} sessions, {self.revenue} revenue"
+
+    @property
+    def booked_hours(self):
+        return self.booked_minutes / 60
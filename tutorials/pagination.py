@@ -0,0 +1,110 @@
+"""Keyset (cursor) pagination shared by the list views.
+
+Each page is fetched with a WHERE clause on the ordering keys of the last row
+shown, rather than an OFFSET, so every page costs the same however deep into
+the table it is.
+"""
+
+import json
+from django.core import signing
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+CURSOR_SALT = 'tutorials.pagination'
+
+
+class CursorSerializer(signing.JSONSerializer):
+    """Signing serializer that also encodes dates, times and decimals, e.g. amounts to sort by.
+
+    They come back as strings, which the filters on their fields convert back.
+    """
+
+    def dumps(self, obj):
+        return json.dumps(obj, separators=(',', ':'), cls=DjangoJSONEncoder).encode('latin-1')
+
+
+def get_page_size(request):
+    """Return the requested page size, clamped to 1..MAX_PAGE_SIZE."""
+
+    try:
+        page_size = int(request.GET.get('page_size', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(page_size, MAX_PAGE_SIZE))
+
+
+def _with_tie_breaker(ordering):
+    """Append id to the ordering so every row has a unique position."""
+
+    ordering = list(ordering)
+    if not any(field.lstrip('-') in ('id', 'pk') for field in ordering):
+        descending = bool(ordering) and ordering[-1].startswith('-')
+        ordering.append('-id' if descending else 'id')
+    return ordering
+
+
+def _after(ordering, values):
+    """Build the filter selecting rows that sort after the given key values."""
+
+    condition = Q()
+    equal_so_far = Q()
+    for field, value in zip(ordering, values):
+        name = field.lstrip('-')
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        condition |= equal_so_far & Q(**{f'{name}__{lookup}': value})
+        equal_so_far &= Q(**{name: value})
+    return condition
+
+
+def _decode_cursor(cursor, ordering):
+    """Return the key values stored in a cursor, or None if it is missing or invalid."""
+
+    if not cursor:
+        return None
+    try:
+        values = signing.loads(cursor, salt=CURSOR_SALT, serializer=CursorSerializer)
+    except signing.BadSignature:
+        return None
+    if not isinstance(values, list) or len(values) != len(ordering):
+        return None
+    return values
+
+
+def keyset_paginate(request, queryset, ordering):
+    """Return one page of queryset and the context needed to link to the next.
+
+    The page is a sliced queryset already evaluated, so templates and callers
+    can iterate or count it without extra queries.
+    """
+
+    ordering = _with_tie_breaker(ordering)
+    page_size = get_page_size(request)
+    queryset = queryset.order_by(*ordering)
+
+    values = _decode_cursor(request.GET.get('cursor'), ordering)
+    if values is not None:
+        queryset = queryset.filter(_after(ordering, values))
+
+    page = queryset[:page_size]
+    rows = len(page)
+
+    query = request.GET.copy()
+    query.pop('cursor', None)
+    first_query = query.urlencode()
+
+    next_query = None
+    if rows == page_size and queryset[page_size:].exists():
+        last = page[rows - 1]
+        query['cursor'] = signing.dumps(
+            [getattr(last, field.lstrip('-')) for field in ordering], salt=CURSOR_SALT, serializer=CursorSerializer
+        )
+        next_query = query.urlencode()
+
+    return page, {
+        'page_size': page_size,
+        'is_first_page': values is None,
+        'first_query': first_query,
+        'next_query': next_query,
+    }
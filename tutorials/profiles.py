@@ -0,0 +1,64 @@
+"""Keep Student and Tutor profiles in step with each user's user_type."""
+
+from django.db.models import Exists, OuterRef
+from .caching import invalidate_views
+from .metrics import count_created
+from .models import User, Student, Tutor
+from .subjects import get_subject_id
+
+
+def sync_user_profile(user, created):
+    """Create or remove the profile matching a single user's user_type."""
+
+    # Ensure a Student instance is created if the user_type is 'student'
+    if user.user_type == 'student' and not Student.objects.filter(username=user).exists():
+        Student.objects.create(username=user, name=user.full_name, email=user.email)
+
+    # Ensure a Tutor instance is created if the user_type is 'tutor'
+    if user.user_type == 'tutor' and not Tutor.objects.filter(username=user).exists():
+        Tutor.objects.create(username=user, name=user.full_name, email=user.email)
+
+    # If switching user_type from 'tutor' to 'student', delete related Tutor
+    if not created and user.user_type == 'student':
+        Tutor.objects.filter(username=user).delete()
+
+    # If switching user_type from 'student' to 'tutor', delete related Student
+    if not created and user.user_type == 'tutor':
+        Student.objects.filter(username=user).delete()
+
+
+def reconcile_profiles():
+    """Create every missing Student and Tutor profile in a fixed number of queries.
+
+    Returns a (students_created, tutors_created) tuple.
+    """
+
+    students_missing = User.objects.filter(user_type='student').exclude(
+        Exists(Student.objects.filter(username=OuterRef('pk')))
+    )
+    new_students = Student.objects.bulk_create([
+        Student(username=user, name=user.full_name, email=user.email.lower())
+        for user in students_missing
+    ])
+
+    tutors_missing = User.objects.filter(user_type='tutor').exclude(
+        Exists(Tutor.objects.filter(username=OuterRef('pk')))
+    )
+    new_tutors = Tutor.objects.bulk_create([
+        Tutor(username=user, name=user.full_name, email=user.email.lower())
+        for user in tutors_missing
+    ])
+
+    # bulk_create skips Tutor.save, so assign the default subject here
+    if new_tutors:
+        python_id = get_subject_id("Python")
+        Tutor.subjects.through.objects.bulk_create([
+            Tutor.subjects.through(tutor_id=tutor.id, subject_id=python_id)
+            for tutor in new_tutors
+        ])
+
+    # bulk_create skips the signals that count students and invalidate cached pages
+    count_created(new_students)
+    if new_students or new_tutors:
+        invalidate_views(Student, Tutor)
+    return len(new_students), len(new_tutors)
@@ -0,0 +1,142 @@
+"""Per-tutor, per-term workload and revenue, materialized in TutorTermSummary.
+
+Each summary row holds one tutor's bookings, sessions, booked minutes and
+session amounts for one term, priced by the same SQL as the invoices (see
+tutorials.billing), so the report reads that table alone.
+
+tutorials.signals marks the summaries a change affects as stale: a session's
+booking or a booking's tutor and term (before and after the change), or
+every term of a tutor whose name or rate changed. Stale summaries are recomputed,
+with one grouped query, once the transaction commits, so deleting a booking
+with all its sessions recomputes its summary once. A transaction rolled back
+leaves its marks behind, and those summaries are simply recomputed at the
+next commit.
+
+Bulk writes skip signals, so they call mark_stale() or, for whole tables,
+refresh_summaries(), which also runs after every migrate and from
+`manage.py refresh_reports`.
+"""
+
+import threading
+from datetime import timedelta
+from decimal import Decimal
+from functools import partial
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Count, Q, Sum, Value
+from django.db.models.functions import Coalesce
+from .billing import Cents, amount_expression
+from .caching import invalidate_views
+from .models import Booking, Session, TutorTermSummary
+
+# Per database alias, the (tutor id, term) keys, booking ids and tutor ids
+# whose summaries are stale
+_stale = threading.local()
+
+
+def _pending(using):
+    pending = getattr(_stale, using, None)
+    if pending is None:
+        pending = {'keys': set(), 'bookings': set(), 'tutors': set()}
+        setattr(_stale, using, pending)
+    return pending
+
+
+def mark_stale(using=None, keys=(), bookings=(), tutors=()):
+    """Queue summaries to recompute once the current transaction commits.
+
+    keys are (tutor id, term) pairs; bookings stand for their tutor and term,
+    and tutors for every term of theirs.
+    """
+
+    using = using or DEFAULT_DB_ALIAS
+    pending = _pending(using)
+    pending['keys'].update(keys)
+    pending['bookings'].update(bookings)
+    pending['tutors'].update(tutors)
+    # Each mark registers a flush; the first to run refreshes them all
+    transaction.on_commit(partial(flush_stale, using), using=using)
+
+
+def flush_stale(using=DEFAULT_DB_ALIAS):
+    """Recompute every summary marked stale on the using database."""
+
+    pending = _pending(using)
+    if not any(pending.values()):
+        return
+    keys = set(pending['keys'])
+    bookings = set(pending['bookings'])
+    tutors = set(pending['tutors'])
+    for marks in pending.values():
+        marks.clear()
+
+    if bookings:
+        keys.update(Booking.objects.using(using).filter(pk__in=bookings).values_list('tutor_id', 'term'))
+    keys.update((tutor_id, term) for tutor_id in tutors for term, _ in Booking.TERM_CHOICES)
+    refresh_summaries(keys, using)
+
+
+def _matching(keys):
+    """Build a filter on tutor_id and term matching the (tutor id, term) keys, one term at a time."""
+
+    tutors_by_term = {}
+    for tutor_id, term in keys:
+        tutors_by_term.setdefault(term, set()).add(tutor_id)
+    condition = Q(pk__in=[])
+    for term, tutor_ids in tutors_by_term.items():
+        condition |= Q(term=term, tutor_id__in=tutor_ids)
+    return condition
+
+
+def summary_rows(bookings):
+    """Group bookings by tutor and term into unsaved TutorTermSummary rows."""
+
+    amount = amount_expression(
+        rate='tutor__rate', duration='sessions__duration', term='term', lesson_type='lesson_type'
+    )
+    paid = Q(sessions__payment_status=Session.PAYMENT_SUCCESSFUL)
+    groups = bookings.order_by().values('tutor_id', 'term', 'tutor__name').annotate(
+        booking_count=Count('id', distinct=True),
+        session_count=Count('sessions'),
+        booked=Sum('sessions__duration'),
+        revenue=Cents(Coalesce(Sum(amount), Value(Decimal(0)))),
+        paid=Cents(Coalesce(Sum(amount, filter=paid), Value(Decimal(0)))),
+    )
+    return [
+        TutorTermSummary(
+            tutor_id=group['tutor_id'],
+            term=group['term'],
+            tutor_name=group['tutor__name'],
+            booking_count=group['booking_count'],
+            session_count=group['session_count'],
+            booked_minutes=(group['booked'] or timedelta(0)) // timedelta(minutes=1),
+            revenue=group['revenue'],
+            paid=group['paid'],
+            pending=group['revenue'] - group['paid'],
+        )
+        for group in groups
+    ]
+
+
+def refresh_summaries(keys=None, using=None):
+    """Recompute the summaries of the (tutor id, term) keys, or of everything if keys is None.
+
+    Keys whose tutor has no bookings in that term lose their summary.
+    Returns the number of summaries written.
+    """
+
+    using = using or DEFAULT_DB_ALIAS
+    summaries = TutorTermSummary.objects.using(using)
+    bookings = Booking.objects.using(using)
+    if keys is not None:
+        if not keys:
+            return 0
+        summaries = summaries.filter(_matching(keys))
+        bookings = bookings.filter(_matching(keys))
+
+    with transaction.atomic(using=using):
+        rows = summary_rows(bookings)
+        # The summaries are rebuilt wholesale, so skip the cascade collector
+        summaries._raw_delete(using)
+        TutorTermSummary.objects.using(using).bulk_create(rows)
+    invalidate_views(TutorTermSummary)
+    return len(rows)
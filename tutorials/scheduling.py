@@ -0,0 +1,209 @@
+"""Detect tutors and students who are booked into overlapping sessions.
+
+Sessions belong to bookings, but a tutor (or student) may hold many bookings,
+so clashes have to be checked across every booking they take part in.
+generate_schedule() creates a booking's sessions for its whole term at once,
+checking them all against the tutor's and student's sessions in one query.
+"""
+
+from bisect import bisect_left
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import DurationField, ExpressionWrapper, F, Q, TimeField, Value
+from .billing import TERM_WEEKS
+from .caching import invalidate_views
+from .metrics import count_created
+from .reports import mark_stale
+from .models import Booking, Session, Student, Tutor
+
+Conflict = namedtuple('Conflict', ['kind', 'person_id', 'session_id', 'other_session_id'])
+
+
+def overlapping(sessions, session_date, session_time, duration):
+    """Narrow sessions to those on session_date whose time overlaps the given slot.
+
+    A session starting before the slot overlaps if its duration outlasts the
+    gap between the two start times; the gap is computed in SQL.
+    """
+
+    end_datetime = datetime.combine(session_date, session_time) + duration
+    sessions = sessions.filter(session_date=session_date)
+    if end_datetime.date() == session_date:
+        sessions = sessions.filter(session_time__lt=end_datetime.time())
+
+    gap = ExpressionWrapper(
+        Value(session_time, output_field=TimeField()) - F('session_time'),
+        output_field=DurationField(),
+    )
+    return sessions.annotate(gap=gap).filter(
+        Q(session_time__gte=session_time) | Q(duration__gt=F('gap'))
+    )
+
+
+def session_conflicts(session):
+    """Return the sessions that share a tutor or student with session and overlap it."""
+
+    booking = session.booking
+    sessions = Session.objects.filter(
+        Q(booking__tutor_id=booking.tutor_id) | Q(booking__student_id=booking.student_id)
+    ).exclude(pk=session.pk)
+    return overlapping(sessions, session.session_date, session.session_time, session.duration)
+
+
+def lock_schedules(booking):
+    """Lock the booking's tutor and student until the transaction ends.
+
+    Overlaps are checked across every booking of the tutor and student, so
+    concurrent writers of their sessions must check one at a time even when
+    writing to different bookings. The tutor is always locked first, so two
+    writers never wait on each other.
+    """
+
+    list(Tutor.objects.select_for_update().filter(pk=booking.tutor_id).values_list('pk'))
+    list(Student.objects.select_for_update().filter(pk=booking.student_id).values_list('pk'))
+
+
+def validate_session_schedule(session):
+    """Raise ValidationError if session clashes with its booking, tutor or student."""
+
+    conflict = session_conflicts(session).values('booking_id', 'booking__tutor_id').first()
+    if conflict is None:
+        return
+    if conflict['booking_id'] == session.booking_id:
+        raise ValidationError("This session overlaps with another session for the same booking.")
+    if conflict['booking__tutor_id'] == session.booking.tutor_id:
+        raise ValidationError("The tutor already has another session at this time.")
+    raise ValidationError("The student already has another session at this time.")
+
+
+def find_conflicts(start_date=None, end_date=None, chunk_size=2000):
+    """Return every tutor and student clash among sessions in the date range.
+
+    Sessions are streamed once in start order; for each tutor and student the
+    session ending latest so far is remembered, and any session starting before
+    that end is reported as a Conflict with it. Two sessions of one booking
+    share their tutor and student, so their clash is reported once, as the
+    tutor's.
+    """
+
+    sessions = Session.objects.all()
+    if start_date is not None:
+        sessions = sessions.filter(session_date__gte=start_date)
+    if end_date is not None:
+        sessions = sessions.filter(session_date__lte=end_date)
+    rows = sessions.order_by('session_date', 'session_time', 'id').values_list(
+        'id', 'session_date', 'session_time', 'duration', 'booking_id', 'booking__tutor_id', 'booking__student_id'
+    )
+
+    latest_end = {'tutor': {}, 'student': {}}
+    conflicts = []
+    for session_id, session_date, session_time, duration, booking_id, tutor_id, student_id in rows.iterator(chunk_size=chunk_size):
+        start = datetime.combine(session_date, session_time)
+        end = start + duration
+        for kind, person_id in (('tutor', tutor_id), ('student', student_id)):
+            previous = latest_end[kind].get(person_id)
+            if previous is not None and start < previous[0]:
+                if kind == 'tutor' or previous[2] != booking_id:
+                    conflicts.append(Conflict(kind, person_id, previous[1], session_id))
+            if previous is None or end > previous[0]:
+                latest_end[kind][person_id] = (end, session_id, booking_id)
+    return conflicts
+
+
+# Days after the start of each week a lesson type meets, and the weeks between meetings
+LESSON_TYPE_PATTERNS = {
+    Booking.TYPE_WEEKLY: ([0], 1),
+    Booking.TYPE_BIWEEKLY: ([0, 3], 1),
+    Booking.TYPE_FORTNIGHT: ([0], 2),
+}
+
+
+def schedule_dates(term, lesson_type, start_date):
+    """Return the dates a booking meets in its term, from start_date.
+
+    A term lasts as many weeks as it is billed for (billing.TERM_WEEKS).
+    Weekly lessons meet once a week, Bi-Weekly lessons twice (three days
+    apart) and Fortnight lessons every other week.
+    """
+
+    days, week_step = LESSON_TYPE_PATTERNS[lesson_type]
+    weeks = int(TERM_WEEKS[term])
+    return [
+        start_date + timedelta(weeks=week, days=day)
+        for week in range(0, weeks, week_step)
+        for day in days
+    ]
+
+
+def schedule_conflicts(booking, slots):
+    """Return the (start, end) slots that overlap a session of the booking's tutor or student, or an earlier slot.
+
+    The tutor's and student's sessions around the slots are read in one query
+    and each slot is checked against those starting within the longest
+    session's length before it. Slots are checked in start order, so a slot
+    overlaps an earlier one if it starts before the latest end so far.
+    """
+
+    first_date = min(start for start, _ in slots).date()
+    last_date = max(end for _, end in slots).date()
+    rows = Session.objects.filter(
+        Q(booking__tutor_id=booking.tutor_id) | Q(booking__student_id=booking.student_id),
+        session_date__range=(first_date - timedelta(days=1), last_date),
+    ).values_list('session_date', 'session_time', 'duration')
+    sessions = sorted(
+        (datetime.combine(session_date, session_time), duration) for session_date, session_time, duration in rows
+    )
+
+    starts = [start for start, _ in sessions]
+    longest = max((duration for _, duration in sessions), default=timedelta(0))
+    conflicts = []
+    latest_end = None
+    for start, end in sorted(slots):
+        clashes = latest_end is not None and start < latest_end
+        if not clashes:
+            # Only sessions starting after start - longest can still be running at start
+            for index in range(bisect_left(starts, start - longest), bisect_left(starts, end)):
+                other_start, duration = sessions[index]
+                if other_start + duration > start:
+                    clashes = True
+                    break
+        if clashes:
+            conflicts.append((start, end))
+        latest_end = end if latest_end is None else max(latest_end, end)
+    return conflicts
+
+
+def generate_schedule(booking, start_date, session_time, duration, venue=Session.VENUE_BUSH_HOUSE):
+    """Create every session of booking for its term in one insert, returning them.
+
+    Raises ValidationError, creating nothing, if the first session is in the
+    past, the duration is not positive or any session would overlap another
+    session of the same tutor or student, or another of the generated sessions.
+    """
+
+    if start_date < date.today():
+        raise ValidationError("Session date cannot be in the past.")
+    if duration <= timedelta(0):
+        raise ValidationError("Session duration must be greater than zero.")
+
+    slots = [
+        (start, start + duration)
+        for start in (datetime.combine(day, session_time) for day in schedule_dates(booking.term, booking.lesson_type, start_date))
+    ]
+    with transaction.atomic():
+        lock_schedules(booking)
+        conflicts = schedule_conflicts(booking, slots)
+        if conflicts:
+            dates = ', '.join(start.strftime('%d %b %Y %H:%M') for start, _ in conflicts)
+            raise ValidationError(f"The tutor or student already has a session at: {dates}.")
+        sessions = Session.objects.bulk_create([
+            Session(booking=booking, session_date=start.date(), session_time=start.time(), duration=duration, venue=venue)
+            for start, _ in slots
+        ])
+        # bulk_create skips the signals that count and summarise sessions and invalidate cached pages
+        count_created(sessions)
+        mark_stale(bookings=[booking.pk])
+    invalidate_views(Session)
+    return sessions
@@ -0,0 +1,144 @@
+"""Indexed substring search over user, student, tutor and request text.
+
+On SQLite each searchable model gets an FTS5 table using the trigram
+tokenizer, which matches case-insensitive substrings just as icontains does,
+but from an index. Triggers on the model's table keep the index current, so
+bulk_create, update() and raw deletes stay in step too. On PostgreSQL,
+pg_trgm GIN indexes back the same icontains lookups, so no separate index
+table is needed. Queries shorter than a trigram, and databases without
+either feature, fall back to a plain icontains scan.
+
+install_search_indexes() is idempotent and runs after every migrate (see
+tutorials.signals), which also restores triggers dropped when a migration
+rebuilds a table on SQLite.
+"""
+
+import logging
+from django.db import DatabaseError, connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from .models import User, Student, Tutor, StudentRequest
+
+logger = logging.getLogger(__name__)
+
+# The text each model's index covers; searches may use any subset of it
+SEARCH_FIELDS = {
+    User: ['first_name', 'last_name', 'username', 'email'],
+    Student: ['name', 'email'],
+    Tutor: ['name', 'email'],
+    StudentRequest: ['name', 'description'],
+}
+# Trigram indexes cannot match anything shorter than a trigram
+MIN_INDEXED_LENGTH = 3
+
+# Whether each database alias has the SQLite search tables, once checked
+_sqlite_indexed = {}
+
+
+def index_table(model):
+    return f'{model._meta.db_table}_search'
+
+
+def _columns(model, fields=None):
+    return [model._meta.get_field(name).column for name in (fields or SEARCH_FIELDS[model])]
+
+
+def install_search_indexes(using='default'):
+    """Create any missing search tables, triggers or indexes on one database."""
+
+    connection = connections[using]
+    if connection.vendor == 'sqlite':
+        _install_sqlite(connection)
+    elif connection.vendor == 'postgresql':
+        _install_postgresql(connection)
+
+
+def _install_sqlite(connection):
+    existing = set(connection.introspection.table_names())
+    with connection.cursor() as cursor:
+        for model in SEARCH_FIELDS:
+            table = model._meta.db_table
+            index = index_table(model)
+            # e.g. after migrating tutorials back to zero
+            if table not in existing:
+                continue
+            columns = _columns(model)
+            column_list = ', '.join(columns)
+            new_values = ', '.join(f'new.{column}' for column in columns)
+            old_values = ', '.join(f'old.{column}' for column in columns)
+            if index not in existing:
+                try:
+                    cursor.execute(
+                        f"CREATE VIRTUAL TABLE {index} USING fts5("
+                        f"{column_list}, content='{table}', content_rowid='id', tokenize='trigram')"
+                    )
+                except DatabaseError:
+                    # SQLite before 3.34, or built without FTS5
+                    logger.warning("SQLite cannot build trigram search indexes; search will scan tables.")
+                    _sqlite_indexed[connection.alias] = False
+                    return
+                cursor.execute(f"INSERT INTO {index}({index}) VALUES ('rebuild')")
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {index}_insert AFTER INSERT ON {table} BEGIN "
+                f"INSERT INTO {index}(rowid, {column_list}) VALUES (new.id, {new_values}); END"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {index}_delete AFTER DELETE ON {table} BEGIN "
+                f"INSERT INTO {index}({index}, rowid, {column_list}) VALUES ('delete', old.id, {old_values}); END"
+            )
+            # Only changes to indexed columns touch the index, so logins stay cheap
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {index}_update AFTER UPDATE OF {column_list} ON {table} BEGIN "
+                f"INSERT INTO {index}({index}, rowid, {column_list}) VALUES ('delete', old.id, {old_values}); "
+                f"INSERT INTO {index}(rowid, {column_list}) VALUES (new.id, {new_values}); END"
+            )
+    _sqlite_indexed[connection.alias] = User._meta.db_table in existing
+
+
+def _install_postgresql(connection):
+    existing = set(connection.introspection.table_names())
+    with connection.cursor() as cursor:
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for model in SEARCH_FIELDS:
+            table = model._meta.db_table
+            if table not in existing:
+                continue
+            for column in _columns(model):
+                # icontains compiles to UPPER(column::text) LIKE UPPER(...)
+                cursor.execute(
+                    f'CREATE INDEX IF NOT EXISTS {table}_{column}_trgm ON {table} '
+                    f'USING gin ((UPPER("{column}"::text)) gin_trgm_ops)'
+                )
+
+
+def _has_sqlite_index(using):
+    if using not in _sqlite_indexed:
+        connection = connections[using]
+        _sqlite_indexed[using] = (
+            connection.vendor == 'sqlite' and index_table(User) in connection.introspection.table_names()
+        )
+    return _sqlite_indexed[using]
+
+
+def search(queryset, query, fields):
+    """Filter queryset to rows where any of fields contains query, ignoring case."""
+
+    query = query.strip()
+    if not query:
+        return queryset
+    model = queryset.model
+    if len(query) >= MIN_INDEXED_LENGTH and _has_sqlite_index(queryset.db):
+        index = index_table(model)
+        # Match the whole query as one phrase, i.e. as a substring, in any of the columns
+        match = '{%s} : "%s"' % (' '.join(_columns(model, fields)), query.replace('"', '""'))
+        return queryset.filter(pk__in=RawSQL(f'SELECT rowid FROM {index} WHERE {index} MATCH %s', [match]))
+    condition = Q()
+    for field in fields:
+        condition |= Q(**{f'{field}__icontains': query})
+    return queryset.filter(condition)
+
+
+def matching_ids(model, query, fields):
+    """Return a subquery of the ids of model rows matching query, for filtering relations."""
+
+    return search(model.objects.all(), query, fields).values('pk')
@@ -0,0 +1,181 @@
+from django.db import connections
+from django.db.models.signals import m2m_changed, post_delete, post_migrate, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+from .caching import CACHED_MODELS, invalidate_views
+from .metrics import adjust, counters, current_values, refresh_counters, stored_values
+from .models import Booking, DashboardCounter, User, Session, Student, StudentRequest, Subject, Tutor, TutorTermSummary
+from .profiles import sync_user_profile
+from .reports import mark_stale, refresh_summaries
+from .search import install_search_indexes
+from .subjects import invalidate_subject_cache
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """Keep the user's Student/Tutor profile in step with its user_type."""
+
+    # Fixture loading saves raw rows; leave their profiles as declared.
+    # Logins, password changes and other saves that keep the user_type cost nothing extra.
+    if not raw and instance.needs_profile_sync(update_fields):
+        sync_user_profile(instance, created)
+    if update_fields is None or 'user_type' in update_fields:
+        instance._original_user_type = instance.user_type
+
+
+@receiver(pre_save, sender=User)
+@receiver(pre_save, sender=Student)
+@receiver(pre_save, sender=Tutor)
+def stamp_updated_at(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Record when a row shown in the cached list tables last changed."""
+
+    # Fixture rows keep their own timestamps; saves of chosen fields, such as
+    # a login's last_login, leave it alone unless they name updated_at
+    if not raw and (update_fields is None or 'updated_at' in update_fields):
+        instance.updated_at = timezone.now()
+
+
+@receiver(post_save, sender=Subject)
+@receiver(post_delete, sender=Subject)
+def subject_changed(sender, **kwargs):
+    """Drop the cached subject catalogue whenever a subject changes."""
+
+    invalidate_subject_cache()
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def model_changed(sender, update_fields=None, **kwargs):
+    """Invalidate the cached pages showing the changed model."""
+
+    # Logging in only records last_login, which no cached page shows
+    if sender in CACHED_MODELS and update_fields != frozenset(['last_login']):
+        invalidate_views(sender)
+
+
+def touch_tutors(tutors):
+    """Mark tutors as updated, so their cached list rows are rendered afresh."""
+
+    tutors.update(updated_at=timezone.now())
+
+
+@receiver(m2m_changed, sender=Tutor.subjects.through)
+def tutor_subjects_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """Invalidate the cached pages and rows listing tutors' subjects."""
+
+    if not reverse and action.startswith('post_'):
+        touch_tutors(Tutor.objects.filter(pk=instance.pk))
+    elif reverse and action in ('post_add', 'post_remove'):
+        touch_tutors(Tutor.objects.filter(pk__in=pk_set))
+    elif reverse and action == 'pre_clear':
+        touch_tutors(Tutor.objects.filter(subjects=instance))
+    invalidate_views(Tutor)
+
+
+@receiver(post_save, sender=Subject)
+@receiver(pre_delete, sender=Subject)
+def subject_renamed_or_deleted(sender, instance, created=False, **kwargs):
+    """Touch the tutors whose list rows show the subject."""
+
+    # A new subject has no tutors yet
+    if not created:
+        touch_tutors(Tutor.objects.filter(subjects=instance))
+
+
+@receiver(pre_save, sender=Student)
+@receiver(pre_save, sender=StudentRequest)
+@receiver(pre_save, sender=Session)
+def remember_counted_values(sender, instance, using, update_fields=None, **kwargs):
+    """Note which dashboard counters the row counted towards before this save."""
+
+    # Saves of chosen fields, such as a login's, cannot change uncounted rows' counts
+    if update_fields is not None and not update_fields & set(sender.COUNTED_FIELDS):
+        instance._counted_before = None
+        return
+    values = stored_values(instance, using)
+    instance._counted_before = counters(sender, values) if values is not None else []
+
+
+# Connected before update_counters, which records the saved values over the
+# booking a session is moved from
+@receiver(post_save, sender=Session)
+@receiver(post_delete, sender=Session)
+def session_summary_stale(sender, instance, using, **kwargs):
+    """Recompute the summaries of the session's tutor and term, before and after the change."""
+
+    bookings = {instance.booking_id}
+    before = instance._counted_values
+    if 'booking_id' in before:
+        bookings.add(before['booking_id'])
+    mark_stale(using, bookings=bookings)
+    instance._counted_values = {**before, 'booking_id': instance.booking_id}
+
+
+@receiver(post_save, sender=Student)
+@receiver(post_save, sender=StudentRequest)
+@receiver(post_save, sender=Session)
+def update_counters(sender, instance, using, **kwargs):
+    """Move the row's counts to the dashboard counters it counts towards now."""
+
+    before = getattr(instance, '_counted_before', None)
+    if before is None:
+        return
+    values = current_values(instance)
+    changes = {name: -1 for name in before}
+    for name in counters(sender, values):
+        changes[name] = changes.get(name, 0) + 1
+    adjust(changes, using)
+    instance._counted_values = values
+    instance._counted_before = None
+
+
+@receiver(post_delete, sender=Student)
+@receiver(post_delete, sender=StudentRequest)
+@receiver(post_delete, sender=Session)
+def uncount_deleted(sender, instance, using, **kwargs):
+    """Take a deleted row out of the dashboard counters."""
+
+    values = instance._counted_values
+    if not all(field in values for field in sender.COUNTED_FIELDS):
+        values = current_values(instance)
+    adjust({name: -1 for name in counters(sender, values)}, using)
+
+
+@receiver(post_save, sender=Booking)
+@receiver(post_delete, sender=Booking)
+def booking_summary_stale(sender, instance, using, **kwargs):
+    """Recompute the summaries of the booking's tutor and term, before and after the change."""
+
+    keys = {(instance.tutor_id, instance.term)}
+    before = instance._counted_values
+    if 'tutor_id' in before and 'term' in before:
+        keys.add((before['tutor_id'], before['term']))
+    mark_stale(using, keys=keys)
+    instance._counted_values = {'tutor_id': instance.tutor_id, 'term': instance.term}
+
+
+@receiver(post_save, sender=Tutor)
+def tutor_summary_stale(sender, instance, created, using, **kwargs):
+    """Recompute the tutor's summaries when the name or rate they show changes."""
+
+    # A new tutor has no bookings yet
+    if created:
+        return
+    current = {'name': instance.name, 'rate': instance.rate}
+    if any(instance._counted_values.get(field) != value for field, value in current.items()):
+        mark_stale(using, tutors=[instance.pk])
+    instance._counted_values = current
+
+
+@receiver(post_migrate)
+def tutorials_migrated(sender, using, **kwargs):
+    """Create the search indexes, or restore triggers a migration dropped, and rebuild the dashboard and reports."""
+
+    if sender.name == 'tutorials':
+        install_search_indexes(using)
+        tables = connections[using].introspection.table_names()
+        # Unless migrated back to before these tables existed
+        if DashboardCounter._meta.db_table in tables:
+            refresh_counters(using)
+        if TutorTermSummary._meta.db_table in tables:
+            refresh_summaries(using=using)
@@ -0,0 +1,44 @@
+"""Per-process cache of the Subject catalogue.
+
+The catalogue is seeded by a data migration and changes rarely, so the
+(id, name) pairs are loaded once per process. They are stored with the
+Subject generation counter from tutorials.caching, which any process bumps
+when it saves or deletes a Subject (see tutorials.signals). Every lookup
+compares that counter, so a change made by another worker or a management
+command is seen as soon as the shared cache records it.
+"""
+
+from .caching import invalidate_views, model_generation
+from .models import Subject
+
+# (generation, [(id, name), ...]) as last loaded, or None
+_subject_choices = None
+
+
+def get_subject_choices():
+    """Return the catalogue as a list of (id, name) pairs, in id order."""
+
+    global _subject_choices
+    generation = model_generation(Subject)
+    # Without a working cache there is no counter to trust, so always reload
+    if _subject_choices is None or generation is None or _subject_choices[0] != generation:
+        _subject_choices = (generation, list(Subject.objects.order_by('id').values_list('id', 'name')))
+    return _subject_choices[1]
+
+
+def get_subject_id(name):
+    """Return the id of the named subject, creating it if it is missing."""
+
+    for subject_id, subject_name in get_subject_choices():
+        if subject_name == name:
+            return subject_id
+    subject, created = Subject.objects.get_or_create(name=name)
+    return subject.id
+
+
+def invalidate_subject_cache():
+    """Forget the cached catalogue in this and every other process, so the next lookup reloads it."""
+
+    global _subject_choices
+    _subject_choices = None
+    invalidate_views(Subject)
@@ -0,0 +1,43 @@
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from tutorials.benchmarks.endpoints import default_endpoints, find_fixtures
+from tutorials.benchmarks.runner import EndpointRunner, percentile
+from tutorials.models import Session, User
+
+
+class BenchmarkRunnerTestCase(TestCase):
+    """Tests of the load-testing benchmark runner."""
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed', stdout=StringIO(), users=20, bookings=5, sessions=20, requests=5, random_seed=1)
+
+    def setUp(self):
+        self.runner = EndpointRunner(User.objects.get(username='@johndoe'))
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 0.5), 50)
+        self.assertEqual(percentile(values, 0.95), 95)
+        self.assertEqual(percentile([7], 0.99), 7)
+        self.assertIsNone(percentile([], 0.5))
+
+    def test_every_endpoint_succeeds(self):
+        endpoints = default_endpoints(find_fixtures())
+        self.assertEqual(len(endpoints), 13)
+        results = self.runner.run(endpoints, 2)
+        for name, result in results.items():
+            self.assertEqual(result['errors'], 0, name)
+            self.assertEqual(result['requests'], 2, name)
+            self.assertGreater(result['queries']['max'], 0, name)
+            self.assertLessEqual(result['latency_ms']['p50'], result['latency_ms']['max'], name)
+
+    def test_create_endpoints_create_distinct_rows(self):
+        endpoints = [endpoint for endpoint in default_endpoints(find_fixtures()) if endpoint.kind == 'create']
+        sessions_before = Session.objects.count()
+        users_before = User.objects.count()
+        self.runner.run(endpoints, 3)
+        # Each endpoint also makes one untimed warm-up request
+        self.assertEqual(Session.objects.count(), sessions_before + 4)
+        self.assertEqual(User.objects.count(), users_before + 4)
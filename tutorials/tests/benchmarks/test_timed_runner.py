@@ -0,0 +1,44 @@
+import io
+import unittest
+from django.test import SimpleTestCase
+from tutorials.tests.runner import ParallelTimingTextTestResult, TimedTestRunner, TimingParallelTestSuite, TimingRemoteTestResult, TimingTextTestResult
+
+
+class TimedTestRunnerTestCase(SimpleTestCase):
+    """Tests of the test runner's timing report."""
+
+    def test_result_adds_up_time_per_test_class(self):
+        class Sample(unittest.TestCase):
+            def test_one(self):
+                pass
+
+            def test_two(self):
+                pass
+
+        result = TimingTextTestResult(io.StringIO(), descriptions=False, verbosity=0)
+        unittest.TestLoader().loadTestsFromTestCase(Sample).run(result)
+        self.assertEqual(result.testsRun, 2)
+        self.assertEqual(list(result.class_times), [f'{__name__}.{Sample.__qualname__}'])
+
+    def test_worker_times_are_replayed_into_the_parallel_result(self):
+        class Sample(unittest.TestCase):
+            def test_one(self):
+                pass
+
+        tests = list(unittest.TestLoader().loadTestsFromTestCase(Sample))
+        remote = TimingRemoteTestResult()
+        unittest.TestSuite(tests).run(remote)
+        # As ParallelTestSuite replays a worker's events
+        result = ParallelTimingTextTestResult(io.StringIO(), descriptions=False, verbosity=0)
+        for name, index, *args in remote.events:
+            getattr(result, name)(tests[index], *args)
+        seconds = [args[0] for name, _, *args in remote.events if name == 'addTestTime']
+        self.assertEqual(result.class_times, {f'{__name__}.{Sample.__qualname__}': seconds[0]})
+
+    def test_classes_are_only_timed_when_asked_for(self):
+        self.assertIsNone(TimedTestRunner().get_resultclass())
+        self.assertIs(TimedTestRunner(slowest=5).get_resultclass(), TimingTextTestResult)
+        runner = TimedTestRunner(slowest=5, parallel=2)
+        self.assertIs(runner.parallel_test_suite, TimingParallelTestSuite)
+        runner.running_in_parallel = True
+        self.assertIs(runner.get_resultclass(), ParallelTimingTextTestResult)
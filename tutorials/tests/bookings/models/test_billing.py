@@ -0,0 +1,44 @@
+from datetime import timedelta, date, time
+from decimal import Decimal
+from django.test import TestCase
+from tutorials.billing import session_amount, with_amounts
+from tutorials.models import Booking, Student, Tutor, User, Session
+
+
+class BillingTest(TestCase):
+    """unit tests for pricing sessions in SQL"""
+    def setUp(self):
+        users = [
+            User.objects.create_user(username=f"@person{i}", email=f"person{i}@example.com", user_type="not specified")
+            for i in range(2)
+        ]
+        self.student = Student.objects.create(username=users[0], email=users[0].email)
+        self.tutor = Tutor.objects.create(username=users[1], email=users[1].email, rate=Decimal("10.01"))
+
+    def _create_sessions(self):
+        """one session of each duration for every term and lesson type"""
+        sessions = []
+        for term, term_label in Booking.TERM_CHOICES:
+            for lesson_type, lesson_label in Booking.LESSON_TYPE_CHOICES:
+                booking = Booking.objects.create(term=term, lesson_type=lesson_type, student=self.student, tutor=self.tutor)
+                for hour, minutes in enumerate([20, 30, 45, 60, 90, 135]):
+                    sessions.append(Session(booking=booking, session_date=date(2030, 1, 1), session_time=time(hour * 3, 0), duration=timedelta(minutes=minutes)))
+        Session.objects.bulk_create(sessions)
+
+    def test_session_amount(self):
+        self.assertEqual(session_amount(Decimal("10.00"), timedelta(hours=1), 'Term1', 'Weekly'), Decimal("140.00"))
+        self.assertEqual(session_amount(Decimal("10.00"), timedelta(minutes=90), 'Term2', 'Bi-Weekly'), Decimal("330.00"))
+        self.assertEqual(session_amount(Decimal("10.01"), timedelta(minutes=30), 'Term3', 'Weekly'), Decimal("55.06"))
+        self.assertEqual(session_amount(Decimal("10.00"), timedelta(minutes=20), 'Term1', 'Fortnight'), Decimal("23.33"))
+
+    def test_sql_amounts_match_python_amounts(self):
+        self._create_sessions()
+        sessions = with_amounts(Session.objects.select_related('booking__tutor'))
+        for session in sessions:
+            self.assertEqual(session.amount, session.calculate_total_amount(), session)
+
+    def test_amounts_are_priced_in_one_query(self):
+        self._create_sessions()
+        with self.assertNumQueries(1):
+            amounts = list(with_amounts(Session.objects.all()).values_list('amount', flat=True))
+        self.assertEqual(len(amounts), 54)
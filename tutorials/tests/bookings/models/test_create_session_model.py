@@ -1,6 +1,7 @@
 from django.forms import ValidationError
 from django.test import TestCase
 from tutorials.models import Booking, Student, Tutor, User, Session
+from tutorials.scheduling import session_conflicts
 from datetime import timedelta, date, time
 
 class CreateSessionModelTest(TestCase):
@@ -90,3 +91,30 @@ class CreateSessionModelTest(TestCase):
         )
         expected_str = "Session on 2025-01-03 at 12:30:00 for Term1 | Student: student_user | Tutor: tutor_user"
         self.assertEqual(str(session), expected_str)
+
+    def _future_session(self, session_time, duration):
+        """build an unsaved session on a fixed future date for the test booking"""
+        return Session(booking=self.booking, session_date=date.today() + timedelta(days=30), session_time=session_time, duration=duration)
+
+    def test_overlap_detects_earlier_session_running_into_new_one(self):
+        """a session starting before the new one but still running at its start overlaps"""
+        self._future_session(time(9, 0), timedelta(hours=1, minutes=30)).save()
+        self.assertTrue(session_conflicts(self._future_session(time(10, 0), timedelta(hours=1))).exists())
+
+    def test_overlap_detects_later_session_starting_before_new_one_ends(self):
+        """a session starting before the new one ends overlaps"""
+        self._future_session(time(10, 30), timedelta(hours=1)).save()
+        self.assertTrue(session_conflicts(self._future_session(time(10, 0), timedelta(hours=1))).exists())
+
+    def test_adjacent_sessions_do_not_overlap(self):
+        """back-to-back sessions are allowed"""
+        self._future_session(time(9, 0), timedelta(hours=1)).save()
+        self._future_session(time(11, 0), timedelta(hours=1)).save()
+        self.assertFalse(session_conflicts(self._future_session(time(10, 0), timedelta(hours=1))).exists())
+
+    def test_overlap_check_is_a_single_query(self):
+        """the overlap check costs one query however many sessions share the day"""
+        for hour in range(0, 20, 2):
+            self._future_session(time(hour, 0), timedelta(hours=1)).save()
+        with self.assertNumQueries(1):
+            self.assertFalse(session_conflicts(self._future_session(time(21, 0), timedelta(hours=1))).exists())
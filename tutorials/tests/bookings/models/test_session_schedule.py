@@ -0,0 +1,77 @@
+from datetime import timedelta, date, time
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from tutorials.models import Booking, Student, Tutor, User, Session
+from tutorials.scheduling import generate_schedule, schedule_dates
+
+
+class SessionScheduleTest(TestCase):
+    """unit tests for generating a booking's sessions for its term"""
+    def setUp(self):
+        users = [
+            User.objects.create_user(username=f"@person{i}", email=f"person{i}@example.com", user_type="not specified")
+            for i in range(4)
+        ]
+        self.student1 = Student.objects.create(username=users[0], email=users[0].email)
+        self.student2 = Student.objects.create(username=users[1], email=users[1].email)
+        self.tutor1 = Tutor.objects.create(username=users[2], email=users[2].email)
+        self.tutor2 = Tutor.objects.create(username=users[3], email=users[3].email)
+        self.booking = Booking.objects.create(student=self.student1, tutor=self.tutor1, term=Booking.TERM1, lesson_type=Booking.TYPE_WEEKLY)
+        self.start = date.today() + timedelta(days=7)
+
+    def test_session_counts_follow_term_weeks_and_lesson_type(self):
+        """weekly meets once a week, bi-weekly twice and fortnightly every other week"""
+        self.assertEqual(len(schedule_dates(Booking.TERM1, Booking.TYPE_WEEKLY, self.start)), 14)
+        self.assertEqual(len(schedule_dates(Booking.TERM2, Booking.TYPE_WEEKLY, self.start)), 11)
+        self.assertEqual(len(schedule_dates(Booking.TERM2, Booking.TYPE_BIWEEKLY, self.start)), 22)
+        self.assertEqual(len(schedule_dates(Booking.TERM2, Booking.TYPE_FORTNIGHT, self.start)), 6)
+        self.assertEqual(schedule_dates(Booking.TERM1, Booking.TYPE_BIWEEKLY, self.start)[:3], [
+            self.start, self.start + timedelta(days=3), self.start + timedelta(days=7),
+        ])
+        self.assertEqual(schedule_dates(Booking.TERM1, Booking.TYPE_FORTNIGHT, self.start)[1], self.start + timedelta(days=14))
+
+    def test_generate_schedule_inserts_every_session_at_once(self):
+        """the sessions are checked in one query and written in one insert"""
+        # savepoint, tutor and student locks, clash check, insert, dashboard counter insert and update, release
+        with self.assertNumQueries(8):
+            sessions = generate_schedule(self.booking, self.start, time(10, 0), timedelta(hours=1), Session.VENUE_WATERLOO)
+        self.assertEqual(len(sessions), 14)
+        stored = list(self.booking.sessions.order_by('session_date').values_list('session_date', 'session_time', 'venue'))
+        self.assertEqual(stored[0], (self.start, time(10, 0), Session.VENUE_WATERLOO))
+        self.assertEqual(stored[-1][0], self.start + timedelta(weeks=13))
+
+    def test_clash_with_another_booking_creates_nothing(self):
+        """a clash with the tutor's or student's other sessions rejects the whole schedule"""
+        other_booking = Booking.objects.create(student=self.student2, tutor=self.tutor1)
+        Session.objects.create(booking=other_booking, session_date=self.start + timedelta(weeks=3), session_time=time(10, 30))
+        with self.assertRaisesMessage(ValidationError, "The tutor or student already has a session at:"):
+            generate_schedule(self.booking, self.start, time(10, 0), timedelta(hours=1))
+        self.assertEqual(self.booking.sessions.count(), 0)
+
+    def test_sessions_overlapping_from_the_previous_day_clash(self):
+        """a session running past midnight clashes with one early the next day"""
+        other_booking = Booking.objects.create(student=self.student1, tutor=self.tutor2)
+        Session.objects.create(booking=other_booking, session_date=self.start - timedelta(days=1), session_time=time(23, 0), duration=timedelta(hours=2))
+        with self.assertRaises(ValidationError):
+            generate_schedule(self.booking, self.start, time(0, 30), timedelta(hours=1))
+
+    def test_unrelated_and_adjacent_sessions_do_not_clash(self):
+        """sessions of other people, and sessions ending as one starts, are allowed"""
+        unrelated_booking = Booking.objects.create(student=self.student2, tutor=self.tutor2)
+        same_student_booking = Booking.objects.create(student=self.student1, tutor=self.tutor2)
+        Session.objects.create(booking=unrelated_booking, session_date=self.start, session_time=time(10, 0))
+        Session.objects.create(booking=same_student_booking, session_date=self.start, session_time=time(9, 0))
+        self.assertEqual(len(generate_schedule(self.booking, self.start, time(10, 0), timedelta(hours=1))), 14)
+
+    def test_generated_sessions_overlapping_each_other_clash(self):
+        """bi-weekly sessions lasting longer than the three days between them overlap the next one"""
+        self.booking.lesson_type = Booking.TYPE_BIWEEKLY
+        with self.assertRaisesMessage(ValidationError, "The tutor or student already has a session at:"):
+            generate_schedule(self.booking, self.start, time(10, 0), timedelta(days=4))
+        self.assertEqual(self.booking.sessions.count(), 0)
+
+    def test_past_start_and_empty_duration_are_rejected(self):
+        with self.assertRaisesMessage(ValidationError, "Session date cannot be in the past."):
+            generate_schedule(self.booking, date.today() - timedelta(days=1), time(10, 0), timedelta(hours=1))
+        with self.assertRaisesMessage(ValidationError, "Session duration must be greater than zero."):
+            generate_schedule(self.booking, self.start, time(10, 0), timedelta(0))
@@ -0,0 +1,57 @@
+from datetime import date, time, timedelta
+from django.test import TestCase
+from django.urls import reverse
+from tutorials.models import Booking, Session, Student, Tutor, User
+from tutorials.tests.helpers import QueryBudgetMixin
+
+
+class BookingsQueryBudgetTestCase(QueryBudgetMixin, TestCase):
+    """Ensure the booking pages run a fixed number of queries however many rows exist."""
+
+    def setUp(self):
+        User.objects.create_user(username="@johndoe", email="johndoe@example.com", password="Password123", user_type="not specified")
+        self.client.login(username="@johndoe", password="Password123")
+        self.booking_count = 0
+        self.session_count = 0
+        self._create_bookings(10)
+        self.booking = Booking.objects.first()
+        self._create_sessions(10)
+
+    def _create_bookings(self, count):
+        """Bulk create bookings, each between a new student and a new tutor."""
+        start = self.booking_count
+        users = User.objects.bulk_create([
+            User(username=f"@person{i}", email=f"person{i}@example.com", user_type="not specified")
+            for i in range(start, start + count)
+        ])
+        students = Student.objects.bulk_create([
+            Student(name=f"Student {i}", username=user, email=f"student{i}@example.com")
+            for i, user in enumerate(users, start)
+        ])
+        tutors = Tutor.objects.bulk_create([
+            Tutor(name=f"Tutor {i}", username=user, email=f"tutor{i}@example.com")
+            for i, user in enumerate(users, start)
+        ])
+        Booking.objects.bulk_create([Booking(student=student, tutor=tutor) for student, tutor in zip(students, tutors)])
+        self.booking_count += count
+
+    def _create_sessions(self, count):
+        """Bulk create one-hour sessions for the first booking, a day apart."""
+        start = self.session_count
+        Session.objects.bulk_create([
+            Session(booking=self.booking, session_date=date(2030, 1, 1) + timedelta(days=i), session_time=time(10, 0))
+            for i in range(start, start + count)
+        ])
+        self.session_count += count
+
+    def test_bookings_list_query_budget(self):
+        # Session, user, page of bookings and the next-page look-ahead
+        response = self.assert_query_budget(reverse('booking_list'), 4, grow=lambda: self._create_bookings(200), data={'page_size': 10})
+        self.assertContains(response, "Student 0")
+        self.assertContains(response, "Tutor 0")
+
+    def test_booking_show_query_budget(self):
+        # Session, user, booking with its student and tutor, and the priced sessions
+        url = reverse('session_list', kwargs={'booking_id': self.booking.id})
+        response = self.assert_query_budget(url, 4, grow=lambda: self._create_sessions(200))
+        self.assertEqual(len(response.context['sessions']), 210)
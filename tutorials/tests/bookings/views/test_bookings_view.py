@@ -37,4 +37,15 @@ class BookingsListTest(TestCase):
         self.client.login(username='testuser', password='password')
         Booking.objects.all().delete()
         response = self.client.get(reverse('booking_list'))
-        self.assertContains(response, "<tr><td colspan='5' class='text-center'>No bookings available.</td></tr>", html=True)
\ No newline at end of file
+        self.assertContains(response, "<tr><td colspan='5' class='text-center'>No bookings available.</td></tr>", html=True)
+
+    def test_bookings_paginate_by_annotated_name(self):
+        """tests that keyset pagination breaks ties on equal student names by id across pages"""
+        self.client.login(username='@johndoe', password='Password123')
+        response = self.client.get(self.url, {'order': 'student_desc', 'page_size': 1})
+        self.assertEqual(list(response.context['bookings']), [self.booking2])
+        next_query = response.context['pagination']['next_query']
+        self.assertIsNotNone(next_query)
+        response = self.client.get(f'{self.url}?{next_query}')
+        self.assertEqual(list(response.context['bookings']), [self.booking1])
+        self.assertIsNone(response.context['pagination']['next_query'])
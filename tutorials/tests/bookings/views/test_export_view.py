@@ -0,0 +1,89 @@
+import csv
+import json
+from datetime import timedelta, date, time
+from decimal import Decimal
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from tutorials.models import Booking, Student, Tutor, User, Session
+
+
+class ExportViewTest(TestCase):
+    """Tests of the streaming booking and session exports."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="@johndoe", password="Password123", email="johndoe@example.com", user_type="not specified")
+        tutor_user = User.objects.create_user(username="@janedoe", email="janedoe@example.com", user_type="not specified")
+        self.student = Student.objects.create(username=self.user, email=self.user.email, name="John Doe")
+        self.tutor = Tutor.objects.create(username=tutor_user, email=tutor_user.email, name="Jane Doe", rate=Decimal("20.00"))
+        self.booking = Booking.objects.create(term="Term2", lesson_type="Weekly", student=self.student, tutor=self.tutor)
+        self.empty_booking = Booking.objects.create(term="Term1", lesson_type="Fortnight", student=self.student, tutor=self.tutor)
+        Session.objects.bulk_create([
+            Session(booking=self.booking, session_date=date(2030, 1, 1), session_time=time(9, 0), duration=timedelta(hours=1), payment_status='Successful'),
+            Session(booking=self.booking, session_date=date(2030, 1, 2), session_time=time(9, 0), duration=timedelta(minutes=30)),
+        ])
+        self.client.login(username="@johndoe", password="Password123")
+
+    def _get_csv(self, kind):
+        response = self.client.get(reverse('export', kwargs={'kind': kind, 'fmt': 'csv'}))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Disposition'], f'attachment; filename="{kind}.csv"')
+        return list(csv.DictReader(StringIO(b''.join(response.streaming_content).decode())))
+
+    def test_export_url(self):
+        self.assertEqual(reverse('export', kwargs={'kind': 'sessions', 'fmt': 'json'}), '/exports/sessions.json')
+
+    def test_bookings_csv_has_sql_totals(self):
+        rows = self._get_csv('bookings')
+        self.assertEqual([row['id'] for row in rows], [str(self.booking.pk), str(self.empty_booking.pk)])
+        # 20.00 an hour over an 11 week term: 220.00 for the hour, 110.00 for the half hour
+        self.assertEqual(rows[0]['sessions'], '2')
+        self.assertEqual(rows[0]['total_amount'], '330.00')
+        self.assertEqual(rows[0]['paid_amount'], '220.00')
+        self.assertEqual(rows[0]['outstanding_amount'], '110.00')
+        self.assertEqual(rows[1]['total_amount'], '0.00')
+
+    def test_sessions_csv_matches_model_amounts(self):
+        rows = self._get_csv('sessions')
+        for row, session in zip(rows, Session.objects.order_by('id')):
+            self.assertEqual(Decimal(row['amount']), session.calculate_total_amount())
+            self.assertEqual(row['student'], "John Doe")
+            self.assertEqual(row['tutor'], "Jane Doe")
+
+    def test_sessions_json(self):
+        response = self.client.get(reverse('export', kwargs={'kind': 'sessions', 'fmt': 'json'}))
+        self.assertEqual(response['Content-Type'], 'application/json')
+        sessions = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(len(sessions), 2)
+        self.assertEqual(sessions[1]['amount'], '110.00')
+        self.assertEqual(sessions[1]['date'], '2030-01-02')
+
+    def test_export_is_one_query(self):
+        response = self.client.get(reverse('export', kwargs={'kind': 'sessions', 'fmt': 'csv'}))
+        with CaptureQueriesContext(connection) as queries:
+            b''.join(response.streaming_content)
+        self.assertEqual(len(queries), 1)
+
+    def test_unknown_export_is_not_found(self):
+        response = self.client.get(reverse('export', kwargs={'kind': 'tutors', 'fmt': 'csv'}))
+        self.assertEqual(response.status_code, 404)
+        response = self.client.get(reverse('export', kwargs={'kind': 'sessions', 'fmt': 'xml'}))
+        self.assertEqual(response.status_code, 404)
+
+    def test_export_requires_login(self):
+        self.client.logout()
+        response = self.client.get(reverse('export', kwargs={'kind': 'bookings', 'fmt': 'csv'}))
+        self.assertEqual(response.status_code, 302)
+
+    def test_export_command(self):
+        out = StringIO()
+        call_command('export', 'bookings', stdout=out)
+        rows = list(csv.DictReader(StringIO(out.getvalue())))
+        self.assertEqual(rows[0]['total_amount'], '330.00')
+        out = StringIO()
+        call_command('export', 'sessions', format='json', chunk_size=1, stdout=out)
+        self.assertEqual([session['amount'] for session in json.loads(out.getvalue())], ['220.00', '110.00'])
@@ -0,0 +1,55 @@
+from datetime import timedelta, date, time
+from django.contrib.messages import get_messages
+from django.test import TestCase
+from django.urls import reverse
+from tutorials.models import Booking, Student, Tutor, User, Session
+
+
+class GenerateSessionsViewTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="@johndoe", password="Password123", email="johndoe@example.com", user_type="admin")
+        tutor_user = User.objects.create_user(username="@janedoe", email="janedoe@example.com", user_type="not specified")
+        self.student = Student.objects.create(username=self.user, email=self.user.email, name="John Doe")
+        self.tutor = Tutor.objects.create(username=tutor_user, email=tutor_user.email, name="Jane Doe")
+        self.booking = Booking.objects.create(term="Term2", lesson_type="Bi-Weekly", student=self.student, tutor=self.tutor)
+        self.url = reverse('session_generate', kwargs={'booking_id': self.booking.pk})
+        self.start = date.today() + timedelta(days=7)
+        self.client.login(username="@johndoe", password="Password123")
+
+    def _post(self, session_time='10:00', duration='01:00:00'):
+        return self.client.post(self.url, {
+            'start_date': self.start.isoformat(), 'session_time': session_time,
+            'duration': duration, 'venue': Session.VENUE_BUSH_HOUSE,
+        })
+
+    def test_generate_sessions_url(self):
+        self.assertEqual(self.url, f'/bookings/{self.booking.pk}/sessions/generate/')
+
+    def test_get_generate_sessions(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'sessions/session_generate.html')
+        self.assertEqual(response.context['session_count'], 22)
+
+    def test_post_generates_the_term(self):
+        response = self._post()
+        self.assertRedirects(response, reverse('session_list', kwargs={'booking_id': self.booking.pk}))
+        self.assertEqual(self.booking.sessions.count(), 22)
+        self.assertEqual([str(message) for message in get_messages(response.wsgi_request)], ["Created 22 sessions."])
+
+    def test_post_with_clash_shows_the_error(self):
+        Session.objects.create(booking=self.booking, session_date=self.start + timedelta(days=3), session_time=time(10, 0))
+        response = self._post()
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "The tutor or student already has a session at:")
+        self.assertEqual(self.booking.sessions.count(), 1)
+
+    def test_post_with_a_day_long_duration_is_rejected(self):
+        response = self._post(duration='1 00:00:00')
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "The session duration must be more than zero and less than a day.")
+        self.assertEqual(self.booking.sessions.count(), 0)
+
+    def test_unknown_booking_is_not_found(self):
+        response = self.client.get(reverse('session_generate', kwargs={'booking_id': 999}))
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,47 @@
+from datetime import timedelta, date, time
+from decimal import Decimal
+from django.test import TestCase
+from django.urls import reverse
+from tutorials.models import Booking, Student, Tutor, User, Session
+
+
+class TermInvoiceViewTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="@johndoe", password="Password123", email="johndoe@example.com", user_type="not specified")
+        tutor_user = User.objects.create_user(username="@janedoe", email="janedoe@example.com", user_type="not specified")
+        self.student = Student.objects.create(username=self.user, email=self.user.email, name="John Doe")
+        self.tutor = Tutor.objects.create(username=tutor_user, email=tutor_user.email, name="Jane Doe", rate=Decimal("20.00"))
+        self.booking = Booking.objects.create(term="Term2", lesson_type="Weekly", student=self.student, tutor=self.tutor)
+        self.empty_booking = Booking.objects.create(term="Term2", lesson_type="Fortnight", student=self.student, tutor=self.tutor)
+        Session.objects.bulk_create([
+            Session(booking=self.booking, session_date=date(2030, 1, 1), session_time=time(9, 0), duration=timedelta(hours=1), payment_status='Successful'),
+            Session(booking=self.booking, session_date=date(2030, 1, 2), session_time=time(9, 0), duration=timedelta(minutes=30)),
+        ])
+        self.url = reverse('term_invoice', kwargs={'term': 'Term2'})
+        self.client.login(username="@johndoe", password="Password123")
+
+    def test_term_invoice_url(self):
+        self.assertEqual(self.url, '/invoices/Term2/')
+
+    def test_term_invoice_totals(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'bookings/term_invoice.html')
+        bookings = {booking.pk: booking for booking in response.context['bookings']}
+        # 20.00 an hour over an 11 week term: 220.00 for the hour, 110.00 for the half hour
+        self.assertEqual(bookings[self.booking.pk].session_count, 2)
+        self.assertEqual(bookings[self.booking.pk].total_amount, Decimal("330.00"))
+        self.assertEqual(bookings[self.booking.pk].paid_amount, Decimal("220.00"))
+        self.assertEqual(bookings[self.booking.pk].outstanding_amount, Decimal("110.00"))
+        self.assertEqual(bookings[self.empty_booking.pk].total_amount, Decimal("0"))
+        self.assertEqual(response.context['total_amount'], Decimal("330.00"))
+        self.assertEqual(response.context['outstanding_amount'], Decimal("110.00"))
+
+    def test_unknown_term_is_not_found(self):
+        response = self.client.get(reverse('term_invoice', kwargs={'term': 'Term9'}))
+        self.assertEqual(response.status_code, 404)
+
+    def test_booking_show_uses_sql_amounts(self):
+        response = self.client.get(reverse('session_list', kwargs={'booking_id': self.booking.pk}))
+        self.assertContains(response, "$220.00")
+        self.assertContains(response, "$110.00")
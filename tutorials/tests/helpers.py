@@ -1,3 +1,7 @@
+import re
+from collections import Counter
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from with_asserts.mixin import AssertHTMLMixin
 
@@ -43,4 +47,50 @@ class MenuTesterMixin(AssertHTMLMixin):
         """Check that no menu is present."""
         
         for url in self.menu_urls:
-            self.assertNotHTML(response, f'a[href="{url}"]')
\ No newline at end of file
+            self.assertNotHTML(response, f'a[href="{url}"]')
+
+
+class QueryBudgetMixin:
+    """Class to extend tests with checks on the number of SQL queries a page runs."""
+
+    def assert_query_budget(self, url, budget, grow=None, data=None):
+        """GET url and check it runs no more than budget queries.
+
+        When grow is given it is called to add rows and the page is requested
+        again, which must run exactly as many queries as before. A warm-up
+        request runs first so process-wide caches do not count.
+        """
+
+        self.client.get(url, data)
+        queries, response = self._capture_queries(url, data)
+        self._check_budget(url, budget, queries)
+        if grow is not None:
+            grow()
+            grown_queries, response = self._capture_queries(url, data)
+            self._check_budget(url, budget, grown_queries)
+            if len(grown_queries) != len(queries):
+                self.fail(
+                    f"{url} ran {len(queries)} queries, then {len(grown_queries)} after adding rows.\n"
+                    + self._describe_queries(grown_queries)
+                )
+        return response
+
+    def _capture_queries(self, url, data):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, data)
+        self.assertEqual(response.status_code, 200)
+        return context.captured_queries, response
+
+    def _check_budget(self, url, budget, queries):
+        if len(queries) > budget:
+            self.fail(f"{url} ran {len(queries)} queries, over its budget of {budget}.\n" + self._describe_queries(queries))
+
+    def _describe_queries(self, queries):
+        """List the SQL run more than once with different values, or all SQL if none was."""
+
+        # Replace literal values so the same query for different rows groups together
+        shapes = Counter(re.sub(r"'[^']*'|\b\d+\b", "?", query['sql']) for query in queries)
+        repeated = [(count, sql) for sql, count in shapes.most_common() if count > 1]
+        if repeated:
+            return "Repeated queries:\n" + "\n".join(f"  {count}x {sql}" for count, sql in repeated)
+        return "Queries:\n" + "\n".join(f"  {query['sql']}" for query in queries)
@@ -0,0 +1,93 @@
+import unittest
+from collections import Counter
+from time import perf_counter
+from django.test.runner import DiscoverRunner, ParallelTestSuite, RemoteTestResult, RemoteTestRunner
+
+
+class TestTimer:
+    """Result mixin timing each test and passing the time to addTestTime()."""
+
+    def startTest(self, test):
+        self._test_started = perf_counter()
+        super().startTest(test)
+
+    def stopTest(self, test):
+        super().stopTest(test)
+        self.addTestTime(test, perf_counter() - self._test_started)
+
+
+class TimingTextTestResult(TestTimer, unittest.TextTestResult):
+    """Test result that adds up the time each test class's tests take."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.class_times = Counter()
+
+    def addTestTime(self, test, seconds):
+        self.class_times[f'{type(test).__module__}.{type(test).__qualname__}'] += seconds
+
+
+class ParallelTimingTextTestResult(TimingTextTestResult):
+    """Timing result of a parallel run, adding up the times the workers report.
+
+    The workers' results are replayed in this process once each batch has
+    run, so timing the replayed tests here would measure nothing.
+    """
+
+    startTest = unittest.TextTestResult.startTest
+    stopTest = unittest.TextTestResult.stopTest
+
+
+class TimingRemoteTestResult(TestTimer, RemoteTestResult):
+    """Worker result sending each test's time to the parent as an addTestTime event."""
+
+    def addTestTime(self, test, seconds):
+        self.events.append(('addTestTime', self.test_index, seconds))
+
+
+class TimingRemoteTestRunner(RemoteTestRunner):
+    resultclass = TimingRemoteTestResult
+
+
+class TimingParallelTestSuite(ParallelTestSuite):
+    runner_class = TimingRemoteTestRunner
+
+
+class TimedTestRunner(DiscoverRunner):
+    """Test runner reporting the suite's wall-clock time and, with --slowest, its slowest test classes."""
+
+    def __init__(self, slowest=0, **kwargs):
+        super().__init__(**kwargs)
+        self.slowest = slowest
+        self.result = None
+        self.running_in_parallel = False
+        if slowest:
+            self.parallel_test_suite = TimingParallelTestSuite
+
+    @classmethod
+    def add_arguments(cls, parser):
+        super().add_arguments(parser)
+        parser.add_argument('--slowest', type=int, default=0, metavar='N', help='Report the N slowest test classes.')
+
+    def get_resultclass(self):
+        resultclass = super().get_resultclass()
+        if resultclass is None and self.slowest:
+            return ParallelTimingTextTestResult if self.running_in_parallel else TimingTextTestResult
+        return resultclass
+
+    def run_suite(self, suite, **kwargs):
+        # --parallel still runs serially when there are too few test classes to split
+        self.running_in_parallel = isinstance(suite, ParallelTestSuite)
+        self.result = super().run_suite(suite, **kwargs)
+        return self.result
+
+    def run_tests(self, *args, **kwargs):
+        start = perf_counter()
+        failures = super().run_tests(*args, **kwargs)
+        self.log(f"Test suite wall-clock time: {perf_counter() - start:.1f}s")
+        class_times = getattr(self.result, 'class_times', None)
+        if class_times:
+            self.log(f"Slowest {self.slowest} test classes:")
+            for name, seconds in class_times.most_common(self.slowest):
+                self.log(f"  {seconds:6.2f}s  {name}")
+        return failures
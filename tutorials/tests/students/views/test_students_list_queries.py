@@ -0,0 +1,33 @@
+from django.test import TestCase
+from django.urls import reverse
+from tutorials.models import Student, User
+from tutorials.tests.helpers import QueryBudgetMixin
+
+
+class StudentsListQueryBudgetTestCase(QueryBudgetMixin, TestCase):
+    """Ensure students_list runs a fixed number of queries however many students exist."""
+
+    def setUp(self):
+        User.objects.create_user(username="@johndoe", email="johndoe@example.com", password="Password123", user_type="not specified")
+        self.client.login(username="@johndoe", password="Password123")
+        self.url = reverse('students_list')
+        self.student_count = 0
+        self._create_students(10)
+
+    def _create_students(self, count):
+        """Bulk create students without triggering signals."""
+        start = self.student_count
+        users = User.objects.bulk_create([
+            User(username=f"@student{i}", email=f"student{i}@example.com", user_type="not specified")
+            for i in range(start, start + count)
+        ])
+        Student.objects.bulk_create([
+            Student(name=f"Student {i}", username=user, email=user.email)
+            for i, user in enumerate(users, start)
+        ])
+        self.student_count += count
+
+    def test_students_list_query_budget(self):
+        # Session, user, page of students and the next-page look-ahead
+        response = self.assert_query_budget(self.url, 4, grow=lambda: self._create_students(200), data={'page_size': 10})
+        self.assertContains(response, "@student0")
@@ -0,0 +1,40 @@
+from django.test import TestCase
+from tutorials.caching import invalidate_views
+from tutorials.models import Subject
+from tutorials.subjects import get_subject_choices, get_subject_id, invalidate_subject_cache
+
+
+class SubjectCacheTestCase(TestCase):
+    def test_catalogue_is_seeded(self):
+        names = [name for subject_id, name in get_subject_choices()]
+        for name in ['Python', 'Java', 'Javascript', 'React', 'Ruby', 'Go', 'HTML/CSS', 'C', 'Scala']:
+            self.assertIn(name, names)
+
+    def test_cached_lookups_cost_no_queries(self):
+        get_subject_choices()
+        with self.assertNumQueries(0):
+            get_subject_choices()
+            python_id = get_subject_id("Python")
+        self.assertEqual(python_id, Subject.objects.get(name="Python").id)
+
+    def test_saving_a_subject_invalidates_the_cache(self):
+        get_subject_choices()
+        subject = Subject.objects.create(name="Haskell")
+        self.assertIn((subject.id, "Haskell"), get_subject_choices())
+        subject.delete()
+        self.assertNotIn((subject.id, "Haskell"), get_subject_choices())
+
+    def test_missing_subject_is_created(self):
+        subject_id = get_subject_id("Rust")
+        self.assertEqual(Subject.objects.get(name="Rust").id, subject_id)
+
+    def test_changes_from_another_process_are_seen(self):
+        # The cache outlives the test's rollback, so empty it again afterwards
+        self.addCleanup(invalidate_subject_cache)
+        get_subject_choices()
+        # Another process's write skips this process's signals but bumps the shared counter
+        Subject.objects.filter(name="Python")._raw_delete(Subject.objects.db)
+        invalidate_views(Subject)
+        self.assertNotIn("Python", [name for _, name in get_subject_choices()])
+        python_id = get_subject_id("Python")
+        self.assertEqual(Subject.objects.get(name="Python").id, python_id)
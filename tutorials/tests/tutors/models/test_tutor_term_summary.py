@@ -0,0 +1,111 @@
+from datetime import date, time, timedelta
+from decimal import Decimal
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from tutorials.models import Booking, Session, Student, Tutor, TutorTermSummary, User
+from tutorials.reports import refresh_summaries
+from tutorials.scheduling import generate_schedule
+
+
+class TutorTermSummaryTestCase(TestCase):
+    """Unit tests for the tutor workload summaries recomputed as bookings and sessions change"""
+
+    def setUp(self):
+        users = [
+            User.objects.create_user(username=f'@person{i}', email=f'person{i}@example.com', user_type='not specified')
+            for i in range(3)
+        ]
+        self.student = Student.objects.create(username=users[0], name='Student', email=users[0].email)
+        self.tutor = Tutor.objects.create(username=users[1], name='Tutor One', email=users[1].email, rate=Decimal('20.00'))
+        self.other_tutor = Tutor.objects.create(username=users[2], name='Tutor Two', email=users[2].email)
+        self.day = date.today() + timedelta(days=30)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.booking = Booking.objects.create(student=self.student, tutor=self.tutor, term=Booking.TERM2)
+
+    def summary(self, tutor=None, term=Booking.TERM2):
+        return TutorTermSummary.objects.filter(tutor=tutor or self.tutor, term=term).first()
+
+    def add_session(self, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Session.objects.create(booking=self.booking, session_date=self.day, **kwargs)
+
+    def test_booking_without_sessions_has_an_empty_summary(self):
+        summary = self.summary()
+        self.assertEqual((summary.tutor_name, summary.booking_count, summary.session_count, summary.revenue), ('Tutor One', 1, 0, Decimal('0.00')))
+
+    def test_sessions_are_summed_as_invoiced(self):
+        # 20.00 an hour x 1.5 hours x 11 weeks for a Weekly lesson
+        self.add_session(session_time=time(10, 0), duration=timedelta(minutes=90))
+        session = self.add_session(session_time=time(14, 0), payment_status=Session.PAYMENT_SUCCESSFUL)
+        summary = self.summary()
+        self.assertEqual(summary.session_count, 2)
+        self.assertEqual(summary.booked_minutes, 150)
+        self.assertEqual(summary.booked_hours, 2.5)
+        self.assertEqual(summary.revenue, Decimal('550.00'))
+        self.assertEqual(summary.paid, Decimal('220.00'))
+        self.assertEqual(summary.pending, Decimal('330.00'))
+
+        session.payment_status = Session.PAYMENT_PENDING
+        with self.captureOnCommitCallbacks(execute=True):
+            session.save()
+        self.assertEqual(self.summary().paid, Decimal('0.00'))
+
+    def test_moving_a_booking_recomputes_both_summaries(self):
+        self.add_session(session_time=time(10, 0))
+        self.booking.tutor = self.other_tutor
+        self.booking.term = Booking.TERM3
+        with self.captureOnCommitCallbacks(execute=True):
+            self.booking.save()
+        self.assertIsNone(self.summary())
+        self.assertEqual(self.summary(self.other_tutor, Booking.TERM3).session_count, 1)
+
+    def test_moving_a_session_to_another_tutor_recomputes_both_summaries(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            other_booking = Booking.objects.create(student=self.student, tutor=self.other_tutor, term=Booking.TERM2)
+        session = Session.objects.get(pk=self.add_session(session_time=time(10, 0)).pk)
+        session.booking = other_booking
+        with self.captureOnCommitCallbacks(execute=True):
+            session.save()
+        self.assertEqual((self.summary().session_count, self.summary().revenue), (0, Decimal('0.00')))
+        self.assertEqual(self.summary(self.other_tutor).session_count, 1)
+
+    def test_rate_and_name_changes_reach_the_summary(self):
+        self.add_session(session_time=time(10, 0))
+        tutor = Tutor.objects.get(pk=self.tutor.pk)
+        tutor.rate = Decimal('40.00')
+        tutor.name = 'Renamed'
+        with self.captureOnCommitCallbacks(execute=True):
+            tutor.save()
+        summary = self.summary()
+        self.assertEqual((summary.tutor_name, summary.revenue), ('Renamed', Decimal('440.00')))
+
+    def test_deleting_a_booking_with_its_sessions_recomputes_once(self):
+        for hour in (9, 11, 13):
+            self.add_session(session_time=time(hour, 0))
+        with self.captureOnCommitCallbacks() as callbacks:
+            Booking.objects.get(pk=self.booking.pk).delete()
+        # Resolve the sessions' bookings, then one grouped query and a delete
+        # inside a savepoint; later callbacks find nothing left to do
+        with self.assertNumQueries(5):
+            for callback in callbacks:
+                callback()
+        self.assertIsNone(self.summary())
+
+    def test_generated_schedules_are_summarised(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            generate_schedule(self.booking, self.day, time(10, 0), timedelta(hours=1))
+        self.assertEqual(self.summary().session_count, 11)
+
+    def test_refresh_rebuilds_from_the_tables(self):
+        self.add_session(session_time=time(10, 0))
+        TutorTermSummary.objects.update(session_count=99)
+        self.assertEqual(refresh_summaries(), 1)
+        self.assertEqual(self.summary().session_count, 1)
+
+    def test_refresh_reports_command(self):
+        TutorTermSummary.objects.all().delete()
+        out = StringIO()
+        call_command('refresh_reports', stdout=out)
+        self.assertIn('Rebuilt 1 tutor term summaries.', out.getvalue())
+        self.assertIsNotNone(self.summary())
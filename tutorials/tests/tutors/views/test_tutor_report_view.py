@@ -0,0 +1,58 @@
+from decimal import Decimal
+from django.test import TestCase
+from django.urls import reverse
+from tutorials.models import Booking, Tutor, TutorTermSummary, User
+
+
+class TutorReportViewTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='@johndoe', password='Password123', email='johndoe@example.com', user_type='admin')
+        self.url = reverse('tutor_report')
+        for i, (revenue, paid) in enumerate([('300.00', '300.00'), ('500.00', '100.00'), ('100.00', '0.00')]):
+            user = User.objects.create_user(username=f'@tutor{i}', email=f'tutor{i}@example.com', user_type='not specified')
+            tutor = Tutor.objects.create(username=user, name=f'Tutor {i}', email=user.email)
+            TutorTermSummary.objects.create(
+                tutor=tutor, term=Booking.TERM1, tutor_name=tutor.name, booking_count=1, session_count=i + 1,
+                booked_minutes=60 * (i + 1), revenue=Decimal(revenue), paid=Decimal(paid), pending=Decimal(revenue) - Decimal(paid),
+            )
+            TutorTermSummary.objects.create(tutor=tutor, term=Booking.TERM2, tutor_name=tutor.name)
+        self.client.login(username='@johndoe', password='Password123')
+
+    def names(self, response):
+        return [summary.tutor_name for summary in response.context['summaries']]
+
+    def test_tutor_report_url(self):
+        self.assertEqual(self.url, '/tutors/report/')
+
+    def test_report_reads_only_the_summary_table(self):
+        # The session and user, then the totals and the page
+        with self.assertNumQueries(4):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'tutors/tutor_report.html')
+        self.assertEqual(self.names(response), ['Tutor 0', 'Tutor 1', 'Tutor 2'])
+        self.assertEqual(response.context['totals']['revenue'], Decimal('900.00'))
+        self.assertEqual(response.context['total_hours'], 6)
+
+    def test_report_sorts(self):
+        self.assertEqual(self.names(self.client.get(self.url, {'order': 'revenue'})), ['Tutor 1', 'Tutor 0', 'Tutor 2'])
+        self.assertEqual(self.names(self.client.get(self.url, {'order': 'hours'})), ['Tutor 2', 'Tutor 1', 'Tutor 0'])
+        self.assertEqual(self.names(self.client.get(self.url, {'order': 'bogus'})), ['Tutor 0', 'Tutor 1', 'Tutor 2'])
+
+    def test_report_filters(self):
+        response = self.client.get(self.url, {'outstanding': 'true', 'order': 'pending'})
+        self.assertEqual(self.names(response), ['Tutor 1', 'Tutor 2'])
+        response = self.client.get(self.url, {'term': Booking.TERM2})
+        self.assertEqual(response.context['totals']['revenue'], Decimal('0.00'))
+        self.assertEqual(len(self.names(response)), 3)
+
+    def test_report_pages_by_amount(self):
+        response = self.client.get(self.url, {'order': 'revenue', 'page_size': 2})
+        self.assertEqual(self.names(response), ['Tutor 1', 'Tutor 0'])
+        response = self.client.get(f"{self.url}?{response.context['pagination']['next_query']}")
+        self.assertEqual(self.names(response), ['Tutor 2'])
+
+    def test_report_requires_login(self):
+        self.client.logout()
+        response = self.client.get(self.url)
+        self.assertRedirects(response, reverse('log_in') + '?next=' + self.url)
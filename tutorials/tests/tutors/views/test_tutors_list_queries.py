@@ -0,0 +1,71 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from tutorials.models import Tutor, User, Subject
+from tutorials.tests.helpers import QueryBudgetMixin
+
+
+class TutorsListQueryCountTestCase(QueryBudgetMixin, TestCase):
+    """Ensure tutors_list issues a fixed number of queries however many tutors exist."""
+
+    def setUp(self):
+        self.python_subject, created = Subject.objects.get_or_create(name="Python")
+        self.java_subject, created = Subject.objects.get_or_create(name="Java")
+        self.login_user = User.objects.create_user(
+            username="@johndoe",
+            email="johndoe@example.com",
+            password="Password123",
+            user_type="not specified"
+        )
+        self.client.login(username="@johndoe", password="Password123")
+        self.url = reverse('tutors_list')
+        self.tutor_count = 0
+
+    def _create_tutors(self, count):
+        """Bulk create tutors, each teaching two subjects, without triggering signals."""
+        start = self.tutor_count
+        users = User.objects.bulk_create([
+            User(username=f"@tutor{i}", email=f"tutor{i}@example.com", user_type="not specified")
+            for i in range(start, start + count)
+        ])
+        tutors = Tutor.objects.bulk_create([
+            Tutor(name=f"Tutor {i}", username=user, email=user.email)
+            for i, user in enumerate(users, start)
+        ])
+        Tutor.subjects.through.objects.bulk_create([
+            Tutor.subjects.through(tutor_id=tutor.id, subject_id=subject.id)
+            for tutor in tutors
+            for subject in (self.python_subject, self.java_subject)
+        ])
+        self.tutor_count += count
+
+    def _count_queries(self, params):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries), response
+
+    def test_query_count_is_the_same_for_10_and_1000_tutors(self):
+        # Both requests fill a whole page, so both run the next-page look-ahead
+        self._create_tutors(10)
+        self._count_queries({'page_size': 10})
+        small_count, response = self._count_queries({'page_size': 10})
+        self.assertEqual(len(response.context['tutors']), 10)
+
+        self._create_tutors(990)
+        large_count, response = self._count_queries({'page_size': 200})
+        self.assertEqual(len(response.context['tutors']), 200)
+
+        self.assertEqual(small_count, large_count)
+
+    def test_tutors_list_query_budget(self):
+        # Session, user, page of tutors, their subjects and the next-page look-ahead
+        self._create_tutors(10)
+        self.assert_query_budget(self.url, 5, grow=lambda: self._create_tutors(200), data={'page_size': 10})
+
+    def test_tutor_rows_show_username_and_subjects(self):
+        self._create_tutors(3)
+        count, response = self._count_queries({})
+        self.assertContains(response, "@tutor0")
+        self.assertContains(response, "Python, Java")
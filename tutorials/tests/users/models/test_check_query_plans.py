@@ -0,0 +1,36 @@
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase
+from tutorials.management.commands.check_query_plans import plan_problems
+from tutorials.subjects import invalidate_subject_cache
+
+
+class CheckQueryPlansTestCase(TestCase):
+    """Tests of the list-view query plan check."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.addClassCleanup(invalidate_subject_cache)
+        # Enough rows that the planner prefers indexes to sorting small tables
+        call_command('seed', stdout=StringIO(), random_seed=1, users=300, bookings=300, sessions=3000, requests=100)
+
+    def test_list_view_queries_use_indexes(self):
+        out = StringIO()
+        call_command('check_query_plans', stdout=out)
+        self.assertIn("list-view queries use an index.", out.getvalue())
+
+    def test_missing_index_fails_the_check(self):
+        with connection.cursor() as cursor:
+            cursor.execute('DROP INDEX "request_status_idx"')
+        out = StringIO()
+        with self.assertRaises(CommandError):
+            call_command('check_query_plans', stdout=out)
+        self.assertIn("student_requests {'status': 'pending'}: SCAN tutorials_studentrequest", out.getvalue())
+
+    def test_sorting_search_matches_is_allowed(self):
+        plan = [(0, 0, 0, 'SEARCH tutorials_user USING INTEGER PRIMARY KEY (rowid=?)'), (0, 0, 0, 'USE TEMP B-TREE FOR ORDER BY')]
+        with connection.cursor() as cursor:
+            self.assertEqual(plan_problems(cursor, 'SELECT * FROM "tutorials_user" ORDER BY "tutorials_user"."last_name"', plan), ['USE TEMP B-TREE FOR ORDER BY'])
+            self.assertEqual(plan_problems(cursor, 'SELECT * FROM "tutorials_user" WHERE "tutorials_user"."id" IN (SELECT rowid FROM s WHERE s MATCH %s)', plan), [])
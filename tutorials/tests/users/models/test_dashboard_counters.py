@@ -0,0 +1,96 @@
+from datetime import date, time, timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from tutorials.metrics import compute_counters, dashboard_counts, refresh_counters, week_counter
+from tutorials.models import Booking, DashboardCounter, Session, Student, StudentRequest, Tutor, User
+
+
+class DashboardCountersTestCase(TestCase):
+    """Unit tests for the dashboard counters kept up to date by signals"""
+
+    def setUp(self):
+        self.student_user = User.objects.create_user(username='@student', email='student@example.com', user_type='student')
+        self.tutor_user = User.objects.create_user(username='@tutor', email='tutor@example.com', user_type='tutor')
+        self.student = Student.objects.get(username=self.student_user)
+        self.tutor = Tutor.objects.get(username=self.tutor_user)
+        self.booking = Booking.objects.create(student=self.student, tutor=self.tutor)
+        self.day = date.today() + timedelta(days=30)
+
+    def counts(self):
+        return dict(DashboardCounter.objects.exclude(value=0).values_list('name', 'value'))
+
+    def assertCountersExact(self):
+        self.assertEqual(self.counts(), {name: value for name, value in compute_counters().items() if value})
+
+    def test_new_student_is_unallocated_and_pending(self):
+        self.assertEqual(self.counts(), {'unallocated_students': 1, 'pending_payments': 1})
+
+    def test_changing_a_counted_field_moves_the_count(self):
+        self.student.allocated = True
+        self.student.payment = Student.SUCCESSFUL
+        self.student.save()
+        self.assertEqual(self.counts(), {})
+        self.student.allocated = False
+        self.student.save()
+        self.assertEqual(self.counts(), {'unallocated_students': 1})
+
+    def test_saves_changing_no_count_write_no_counter(self):
+        student = Student.objects.get(pk=self.student.pk)
+        student.name = 'Renamed'
+        with self.assertNumQueries(1):
+            student.save()
+        with self.assertNumQueries(1):
+            student.save(update_fields=['name'])
+
+    def test_instances_not_read_from_the_database_are_compared_with_their_row(self):
+        Student(pk=self.student.pk, username=self.student_user, name='Student', email='student@example.com', allocated=True).save()
+        self.assertEqual(self.counts(), {'pending_payments': 1})
+
+    def test_requests_are_open_until_resolved(self):
+        request = StudentRequest.objects.create(name='Student', username=self.student_user, request_type='custom_request', description='Help')
+        StudentRequest.objects.create(name='Student', username=self.student_user, request_type='custom_request', description='More', status='in_progress')
+        self.assertEqual(self.counts()['open_requests'], 2)
+        request.status = 'resolved'
+        request.save()
+        self.assertEqual(self.counts()['open_requests'], 1)
+        self.assertCountersExact()
+
+    def test_sessions_are_counted_per_week(self):
+        session = Session.objects.create(booking=self.booking, session_date=self.day, session_time=time(10, 0))
+        Session.objects.create(booking=self.booking, session_date=self.day, session_time=time(12, 0))
+        self.assertEqual(self.counts()[week_counter(self.day)], 2)
+        session.session_date = self.day + timedelta(weeks=1)
+        session.save()
+        self.assertEqual(self.counts()[week_counter(self.day)], 1)
+        self.assertEqual(self.counts()[week_counter(self.day + timedelta(weeks=1))], 1)
+        self.assertCountersExact()
+
+    def test_week_counter_names_the_monday(self):
+        self.assertEqual(week_counter(date(2026, 10, 18)), 'sessions_week:2026-10-12')
+        self.assertEqual(week_counter(date(2026, 10, 12)), 'sessions_week:2026-10-12')
+
+    def test_deletes_including_cascades_are_uncounted(self):
+        Session.objects.create(booking=self.booking, session_date=self.day, session_time=time(10, 0))
+        self.student_user.delete()
+        self.assertEqual(self.counts(), {})
+
+    def test_refresh_corrects_drift_from_writes_skipping_signals(self):
+        Student.objects.update(allocated=True)
+        self.assertEqual(self.counts()['unallocated_students'], 1)
+        self.assertEqual(refresh_counters()['unallocated_students'], 0)
+        self.assertEqual(self.counts(), {'pending_payments': 1})
+
+    def test_refresh_dashboard_command(self):
+        DashboardCounter.objects.all().delete()
+        out = StringIO()
+        call_command('refresh_dashboard', stdout=out)
+        self.assertIn('pending_payments: 1', out.getvalue())
+        self.assertEqual(self.counts(), {'unallocated_students': 1, 'pending_payments': 1})
+
+    def test_dashboard_counts_read_one_query(self):
+        Session.objects.create(booking=self.booking, session_date=self.day, session_time=time(10, 0))
+        with self.assertNumQueries(1):
+            counts = dashboard_counts(today=self.day)
+        self.assertEqual(counts, {'unallocated_students': 1, 'pending_payments': 1, 'open_requests': 0, 'sessions_this_week': 1})
+        self.assertEqual(dashboard_counts(today=self.day + timedelta(weeks=1))['sessions_this_week'], 0)
@@ -0,0 +1,147 @@
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from tutorials.models import User, Student, Tutor, Subject
+from tutorials.profiles import reconcile_profiles
+from tutorials.subjects import get_subject_choices
+
+
+class ReconcileProfilesTestCase(TestCase):
+    def setUp(self):
+        Subject.objects.get_or_create(name="Python")
+        # bulk_create bypasses post_save, leaving these users without profiles
+        self.student_user, self.tutor_user = User.objects.bulk_create([
+            User(
+                username="@student1",
+                first_name="John",
+                last_name="Doe",
+                email="John.Doe@example.com",
+                user_type="student"
+            ),
+            User(
+                username="@tutor1",
+                first_name="Jane",
+                last_name="Smith",
+                email="jane.smith@example.com",
+                user_type="tutor"
+            ),
+        ])
+
+    def test_reconcile_creates_students_and_tutors(self):
+        self.assertEqual(reconcile_profiles(), (1, 1))
+
+        student = Student.objects.get(username=self.student_user)
+        self.assertEqual(student.name, self.student_user.full_name)
+        self.assertEqual(student.email, self.student_user.email.lower())
+
+        tutor = Tutor.objects.get(username=self.tutor_user)
+        self.assertEqual(tutor.name, self.tutor_user.full_name)
+        self.assertEqual(tutor.email, self.tutor_user.email.lower())
+        self.assertEqual([subject.name for subject in tutor.subjects.all()], ["Python"])
+
+    def test_reconcile_does_not_duplicate_records(self):
+        reconcile_profiles()
+        self.assertEqual(reconcile_profiles(), (0, 0))
+
+        self.assertEqual(Student.objects.filter(username=self.student_user).count(), 1)
+        self.assertEqual(Tutor.objects.filter(username=self.tutor_user).count(), 1)
+
+    def test_reconcile_query_count_does_not_grow_with_users(self):
+        User.objects.bulk_create([
+            User(username=f"@student{i}x", email=f"student{i}@example.com", user_type="student")
+            for i in range(50)
+        ])
+        get_subject_choices()
+        # select students, insert students, select tutors, insert tutors,
+        # insert tutor subjects, create and update the dashboard counters;
+        # the Python subject id comes from the cache
+        with self.assertNumQueries(7):
+            reconcile_profiles()
+
+    def test_command_creates_missing_profiles(self):
+        out = StringIO()
+        call_command('reconcile_profiles', stdout=out)
+        self.assertIn("Created 1 Student profile(s).", out.getvalue())
+        self.assertIn("Created 1 Tutor profile(s).", out.getvalue())
+        self.assertTrue(Student.objects.filter(username=self.student_user).exists())
+        self.assertTrue(Tutor.objects.filter(username=self.tutor_user).exists())
+
+
+class UserProfileSignalTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="@student1",
+            first_name="John",
+            last_name="Doe",
+            email="john.doe@example.com",
+            user_type="student"
+        )
+
+    def test_saving_user_creates_profile(self):
+        self.assertTrue(Student.objects.filter(username=self.user).exists())
+        self.assertFalse(Tutor.objects.filter(username=self.user).exists())
+
+    def test_changing_user_type_swaps_profile(self):
+        self.user.user_type = 'tutor'
+        self.user.save()
+        self.assertFalse(Student.objects.filter(username=self.user).exists())
+        self.assertTrue(Tutor.objects.filter(username=self.user).exists())
+
+    def test_changing_user_type_on_loaded_user_swaps_profile(self):
+        user = User.objects.get(pk=self.user.pk)
+        user.user_type = 'tutor'
+        user.save(update_fields=['user_type'])
+        self.assertFalse(Student.objects.filter(username=self.user).exists())
+        self.assertTrue(Tutor.objects.filter(username=self.user).exists())
+
+    def test_saves_that_keep_user_type_only_write_the_user(self):
+        user = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(1):
+            user.save(update_fields=['last_login'])
+        with self.assertNumQueries(1):
+            user.first_name = "Johnny"
+            user.save()
+
+    def test_update_fields_without_user_type_skip_sync(self):
+        self.user.user_type = 'tutor'
+        with self.assertNumQueries(1):
+            self.user.save(update_fields=['first_name'])
+        # The user_type change was not saved, so it is still pending
+        self.assertTrue(self.user.needs_profile_sync())
+
+    def test_logging_in_does_not_touch_profiles(self):
+        self.user.set_password("Password123")
+        self.user.save()
+        with CaptureQueriesContext(connection) as context:
+            self.client.login(username="@student1", password="Password123")
+        self.assertFalse(any('tutorials_student' in query['sql'] or 'tutorials_tutor' in query['sql'] for query in context.captured_queries))
+
+
+class ListViewQueryCountTestCase(TestCase):
+    """List views must not reconcile profiles inline."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="@johndoe", email="johndoe@example.com", password="Password123"
+        )
+        self.client.login(username="@johndoe", password="Password123")
+
+    def _count_queries(self, url_name):
+        with CaptureQueriesContext(connection) as context:
+            # A page size above the row count keeps the next-page look-ahead out of both counts
+            response = self.client.get(reverse(url_name), {'page_size': 200})
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def test_list_views_issue_constant_queries_regardless_of_user_count(self):
+        for url_name in ['users_list', 'students_list']:
+            before = self._count_queries(url_name)
+            User.objects.bulk_create([
+                User(username=f"@{url_name}{i}", email=f"{url_name}{i}@example.com", user_type="student")
+                for i in range(100)
+            ])
+            after = self._count_queries(url_name)
+            self.assertEqual(before, after, url_name)
@@ -0,0 +1,79 @@
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from tutorials.models import Booking, Student, StudentRequest, Tutor, User
+from tutorials.search import index_table, install_search_indexes, search
+
+
+class SearchTestCase(TestCase):
+    """Tests of the indexed name search."""
+
+    def setUp(self):
+        self.jane = User.objects.create_user(username="@janedoe", first_name="Jane", last_name="Doe", email="jane@example.org", user_type="not specified")
+        self.john = User.objects.create_user(username="@johnsmith", first_name="John", last_name="Smith", email="john@example.org", user_type="not specified")
+
+    def _search_users(self, query):
+        return set(search(User.objects.all(), query, ['first_name', 'last_name']))
+
+    def test_search_uses_the_index(self):
+        sql = str(search(User.objects.all(), "Jane", ['first_name']).query)
+        self.assertIn(f"{index_table(User)} MATCH", sql)
+
+    def test_search_matches_substrings_ignoring_case(self):
+        self.assertEqual(self._search_users("ANE"), {self.jane})
+        self.assertEqual(self._search_users("mit"), {self.john})
+        self.assertEqual(self._search_users("jane doe"), set())
+
+    def test_search_only_matches_requested_fields(self):
+        self.assertEqual(self._search_users("example"), set())
+        self.assertEqual(set(search(User.objects.all(), "example", ['email'])), {self.jane, self.john})
+
+    def test_short_queries_fall_back_to_a_scan(self):
+        self.assertEqual(self._search_users("Jo"), {self.john})
+
+    def test_quotes_in_queries_are_literal(self):
+        User.objects.create_user(username="@oconnor", first_name='Shaq "O"', last_name="O'Connor", email="o@example.org", user_type="not specified")
+        self.assertEqual(len(self._search_users("'Con")), 1)
+        self.assertEqual(len(self._search_users('"O"')), 1)
+
+    def test_index_follows_saves_updates_and_deletes(self):
+        self.jane.first_name = "Janet"
+        self.jane.save()
+        self.assertEqual(self._search_users("janet"), {self.jane})
+        User.objects.filter(pk=self.john.pk).update(last_name="Smyth")
+        self.assertEqual(self._search_users("smith"), set())
+        self.assertEqual(self._search_users("smyth"), {self.john})
+        self.john.delete()
+        self.assertEqual(self._search_users("smyth"), set())
+
+    def test_index_follows_bulk_create(self):
+        users = User.objects.bulk_create([User(username="@bulk1", first_name="Bulky", email="bulk@example.org")])
+        self.assertEqual(self._search_users("bulky"), set(users))
+
+    def test_install_is_idempotent_and_restores_triggers(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TRIGGER {index_table(User)}_insert")
+        install_search_indexes()
+        install_search_indexes()
+        user = User.objects.create_user(username="@restored", first_name="Restored", email="restored@example.org", user_type="not specified")
+        self.assertEqual(self._search_users("restored"), {user})
+
+    def test_list_views_search_through_the_index(self):
+        self.client.force_login(self.jane)
+        student = Student.objects.create(username=self.jane, name="Jane Doe", email="jane.student@example.org")
+        tutor = Tutor.objects.create(username=self.john, name="John Smith", email="john.tutor@example.org")
+        booking = Booking.objects.create(student=student, tutor=tutor)
+        StudentRequest.objects.create(name="Jane Doe", username=self.jane, request_type='custom_request', description="Help")
+
+        response = self.client.get(reverse('users_list'), {'search': 'ohn'})
+        self.assertEqual(list(response.context['users']), [self.john])
+        response = self.client.get(reverse('students_list'), {'search': 'jane'})
+        self.assertEqual(list(response.context['students']), [student])
+        response = self.client.get(reverse('tutors_list'), {'search': 'smith'})
+        self.assertEqual(list(response.context['tutors']), [tutor])
+        response = self.client.get(reverse('student_requests'), {'search': 'doe'})
+        self.assertEqual(len(response.context['requests']), 1)
+        response = self.client.get(reverse('booking_list'), {'student_search': 'jane', 'tutor_search': 'smi'})
+        self.assertEqual(list(response.context['bookings']), [booking])
+        response = self.client.get(reverse('booking_list'), {'tutor_search': 'jane'})
+        self.assertEqual(list(response.context['bookings']), [])
@@ -0,0 +1,53 @@
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from tutorials.models import Booking, Session, Student, StudentRequest, Tutor, User
+from tutorials.scheduling import find_conflicts
+
+
+class SeedCommandTestCase(TestCase):
+    """Tests of the bulk seed command."""
+
+    def seed(self, **options):
+        call_command('seed', stdout=StringIO(), random_seed=1, **options)
+
+    def test_seed_creates_requested_rows(self):
+        self.seed(users=40, bookings=30, sessions=200, requests=10, batch_size=7)
+        self.assertEqual(User.objects.count(), 43)
+        self.assertEqual(Student.objects.count() + Tutor.objects.count(), 42)
+        self.assertEqual(Booking.objects.count(), 30)
+        self.assertEqual(Session.objects.count(), 200)
+        self.assertEqual(StudentRequest.objects.count(), 10)
+        self.assertFalse(Tutor.objects.filter(subjects__isnull=True).exists())
+
+    def test_seeded_sessions_do_not_clash(self):
+        self.seed(users=20, bookings=40, sessions=400, requests=0)
+        self.assertEqual(find_conflicts(), [])
+
+    def test_seeded_users_can_log_in(self):
+        self.seed(users=0, bookings=0, sessions=0, requests=0)
+        admin = User.objects.get(username='@johndoe')
+        self.assertTrue(admin.is_superuser)
+        self.assertTrue(admin.check_password('Password123'))
+        self.assertTrue(User.objects.get(username='@charlie').students.exists())
+
+    def test_seeding_twice_keeps_usernames_unique(self):
+        self.seed(users=30, bookings=0, sessions=0, requests=0)
+        self.seed(users=30, bookings=0, sessions=0, requests=0)
+        self.assertEqual(User.objects.count(), 63)
+
+    def test_batches_do_not_grow_with_rows(self):
+        # The first run adds the fixture users and caches the subjects
+        self.seed(users=0, bookings=0, sessions=0, requests=0)
+        with CaptureQueriesContext(connection) as small:
+            self.seed(users=10, bookings=10, sessions=50, requests=5)
+        with CaptureQueriesContext(connection) as large:
+            self.seed(users=100, bookings=100, sessions=500, requests=50)
+        # Backends may split a batch into several INSERTs, but never add a transaction
+        self.assertEqual(self.savepoints(small), self.savepoints(large))
+        self.assertLess(len(large), 50)
+
+    def savepoints(self, queries):
+        return sum(1 for query in queries.captured_queries if query['sql'].startswith('SAVEPOINT'))
@@ -0,0 +1,42 @@
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from tutorials.models import Booking, Session, Student, StudentRequest, Subject, Tutor, User
+from tutorials.subjects import get_subject_choices, invalidate_subject_cache
+
+CATALOGUE = ['C', 'Go', 'HTML/CSS', 'Java', 'Javascript', 'Python', 'React', 'Ruby', 'Scala']
+
+
+class UnseedCommandTestCase(TestCase):
+    """Tests of the bulk unseed command."""
+
+    def setUp(self):
+        call_command('seed', stdout=StringIO(), users=20, bookings=10, sessions=50, requests=5, random_seed=1)
+        self.staff = User.objects.create_user(username="@staffer", email="staffer@example.org", is_staff=True, user_type="not specified")
+
+    def test_unseed_deletes_sample_data(self):
+        out = StringIO()
+        call_command('unseed', stdout=out)
+        for model in [Session, Booking, StudentRequest, Tutor, Student]:
+            self.assertFalse(model.objects.exists(), model.__name__)
+        self.assertCountEqual(Subject.objects.values_list('name', flat=True), CATALOGUE)
+        # Staff, including the seeded admin, are kept
+        self.assertCountEqual(User.objects.values_list('username', flat=True), ['@johndoe', '@staffer'])
+        self.assertIn("Deleted 50 Session rows", out.getvalue())
+        self.assertIn("Database unseeding complete", out.getvalue())
+
+    def test_subject_catalogue_survives_unseed_and_reseed(self):
+        # The cache outlives the test's rollback, so empty it again afterwards
+        self.addCleanup(invalidate_subject_cache)
+        call_command('unseed', stdout=StringIO())
+        call_command('seed', stdout=StringIO(), users=5, bookings=2, sessions=4, requests=1, random_seed=2)
+        self.assertCountEqual([name for _, name in get_subject_choices()], CATALOGUE)
+        self.assertCountEqual(Subject.objects.values_list('name', flat=True), CATALOGUE)
+
+    def test_dry_run_only_counts_rows(self):
+        out = StringIO()
+        with self.assertNumQueries(11):
+            call_command('unseed', dry_run=True, stdout=out)
+        self.assertIn("Would delete 50 Session rows.", out.getvalue())
+        self.assertIn("Would delete 22 non-staff User rows.", out.getvalue())
+        self.assertEqual(Session.objects.count(), 50)
@@ -0,0 +1,26 @@
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from tutorials.warmup import template_names, warm_templates
+
+
+class WarmTemplatesTestCase(TestCase):
+    """Tests of the template warm-up command."""
+
+    def test_every_template_is_warmed(self):
+        names = template_names()
+        self.assertIn('base.html', names)
+        self.assertIn('users/users_list.html', names)
+        timings = warm_templates()
+        self.assertEqual([name for name, _, _, _ in timings], names)
+
+    def test_templates_needing_context_are_compiled_but_not_rendered(self):
+        timings = {name: (render_time, error) for name, _, render_time, error in warm_templates()}
+        self.assertIsNotNone(timings['home.html'][0])
+        self.assertEqual(timings['tutors/update_tutor.html'], (None, 'NoReverseMatch'))
+
+    def test_command_reports_each_template(self):
+        out = StringIO()
+        call_command('warm_templates', stdout=out)
+        self.assertIn("home.html: compiled in", out.getvalue())
+        self.assertIn(f"Warmed {len(template_names())} templates", out.getvalue())
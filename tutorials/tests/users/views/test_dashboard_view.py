@@ -0,0 +1,22 @@
+from django.test import TestCase
+from django.urls import reverse
+from tutorials.models import Student, User
+
+
+class DashboardViewTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='@johndoe', password='Password123', email='johndoe@example.com', user_type='admin')
+        for i in range(3):
+            User.objects.create_user(username=f'@student{i}', email=f'student{i}@example.com', user_type='student')
+        student = Student.objects.get(username__username='@student0')
+        student.allocated = True
+        student.save()
+        self.client.login(username='@johndoe', password='Password123')
+
+    def test_dashboard_shows_counts_with_links(self):
+        response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['counts']['unallocated_students'], 2)
+        self.assertEqual(response.context['counts']['pending_payments'], 3)
+        self.assertContains(response, reverse('students_list') + '?allocated=false')
+        self.assertContains(response, 'Sessions this week')
@@ -0,0 +1,154 @@
+import os
+import tempfile
+from io import StringIO
+from unittest.mock import Mock, patch
+from django.contrib.auth.hashers import check_password
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from tutorials.imports import NOT_UTF8, import_users
+from tutorials.models import Student, Tutor, User
+from tutorials.subjects import get_subject_choices
+
+HEADER = "username,email,first_name,last_name,user_type,password,rate,subjects\n"
+
+
+class ImportUsersTestCase(TestCase):
+    """Tests of the bulk CSV user import."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="@johndoe", first_name="John", last_name="Doe", password="Password123", email="johndoe@example.com", user_type="admin")
+        self.client.login(username="@johndoe", password="Password123")
+        self.url = reverse('import_users')
+
+    def _csv(self, *rows):
+        return (HEADER + ''.join(f"{row}\n" for row in rows)).splitlines(True)
+
+    def test_import_users_url(self):
+        self.assertEqual(self.url, '/users/import/')
+
+    def test_get_import_users(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'users/import_users.html')
+        self.assertIsNone(response.context['report'])
+
+    def test_import_creates_users_and_profiles(self):
+        report = import_users(self._csv(
+            "@alice,Alice@Example.org,Alice,Smith,student,Password123,,",
+            "@bobby,bob@example.org,Bob,Jones,tutor,,25.50,Java; Ruby",
+            "@carol,carol@example.org,Carol,White,tutor,,,",
+        ), workers=1)
+        self.assertEqual((report.rows, report.users, report.students, report.tutors), (3, 3, 1, 2))
+        self.assertEqual(report.errors, [])
+        alice = User.objects.get(username="@alice")
+        self.assertTrue(check_password("Password123", alice.password))
+        self.assertEqual(Student.objects.get(username=alice).email, "alice@example.org")
+        self.assertFalse(User.objects.get(username="@bobby").has_usable_password())
+        bob = Tutor.objects.get(username__username="@bobby")
+        self.assertEqual(str(bob.rate), "25.50")
+        self.assertEqual(sorted(bob.subjects.values_list('name', flat=True)), ["Java", "Ruby"])
+        carol = Tutor.objects.get(username__username="@carol")
+        self.assertEqual(list(carol.subjects.values_list('name', flat=True)), ["Python"])
+
+    def test_rejected_rows_do_not_abort_the_batch(self):
+        report = import_users(self._csv(
+            "@alice,alice@example.org,Alice,Smith,student,,,",
+            "bad,bad@example.org,Bad,Name,student,,,",
+            "@johndoe,john2@example.org,John,Again,student,,,",
+            "@alice2,ALICE@example.org,Alice,Again,student,,,",
+            "@tutor1,tutor1@example.org,Tina,Tutor,tutor,,,Klingon",
+            "@dave,dave@example.org,Dave,Brown,wizard,,,",
+            "@erin,erin@example.org,Erin,Green,tutor,,,",
+        ), batch_size=3, workers=1)
+        self.assertEqual([line for line, _ in report.errors], [3, 4, 5, 6, 7])
+        errors = dict(report.errors)
+        self.assertIn("username: Username must consist of @", errors[3])
+        self.assertEqual(errors[4], "username: A user with this username already exists.")
+        self.assertEqual(errors[5], "email: A user with this email already exists.")
+        self.assertEqual(errors[6], "subjects: Unknown subject(s): Klingon.")
+        self.assertIn("user_type:", errors[7])
+        self.assertEqual((report.rows, report.users, report.students, report.tutors), (7, 2, 1, 1))
+        self.assertEqual(User.objects.filter(username__in=["@alice", "@erin"]).count(), 2)
+
+    def test_each_batch_takes_a_fixed_number_of_queries(self):
+        rows = [f"@student{i},student{i}@example.org,Stu,Dent,student,,," for i in range(20)]
+        rows += [f"@tutor{i},tutor{i}@example.org,Tu,Tor,tutor,,,Java" for i in range(20)]
+        get_subject_choices()
+        # Four uniqueness queries, the user, student, tutor and subject
+        # inserts, the dashboard counter insert and update, and the savepoint
+        # around them
+        with self.assertNumQueries(12):
+            report = import_users(self._csv(*rows), workers=1)
+        self.assertEqual(report.users, 40)
+
+    def test_passwords_can_be_hashed_in_worker_processes(self):
+        report = import_users(self._csv(
+            "@alice,alice@example.org,Alice,Smith,student,Password123,,",
+            "@bobby,bob@example.org,Bob,Jones,student,Secret456,,",
+        ), workers=2)
+        self.assertEqual(report.users, 2)
+        self.assertTrue(check_password("Secret456", User.objects.get(username="@bobby").password))
+
+    def test_daemonic_processes_hash_passwords_themselves(self):
+        with patch('tutorials.imports.multiprocessing.current_process', return_value=Mock(daemon=True)), \
+                patch('tutorials.imports.ProcessPoolExecutor') as pool:
+            report = import_users(self._csv("@alice,alice@example.org,Alice,Smith,student,Password123,,"), workers=2)
+        pool.assert_not_called()
+        self.assertEqual(report.users, 1)
+
+    def test_missing_columns_are_reported(self):
+        report = import_users(["username,email\n", "@alice,alice@example.org\n"])
+        self.assertEqual(report.errors, [(1, "Missing column(s): first_name, last_name, user_type.")])
+        self.assertEqual(report.users, 0)
+
+    def test_post_import_users(self):
+        upload = SimpleUploadedFile("users.csv", ''.join(self._csv(
+            "@alice,alice@example.org,Alice,Smith,student,,,",
+            "bad,bad@example.org,Bad,Name,student,,,",
+        )).encode('utf-8-sig'), content_type='text/csv')
+        response = self.client.post(self.url, {'file': upload})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['report'].users, 1)
+        self.assertContains(response, "Imported 1 of 2 users")
+        self.assertContains(response, "Username must consist of @")
+        self.assertTrue(Student.objects.filter(username__username="@alice").exists())
+
+    def test_post_non_utf8_file(self):
+        upload = SimpleUploadedFile("users.csv", HEADER.encode() + "@zoë,z@example.org,Zoë,X,student,,,\n".encode('latin-1'))
+        response = self.client.post(self.url, {'file': upload})
+        self.assertEqual(response.context['report'].errors, [(2, NOT_UTF8)])
+        self.assertContains(response, "Imported 0 of 0 users")
+
+    def test_rows_before_a_non_utf8_line_are_imported_and_reported(self):
+        content = ''.join(self._csv(
+            "@alice,alice@example.org,Alice,Smith,student,,,",
+            "@bobby,bob@example.org,Bob,Jones,student,,,",
+        )).encode() + "@zoë,z@example.org,Zoë,X,student,,,\n".encode('latin-1')
+        response = self.client.post(self.url, {'file': SimpleUploadedFile("users.csv", content)})
+        report = response.context['report']
+        self.assertEqual((report.rows, report.users), (2, 2))
+        self.assertEqual(report.errors, [(4, NOT_UTF8)])
+        self.assertContains(response, "Imported 2 of 2 users")
+
+    def test_import_users_command(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'users.csv')
+            with open(path, 'w', encoding='utf-8') as file:
+                file.writelines(self._csv("@alice,alice@example.org,Alice,Smith,student,,,", "@alice,other@example.org,A,S,student,,,"))
+            out = StringIO()
+            call_command('import_users', path, workers=1, stdout=out)
+        self.assertIn("Line 3: username: A user with this username already exists.", out.getvalue())
+        self.assertIn("Imported 1 of 2 users (1 students, 0 tutors); 1 rows rejected.", out.getvalue())
+
+    def test_import_users_command_reports_a_non_utf8_line(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'users.csv')
+            with open(path, 'wb') as file:
+                file.write(''.join(self._csv("@alice,alice@example.org,Alice,Smith,student,,,")).encode())
+                file.write("@zoë,z@example.org,Zoë,X,student,,,\n".encode('latin-1'))
+            out = StringIO()
+            call_command('import_users', path, batch_size=1, workers=1, stdout=out)
+        self.assertIn(f"Line 3: {NOT_UTF8}", out.getvalue())
+        self.assertIn("Imported 1 of 1 users (1 students, 0 tutors); 1 rows rejected.", out.getvalue())
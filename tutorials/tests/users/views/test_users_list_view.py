@@ -36,6 +36,18 @@ class UsersListViewTest(TestCase):
             user_type='student'
         )
 
+    def _walk_pages(self, params):
+        """Follow next-page links from the first page, collecting every user shown."""
+        seen = []
+        response = self.client.get(self.url, params)
+        while True:
+            self.assertEqual(response.status_code, 200)
+            seen.extend(response.context['users'])
+            next_query = response.context['pagination']['next_query']
+            if not next_query:
+                return seen
+            response = self.client.get(f'{self.url}?{next_query}')
+
     def test_login_required_redirect(self):
         response = self.client.get(self.url)
         self.assertRedirects(response, f'/log_in/?next={self.url}', status_code=302, target_status_code=200)
@@ -88,4 +100,39 @@ class UsersListViewTest(TestCase):
         self.assertTrue(all(user.user_type == 'tutor' for user in users))
         self.assertTrue(all('Jane' in (user.first_name or '') for user in users))
         if len(users) > 1:
-            self.assertLessEqual(users[0].first_name, users[1].first_name)
\ No newline at end of file
+            self.assertLessEqual(users[0].first_name, users[1].first_name)
+
+    def test_pagination_limits_page_size(self):
+        self.client.login(username='admin', password='admin123')
+        response = self.client.get(self.url, {'page_size': 2})
+        self.assertEqual(len(response.context['users']), 2)
+        self.assertIsNotNone(response.context['pagination']['next_query'])
+
+    def test_pagination_visits_every_user_once_in_order(self):
+        self.client.login(username='admin', password='admin123')
+        for order_by, ordering in [('', ['last_name', 'first_name', 'id']),
+                                   ('desc', ['-first_name', '-last_name', '-id'])]:
+            seen = self._walk_pages({'order_by': order_by, 'page_size': 2})
+            expected = list(User.objects.order_by(*ordering))
+            self.assertEqual(seen, expected)
+
+    def test_pagination_keeps_filters_across_pages(self):
+        self.client.login(username='admin', password='admin123')
+        User.objects.bulk_create([
+            User(username=f'@tutor{i}', email=f'tutor{i}@example.com', first_name='Jane', user_type='tutor')
+            for i in range(5)
+        ])
+        seen = self._walk_pages({'user_type': 'tutor', 'page_size': 2})
+        self.assertEqual(len(seen), User.objects.filter(user_type='tutor').count())
+        self.assertTrue(all(user.user_type == 'tutor' for user in seen))
+
+    def test_invalid_cursor_shows_first_page(self):
+        self.client.login(username='admin', password='admin123')
+        response = self.client.get(self.url, {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['pagination']['is_first_page'])
+
+    def test_page_size_is_capped(self):
+        self.client.login(username='admin', password='admin123')
+        response = self.client.get(self.url, {'page_size': 100000})
+        self.assertEqual(response.context['pagination']['page_size'], 200)
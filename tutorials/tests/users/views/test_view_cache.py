@@ -0,0 +1,129 @@
+from django.core.cache import cache, caches
+from django.core.cache.utils import make_template_fragment_key
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from tutorials.caching import cache_key, normalised_query
+from tutorials.models import Booking, Student, StudentRequest, Subject, Tutor, User
+
+
+@override_settings(VIEW_CACHE_TIMEOUT=300)
+class ViewCacheTestCase(TestCase):
+    """Tests of the list and detail page cache."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="@johndoe", first_name="John", last_name="Doe", password="Password123", email="johndoe@example.com", user_type="not specified")
+        self.client.login(username="@johndoe", password="Password123")
+        self.url = reverse('users_list')
+
+    def _create_user(self, username, first_name):
+        return User.objects.create_user(username=username, first_name=first_name, last_name="Smith", email=f"{username[1:]}@example.com", user_type="not specified")
+
+    def test_repeated_request_is_served_from_cache(self):
+        first = self.client.get(self.url)
+        with self.assertNumQueries(2):  # session and user lookups only
+            second = self.client.get(self.url)
+        self.assertEqual(first.content, second.content)
+        self.assertIsNone(second.context)
+
+    def test_query_string_is_normalised(self):
+        request = RequestFactory().get(self.url, {'search': '', 'order_by': 'asc', 'user_type': 'tutor'})
+        self.assertEqual(normalised_query(request), 'order_by=asc&user_type=tutor')
+        other = RequestFactory().get(f'{self.url}?user_type=tutor&order_by=asc')
+        self.assertEqual(cache_key(request, 'users_list', [User]), cache_key(other, 'users_list', [User]))
+        self.client.get(self.url, {'order_by': 'asc', 'search': ''})
+        self.assertIsNone(self.client.get(f'{self.url}?order_by=asc').context)
+        self.assertIsNotNone(self.client.get(self.url, {'order_by': 'desc'}).context)
+
+    def test_saving_and_deleting_invalidate_pages(self):
+        self.client.get(self.url)
+        jane = self._create_user("@janesmith", "Jane")
+        self.assertContains(self.client.get(self.url), "Jane")
+        jane.first_name = "Janet"
+        jane.save()
+        self.assertContains(self.client.get(self.url), "Janet")
+        jane.delete()
+        self.assertNotContains(self.client.get(self.url), "Janet")
+
+    def test_pages_are_invalidated_by_the_models_they_show(self):
+        student = Student.objects.create(username=self.user, name="Jane Student", email="jane.student@example.org")
+        tutor = Tutor.objects.create(username=self.user, name="John Tutor", email="john.tutor@example.org")
+        Booking.objects.create(student=student, tutor=tutor)
+        bookings_url = reverse('booking_list')
+        self.client.get(bookings_url)
+        self.client.get(self.url)
+
+        StudentRequest.objects.create(name="Jane Doe", username=self.user, request_type='custom_request', description="Help")
+        self.assertIsNone(self.client.get(bookings_url).context)
+        tutor.name = "Jon Tutor"
+        tutor.save()
+        self.assertContains(self.client.get(bookings_url), "Jon Tutor")
+        self.assertIsNone(self.client.get(self.url).context)
+
+    def test_logging_in_keeps_pages_cached(self):
+        self.client.get(self.url)
+        self.client.login(username="@johndoe", password="Password123")
+        self.assertIsNone(self.client.get(self.url).context)
+
+    def test_pages_with_messages_are_not_cached(self):
+        self.client.get(self.url)
+        self.client.post(reverse('password'), {'password': 'Password123', 'new_password': 'NewPassword123', 'password_confirmation': 'NewPassword123'})
+        self.assertContains(self.client.get(self.url), "Password updated!")
+        # The page showing the message was not stored, so this one is rendered afresh
+        response = self.client.get(self.url)
+        self.assertIsNotNone(response.context)
+        self.assertNotContains(response, "Password updated!")
+        self.assertIsNone(self.client.get(self.url).context)
+
+    @override_settings(VIEW_CACHE_TIMEOUT=0)
+    def test_caching_can_be_turned_off(self):
+        self.client.get(self.url)
+        self.assertIsNotNone(self.client.get(self.url).context)
+
+
+class RowFragmentCacheTestCase(TestCase):
+    """Tests of the cached table rows in the list templates."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="@johndoe", first_name="John", last_name="Doe", password="Password123", email="johndoe@example.com", user_type="not specified")
+        self.client.login(username="@johndoe", password="Password123")
+
+    def test_rows_are_cached_by_primary_key_and_updated_at(self):
+        self.client.get(reverse('users_list'))
+        key = make_template_fragment_key('user_row', [self.user.pk, self.user.updated_at])
+        self.assertIn("@johndoe", caches['fragments'].get(key))
+
+    def test_saving_stamps_updated_at_but_logging_in_does_not(self):
+        stamped = self.user.updated_at
+        self.client.login(username="@johndoe", password="Password123")
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.updated_at, stamped)
+        self.user.first_name = "Johnny"
+        self.user.save()
+        self.assertGreater(self.user.updated_at, stamped)
+
+    def test_changed_rows_are_rendered_afresh(self):
+        student = Student.objects.create(username=self.user, name="Jane Student", email="jane.student@example.org")
+        self.client.get(reverse('users_list'))
+        self.client.get(reverse('students_list'))
+        self.user.username = "@johnny"
+        self.user.save()
+        self.assertContains(self.client.get(reverse('users_list')), "@johnny")
+        # The student row shows its user's username
+        self.assertContains(self.client.get(reverse('students_list')), "@johnny")
+        student.payment = Student.SUCCESSFUL
+        student.save()
+        self.assertContains(self.client.get(reverse('students_list')), Student.SUCCESSFUL)
+
+    def test_subject_changes_refresh_tutor_rows(self):
+        tutor = Tutor.objects.create(username=self.user, name="John Tutor", email="john.tutor@example.org")
+        self.client.get(reverse('tutors_list'))
+        subject = Subject.objects.create(name="Fortran")
+        tutor.subjects.add(subject)
+        # Once in the tutor's row and once in the subject filter
+        self.assertContains(self.client.get(reverse('tutors_list')), "Fortran", count=2)
+        subject.name = "Kotlin"
+        subject.save()
+        self.assertContains(self.client.get(reverse('tutors_list')), "Kotlin", count=2)
+        subject.tutors.clear()
+        self.assertContains(self.client.get(reverse('tutors_list')), "Kotlin", count=1)
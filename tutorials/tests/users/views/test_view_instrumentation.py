@@ -0,0 +1,35 @@
+from django.core.exceptions import MiddlewareNotUsed
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from tutorials.instrumentation import ViewInstrumentationMiddleware
+from tutorials.models import User
+
+
+@override_settings(VIEW_INSTRUMENTATION_SAMPLE_RATE=1.0)
+class ViewInstrumentationTestCase(TestCase):
+    """Tests of the sampled view instrumentation middleware."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="@johndoe", password="Password123", email="johndoe@example.com", user_type="not specified")
+
+    def test_sampled_request_is_logged(self):
+        self.client.login(username="@johndoe", password="Password123")
+        with self.assertLogs('tutorials.instrumentation', 'INFO') as logs:
+            response = self.client.get(reverse('users_list'))
+        self.assertEqual(response.status_code, 200)
+        fields = logs.records[0].instrumentation
+        self.assertEqual(fields['view'], 'users_list')
+        self.assertEqual(fields['status'], 200)
+        self.assertGreater(fields['queries'], 0)
+        self.assertGreater(fields['render_ms'], 0)
+        self.assertIn("view=users_list", logs.output[0])
+
+    def test_class_based_view_render_time_is_measured(self):
+        with self.assertLogs('tutorials.instrumentation', 'INFO') as logs:
+            self.client.get(reverse('log_in'))
+        self.assertGreater(logs.records[0].instrumentation['render_ms'], 0)
+
+    @override_settings(VIEW_INSTRUMENTATION_SAMPLE_RATE=0)
+    def test_middleware_is_unused_when_disabled(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            ViewInstrumentationMiddleware(lambda request: None)
@@ -1,20 +1,33 @@
+import codecs
+from datetime import date
+from decimal import Decimal
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.core.exceptions import ImproperlyConfigured
-from django.shortcuts import redirect, render
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.shortcuts import redirect
 from django.views import View
 from django.views.generic.edit import FormView, UpdateView, DeleteView
 from django.urls import reverse, reverse_lazy
-from tutorials.forms import LogInForm, PasswordForm, UserForm, SignUpForm
+from tutorials.forms import LogInForm, PasswordForm, UserForm, SignUpForm, UserImportForm
+from tutorials.billing import Cents, with_amounts, with_totals
+from tutorials.exports import EXPORTS, FORMATS, export_lines
+from tutorials.caching import cached_view
 from tutorials.helpers import login_prohibited
-from .models import Booking, Session, User, Student, StudentRequest, Tutor, Subject
-from .forms import BookingForm, SessionForm, UserForm, StudentForm,StudentRequestForm, TutorForm
+from tutorials.imports import OPTIONAL_COLUMNS, REQUIRED_COLUMNS, import_users
+from tutorials.instrumentation import render
+from tutorials.metrics import dashboard_counts
+from tutorials.pagination import keyset_paginate
+from tutorials.scheduling import generate_schedule, schedule_dates
+from tutorials.search import matching_ids, search
+from tutorials.subjects import get_subject_choices
+from .models import Booking, Session, User, Student, StudentRequest, Tutor, TutorTermSummary, Subject
+from .forms import BookingForm, ScheduleForm, SessionForm, UserForm, StudentForm,StudentRequestForm, TutorForm
 from django.shortcuts import get_object_or_404
-from django.db.models import F, Q
-from django.http import HttpResponseForbidden, HttpResponseRedirect,Http404
+from django.db.models import F, Q, Sum
+from django.http import HttpResponseForbidden, HttpResponseRedirect, Http404, StreamingHttpResponse
 
 
 
@@ -23,7 +36,8 @@ def dashboard(request):
     """Display the current user's dashboard."""
 
     current_user = request.user
-    return render(request, 'dashboard.html', {'user': current_user})
+    # Precomputed counters, read in one query (see tutorials.metrics)
+    return render(request, 'dashboard.html', {'user': current_user, 'counts': dashboard_counts()})
 
 
 @login_prohibited
@@ -168,21 +182,9 @@ class SignUpView(LoginProhibitedMixin, FormView):
         return reverse('log_in')
 
 
-def populate():
-    """Used in user_list, tutor_list, and student_list to ensure they are populated."""
-    users = User.objects.all()
-    for user in users:
-        if user.user_type == 'student' and not Student.objects.filter(username=user).exists():
-            Student.objects.get_or_create(
-                username=user, defaults={'name': user.full_name, 'email': user.email.lower()}
-            )
-        elif user.user_type == 'tutor' and not Tutor.objects.filter(username=user).exists():
-            Tutor.objects.get_or_create(
-                username=user, defaults={'name': user.full_name, 'email': user.email.lower()}
-            )
- 
 """User page"""           
 @login_required
+@cached_view(User)
 def users_list(request):
     """Display a list of all users with filtering, sorting, and searching options."""
     user_type_filter = request.GET.get('user_type')  
@@ -190,27 +192,25 @@ def users_list(request):
     search_query = request.GET.get('search', '')  
 
     users = User.objects.all()
-    populate()
     # Apply filtering by user type
     if user_type_filter:
         users = users.filter(user_type=user_type_filter)
 
     # Apply searching by name
     if search_query:
-        users = users.filter(
-            Q(first_name__icontains=search_query) | Q(last_name__icontains=search_query)
-        )
+        users = search(users, search_query, ['first_name', 'last_name'])
 
     # Apply ordering by name
+    ordering = ['last_name', 'first_name']
     if order_by == 'asc':  # A-Z
-        users = users.order_by('first_name', 'last_name')
+        ordering = ['first_name', 'last_name']
     elif order_by == 'desc':  # Z-A
-        users = users.order_by('-first_name', '-last_name') 
-        
-    
-            
+        ordering = ['-first_name', '-last_name']
+
+    users, pagination = keyset_paginate(request, users, ordering)
     return render(request, 'users/users_list.html', {
         'users': users,
+        'pagination': pagination,
         'user_type_filter': user_type_filter,
         'order_by': order_by,
         'search_query': search_query,
@@ -239,8 +239,28 @@ def create_user(request):
     return render(request, 'users/create_user.html', {'form': form})
 
 
+@login_required
+def user_import(request):
+    """Import users, with their student or tutor profiles, from an uploaded CSV file."""
+    report = None
+    if request.method == 'POST':
+        form = UserImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            # Decoded a line at a time, so an undecodable line is reported as rejected.
+            # Passwords are hashed in this process rather than forking the server.
+            report = import_users(codecs.iterdecode(form.cleaned_data['file'], 'utf-8-sig'), workers=1)
+    else:
+        form = UserImportForm()
+    return render(request, 'users/import_users.html', {
+        'form': form,
+        'report': report,
+        'columns': REQUIRED_COLUMNS + OPTIONAL_COLUMNS,
+    })
+
+
 """Student page"""
 @login_required
+@cached_view(Student, User)
 def students_list(request):
     """Display a list of all students with filtering, sorting, and searching options."""
     
@@ -249,9 +269,8 @@ def students_list(request):
     order = request.GET.get('order')  # Order by name
     search_query = request.GET.get('search')  # Search by name
 
-    # Start with all students
-    students = Student.objects.all()
-    populate()
+    # Start with all students, fetching each one's user in the same query
+    students = Student.objects.select_related('username')
     # Apply filtering by allocated
     if allocated == 'true':
         students = students.filter(allocated=True)
@@ -264,16 +283,19 @@ def students_list(request):
 
     # Apply searching by name
     if search_query:
-        students = students.filter(name__icontains=search_query)
+        students = search(students, search_query, ['name'])
 
     # Apply sorting by name
+    ordering = []
     if order == 'asc':  # A-Z
-        students = students.order_by('name')
+        ordering = ['name']
     elif order == 'desc':  # Z-A
-        students = students.order_by('-name')
+        ordering = ['-name']
 
+    students, pagination = keyset_paginate(request, students, ordering)
     context = {
         'students': students,
+        'pagination': pagination,
         'current_allocated': allocated,
         'current_payment': payment,
         'current_order': order,
@@ -283,6 +305,7 @@ def students_list(request):
     return render(request, 'students/students_list.html', context)
 
 @login_required
+@cached_view(Student, User)
 def show_student(request, student_id):
     """Display further info on a student"""
     try:
@@ -333,6 +356,7 @@ def delete_student(request, student_id):
 
 """Student requests page"""
 @login_required
+@cached_view(StudentRequest)
 def student_requests(request):
     """Display a list of all student requests with filtering, search, and sorting options."""
     # Get filter parameters from the query string
@@ -352,17 +376,20 @@ def student_requests(request):
     if request_type_filter:
         requests = requests.filter(request_type=request_type_filter)
     if search_query:
-        requests = requests.filter(name__icontains=search_query)  # Case-insensitive search
+        requests = search(requests, search_query, ['name'])  # Case-insensitive search
 
     # Apply sorting
+    ordering = []
     if order_by == 'asc':
-        requests = requests.order_by('name')
+        ordering = ['name']
     elif order_by == 'desc':
-        requests = requests.order_by('-name')
+        ordering = ['-name']
 
+    requests, pagination = keyset_paginate(request, requests, ordering)
     # Pass filters and requests to the template
     context = {
         'requests': requests,
+        'pagination': pagination,
         'status_filter': status_filter,
         'priority_filter': priority_filter,
         'request_type_filter': request_type_filter,
@@ -375,6 +402,7 @@ def student_requests(request):
     return render(request, 'students_requests/student_requests.html', context)
 
 @login_required
+@cached_view(StudentRequest, User)
 def show_request(request, request_id):
     """Display further information on a student request."""
     try:
@@ -446,6 +474,7 @@ def delete_request(request, request_id):
 
 """Booking page"""
 @login_required
+@cached_view(Booking, Student, Tutor)
 def bookings_list(request):
     """Display a list of all bookings with filtering, ordering, and searching options."""
     term_filter = request.GET.get('term')  # Filter by term
@@ -455,7 +484,7 @@ def bookings_list(request):
     tutor_search = request.GET.get('tutor_search')  # Search for tutor name
 
     # Annotate full_name for students and tutors using Concat
-    bookings = Booking.objects.annotate(
+    bookings = Booking.objects.select_related('student', 'tutor').annotate(
         student_name=F('student__name'),
         tutor_name=F('tutor__name')
     )
@@ -471,24 +500,27 @@ def bookings_list(request):
 
     # Search for student name
     if student_search:
-        bookings = bookings.filter(student_name__icontains=student_search)
+        bookings = bookings.filter(student__in=matching_ids(Student, student_search, ['name']))
 
     # Search for tutor name
     if tutor_search:
-        bookings = bookings.filter(tutor_name__icontains=tutor_search)
+        bookings = bookings.filter(tutor__in=matching_ids(Tutor, tutor_search, ['name']))
 
     # Order by student or tutor name
+    ordering = ['term', 'lesson_type', 'student_id', 'tutor_id']
     if order_by == 'student_asc':
-        bookings = bookings.order_by('student_name')
+        ordering = ['student_name']
     elif order_by == 'student_desc':
-        bookings = bookings.order_by('-student_name')
+        ordering = ['-student_name']
     elif order_by == 'tutor_asc':
-        bookings = bookings.order_by('tutor_name')
+        ordering = ['tutor_name']
     elif order_by == 'tutor_desc':
-        bookings = bookings.order_by('-tutor_name')
+        ordering = ['-tutor_name']
 
+    bookings, pagination = keyset_paginate(request, bookings, ordering)
     return render(request, 'bookings/booking_list.html', {
         'bookings': bookings,
+        'pagination': pagination,
         'term_choices': Booking.TERM_CHOICES,
         'lesson_type_choices': Booking.LESSON_TYPE_CHOICES,
         'term_filter': term_filter,
@@ -534,6 +566,7 @@ def booking_delete(request, pk):
     return render(request, 'bookings/booking_delete.html', {'booking': booking})
 
 @login_required
+@cached_view(Booking, Student, Tutor)
 def booking_detail(request, pk):
     """Show details of a specific booking."""
     booking = get_object_or_404(Booking, pk=pk)
@@ -541,20 +574,16 @@ def booking_detail(request, pk):
 
 
 @login_required
+@cached_view(Booking, Session, Student, Tutor)
 def booking_show(request, booking_id):
     """List all sessions for a specific booking with filtering and ordering."""
-    booking = get_object_or_404(Booking, id=booking_id)
-    sessions = booking.sessions.all()
-
+    booking = get_object_or_404(Booking.objects.select_related('student', 'tutor'), id=booking_id)
+    sessions = with_amounts(booking.sessions.all())
 
     # Get filter values from request
     venue = request.GET.get('venue', None)
     payment_status = request.GET.get('payment', None)
     order = request.GET.get('order', None)
-    
-    print(f"Initial Sessions: {booking.sessions.all()}")
-    print(f"Venue Filter: {venue}")
-    print(f"Payment Status Filter: {payment_status}")
 
     # Apply filters
     if venue:
@@ -567,13 +596,6 @@ def booking_show(request, booking_id):
         sessions = sessions.order_by('session_date')
     elif order == 'furthest':
         sessions = sessions.order_by('-session_date')
-    
-    print(f"Booking: {booking}")
-    print(f"Filtered Sessions: {sessions}")
-    
-    # Calculate Total Amount
-    for session in sessions:
-        session.calculated_total_amount = session.total_amount
 
     return render(
         request,
@@ -586,6 +608,87 @@ def booking_show(request, booking_id):
         },
     )
 
+@login_required
+@cached_view(Booking, Session, Student, Tutor)
+def term_invoice(request, term):
+    """Show what every booking in a term owes, priced by the database."""
+    if term not in dict(Booking.TERM_CHOICES):
+        raise Http404(f"Could not find a term called {term}")
+
+    bookings = with_totals(Booking.objects.filter(term=term).select_related('student', 'tutor').annotate(
+        student_name=F('student__name'),
+    ))
+    totals = with_amounts(Session.objects.filter(booking__term=term)).aggregate(
+        total_amount=Cents(Sum('amount')),
+        paid_amount=Cents(Sum('amount', filter=Q(payment_status=Session.PAYMENT_SUCCESSFUL))),
+    )
+
+    bookings, pagination = keyset_paginate(request, bookings, ['student_name'])
+    total_amount = totals['total_amount'] or Decimal('0.00')
+    paid_amount = totals['paid_amount'] or Decimal('0.00')
+    return render(request, 'bookings/term_invoice.html', {
+        'term': term,
+        'term_label': dict(Booking.TERM_CHOICES)[term],
+        'bookings': bookings,
+        'pagination': pagination,
+        'total_amount': total_amount,
+        'paid_amount': paid_amount,
+        'outstanding_amount': total_amount - paid_amount,
+    })
+
+# The tutor report's sort orders, each served by a (term, column) index
+TUTOR_REPORT_ORDERINGS = {
+    'name': ['tutor_name'],
+    'hours': ['-booked_minutes'],
+    'revenue': ['-revenue'],
+    'pending': ['-pending'],
+}
+
+@login_required
+@cached_view(TutorTermSummary)
+def tutor_report(request):
+    """Show each tutor's workload and revenue in a term, read from the precomputed summaries."""
+    term = request.GET.get('term')
+    if term not in dict(Booking.TERM_CHOICES):
+        term = Booking.TERM1
+    order = request.GET.get('order')
+    if order not in TUTOR_REPORT_ORDERINGS:
+        order = 'name'
+    outstanding = request.GET.get('outstanding') == 'true'
+
+    summaries = TutorTermSummary.objects.filter(term=term)
+    if outstanding:
+        summaries = summaries.filter(pending__gt=0)
+    totals = summaries.aggregate(
+        booking_count=Sum('booking_count'),
+        session_count=Sum('session_count'),
+        booked_minutes=Sum('booked_minutes'),
+        revenue=Cents(Sum('revenue')),
+        paid=Cents(Sum('paid')),
+        pending=Cents(Sum('pending')),
+    )
+    summaries, pagination = keyset_paginate(request, summaries, TUTOR_REPORT_ORDERINGS[order])
+    return render(request, 'tutors/tutor_report.html', {
+        'summaries': summaries,
+        'pagination': pagination,
+        'totals': totals,
+        'total_hours': (totals['booked_minutes'] or 0) / 60,
+        'current_term': term,
+        'current_order': order,
+        'outstanding': outstanding,
+        'term_choices': Booking.TERM_CHOICES,
+    })
+
+@login_required
+def export(request, kind, fmt):
+    """Stream every booking or session, with its amounts, as a CSV or JSON download."""
+    if kind not in EXPORTS or fmt not in FORMATS:
+        raise Http404(f"Could not find an export called {kind}.{fmt}")
+
+    response = StreamingHttpResponse(export_lines(kind, fmt), content_type=FORMATS[fmt])
+    response['Content-Disposition'] = f'attachment; filename="{kind}.{fmt}"'
+    return response
+
 """Session page"""
 @login_required
 def session_create(request, booking_id):
@@ -606,9 +709,35 @@ def session_create(request, booking_id):
     return render(request, 'sessions/session_create.html', {'form': form, 'booking': booking})
 
 @login_required
+def session_generate(request, booking_id):
+    """Create every session of a booking for its term in one go."""
+    booking = get_object_or_404(Booking.objects.select_related('student', 'tutor'), id=booking_id)
+
+    if request.method == 'POST':
+        form = ScheduleForm(request.POST)
+        if form.is_valid():
+            try:
+                sessions = generate_schedule(booking, **form.cleaned_data)
+            except ValidationError as error:
+                form.add_error(None, error)
+            else:
+                messages.add_message(request, messages.SUCCESS, f"Created {len(sessions)} sessions.")
+                return redirect('session_list', booking_id=booking.id)
+    else:
+        form = ScheduleForm(initial={'venue': Session.VENUE_BUSH_HOUSE})
+
+    return render(request, 'sessions/session_generate.html', {
+        'form': form,
+        'booking': booking,
+        'session_count': len(schedule_dates(booking.term, booking.lesson_type, date.today())),
+    })
+
+@login_required
+@cached_view(Session, Booking, Student, Tutor)
 def session_show(request, pk):
     """Show details of a specific session."""
-    session = get_object_or_404(Session, pk=pk)
+    sessions = with_amounts(Session.objects.select_related('booking__student', 'booking__tutor'))
+    session = get_object_or_404(sessions, pk=pk)
     return render(request, 'sessions/session_show.html', {'session': session})
 
 @login_required
@@ -644,41 +773,38 @@ def session_delete(request, pk):
 
 """Tutor page"""
 @login_required
+@cached_view(Tutor, User, Subject)
 def tutors_list(request):
     """Display a list of all tutors."""
-    subjects = [
-        'Python', 'Java', 'Javascript', 'React',
-        'Ruby', 'Go', 'HTML/CSS', 'C', 'Scala'
-    ]
-    for subject in subjects:
-        Subject.objects.get_or_create(name = subject)
-        
     subject_filter = request.GET.get('subject')  #gets the subject filter
     order = request.GET.get('order')  #gets the order filter
     search_query = request.GET.get('search')  #gets the search query
     
-    tutors = Tutor.objects.all()
-    populate()
+    tutors = Tutor.objects.select_related('username').prefetch_related('subjects')
 
     #filter tutors by subject if provided
     if subject_filter:
-        tutors = tutors.filter(subjects__id=subject_filter) #ManyToManyField filter
+        # A subquery rather than a join, so tutors are still read in id order without a sort
+        tutor_ids = Tutor.subjects.through.objects.filter(subject_id=subject_filter).values('tutor_id')
+        tutors = tutors.filter(pk__in=tutor_ids) #ManyToManyField filter
 
     #filter tutors by name if search query is provided
     if search_query:
-        tutors = tutors.filter(name__icontains=search_query)
+        tutors = search(tutors, search_query, ['name'])
 
     #order tutors by name if ordering is specified
+    ordering = []
     if order == 'asc':  # A-Z
-        tutors = tutors.order_by('name')
+        ordering = ['name']
     elif order == 'desc':  # Z-A
-        tutors = tutors.order_by('-name')
+        ordering = ['-name']
+    tutors, pagination = keyset_paginate(request, tutors, ordering)
 
     #get all subjects for the filter dropdown
-    all_subjects = Subject.objects.all()
-    subject_choices = [(subject.id, subject.name) for subject in all_subjects]
+    subject_choices = get_subject_choices()
     return render(request, 'tutors/tutors_list.html', {
         'tutors': tutors,
+        'pagination': pagination,
         'subject_choices': subject_choices,
         'current_order': order,  
         'search_query': search_query,  
@@ -686,6 +812,7 @@ def tutors_list(request):
     })
 
 @login_required
+@cached_view(Tutor, User, Subject)
 def show_tutor(request, tutor_id):
     """Display further info on a tutor"""
 